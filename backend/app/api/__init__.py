@@ -1,3 +1,3 @@
-from app.api import metrics, uploads
+from app.api import bets, metrics, uploads
 
-__all__ = ["metrics", "uploads"]
+__all__ = ["bets", "metrics", "uploads"]
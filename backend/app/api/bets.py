@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import current_user_id
+from app.core.database import get_async_session, with_read_session
+from app.services.bet_export import (
+    DEFAULT_PAGE_SIZE,
+    EXPORT_MEDIA_TYPES,
+    bet_record,
+    bets_page_select,
+    export_bets,
+    parquet_available,
+)
+from app.services.search import DEFAULT_SEARCH_LIMIT, search_bets
+
+router = APIRouter(prefix="/bets", tags=["bets"])
+
+
+@router.get("", summary="List bets in settlement order", response_model=list[dict[str, Any]])
+async def list_bets(
+    category: str | None = Query(default=None),
+    sport: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    after_settled_at: datetime | None = Query(default=None),
+    after_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> list[dict[str, Any]]:
+    """Pages are addressed by keyset: pass the ``settled_at`` and ``id`` of the last bet received."""
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    if after_settled_at is not None and after_id is None:
+        raise HTTPException(status_code=400, detail="after_settled_at requires after_id")
+    stmt = bets_page_select(
+        db.get_bind().dialect.name,
+        category=category,
+        sport=sport,
+        limit=limit,
+        after_settled_at=after_settled_at,
+        after_id=after_id,
+        user_id=user_id,
+    )
+    return [bet_record(row) for row in await db.execute(stmt)]
+
+
+@router.get("/search", summary="Rank bets matching a full-text query", response_model=dict[str, Any])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    category: str | None = Query(default=None),
+    sport: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=500),
+    user_id: str = Depends(current_user_id),
+) -> dict[str, Any]:
+    """Every term matches as a prefix of a word in the description, runner, team or track.
+
+    ``bets`` holds the best ``limit`` matches; ``summary`` totals every match.
+    """
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    try:
+        return await run_in_threadpool(
+            with_read_session, search_bets, q, category=category, sport=sport, limit=limit, user_id=user_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/export", summary="Stream every bet as NDJSON, CSV or Parquet")
+async def export(
+    export_format: str = Query(default="ndjson", alias="format"),
+    category: str | None = Query(default=None),
+    sport: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> StreamingResponse:
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported format")
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires the parquet extra (pyarrow)")
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    return StreamingResponse(
+        export_bets(db, export_format, category=category, sport=sport, user_id=user_id),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="bets.{export_format}"'},
+    )
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import Header
+
+from app.models.user import DEFAULT_USER_ID
+
+USER_ID_PATTERN = r"^[A-Za-z0-9_.-]{1,36}$"
+
+
+def current_user_id(
+    x_user_id: str = Header(default=DEFAULT_USER_ID, pattern=USER_ID_PATTERN),
+) -> str:
+    """The user whose data a request reads and writes, from the ``X-User-Id`` header.
+
+    The header is trusted as sent: deployments serving several users put an
+    authenticating proxy in front of the API that sets it.
+    """
+    return x_user_id
@@ -1,59 +1,289 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Any
 
-from app.core.database import get_session
-from app.services.metrics_breakdown import breakdown_by
-from app.services.metrics_service import get_cashflow_totals, get_overview_metrics
-from app.services.timeseries import fetch_profit_timeseries
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-router = APIRouter(prefix="/metrics", tags=["metrics"])
+from app.api.deps import current_user_id
+from app.api.responses import ORJSONResponse
+from app.core.database import get_async_session
+from app.services.highlights import HIGHLIGHTS_TOP_K
+from app.services.legs import LEG_DIMENSIONS
+from app.services.metrics_breakdown import (
+    DEFAULT_BREAKDOWN_LIMIT,
+    DIMENSIONS,
+    HIGH_CARDINALITY_DIMENSIONS,
+    parse_grouping,
+)
+from app.services.metrics_cache import cached_body_async, data_token_async, etag_for
+from app.services.odds import normalize_edges
+from app.services.simulation import DEFAULT_SIMULATION_POINTS
 
+router = APIRouter(prefix="/metrics", tags=["metrics"], default_response_class=ORJSONResponse)
 
-@router.get("/overview")
-def metrics_overview(db: Session = Depends(get_session)) -> list[dict[str, str | float]]:
-    return get_overview_metrics(db)
 
+async def conditional_response(request: Request, db: AsyncSession, endpoint: str, **params: Any) -> Response:
+    """Serve a cached, pre-encoded metrics payload, or a bodyless 304 when the client's ETag matches.
 
-@router.get("/cashflow")
-def cashflow_overview(db: Session = Depends(get_session)) -> dict[str, float]:
-    return get_cashflow_totals(db)
+    Routes return the ``Response`` directly, so FastAPI neither validates the
+    payload against ``response_model`` nor encodes it again; the models only
+    document the shapes.
+    """
+    token = await data_token_async(db, params["user_id"])
+    etag = etag_for(token, endpoint, **params)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = await cached_body_async(token, endpoint, **params)
+    return Response(body, media_type=ORJSONResponse.media_type, headers=headers)
 
 
-@router.get("/breakdown/{dimension}")
-def metrics_breakdown(
+def etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+@router.get("/overview", response_model=list[dict[str, str | float]])
+async def metrics_overview(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    return await conditional_response(request, db, "overview", user_id=user_id)
+
+
+@router.get("/dashboard", response_model=dict[str, Any])
+async def dashboard(
+    request: Request,
+    category: str = Query(default="sport"),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    """The overview, cash flow, timeline and opening breakdowns of the dashboard in one response.
+
+    Each section matches its own endpoint: ``overview``, ``cashflow``,
+    ``timeseries?category=``, and under ``breakdowns`` either the sport list
+    with the ``bet_type`` and ``market_type`` drilldowns of ``selected_sport``,
+    or the racing ``track``, ``bet_type`` and ``market_type`` breakdowns.
+    """
+    if category not in ("sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    return await conditional_response(request, db, "dashboard", user_id=user_id, category=category)
+
+
+@router.get("/cashflow", response_model=dict[str, float])
+async def cashflow_overview(
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    return await conditional_response(request, db, "cashflow", user_id=user_id)
+
+
+@router.get("/breakdown/{dimension}", response_model=list[dict[str, str | float]])
+async def metrics_breakdown(
+    request: Request,
     dimension: str,
     category: str | None = Query(default=None),
     sport: str | None = Query(default=None),
-    db: Session = Depends(get_session),
-) -> list[dict[str, str | float]]:
-    if dimension not in {"sport", "bet_type", "market_type", "track"}:
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    after_profit: float | None = Query(default=None),
+    after_key: str | None = Query(default=None),
+    min_stake: float | None = Query(default=None, ge=0),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    if dimension not in DIMENSIONS and dimension not in HIGH_CARDINALITY_DIMENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported dimension")
     if category not in (None, "sport", "racing"):
         raise HTTPException(status_code=400, detail="Unsupported category")
-    rows = breakdown_by(db, dimension, category, sport=sport)  # type: ignore[arg-type]
-    normalized: list[dict[str, str | float]] = []
-    for row in rows:
-        label = row.key or "Unclassified"
-        normalized.append(
-            {
-                "key": label,
-                "stake": float(row.stake or 0),
-                "payout": float(row.payout or 0),
-                "profit": float(row.profit or 0),
-                "roi": float(row.roi or 0),
-                "win_rate": float(row.win_rate or 0),
-            }
+    if (after_profit is None) != (after_key is None):
+        raise HTTPException(status_code=400, detail="after_profit and after_key must be provided together")
+
+    paged = dimension in HIGH_CARDINALITY_DIMENSIONS or any(
+        value is not None for value in (limit, after_key, min_stake)
+    )
+    if not paged:
+        return await conditional_response(
+            request, db, "breakdown", user_id=user_id, dimension=dimension, category=category, sport=sport
         )
-    return normalized
+    return await conditional_response(
+        request,
+        db,
+        "ranked_breakdown",
+        user_id=user_id,
+        dimension=dimension,
+        category=category,
+        sport=sport,
+        limit=limit or DEFAULT_BREAKDOWN_LIMIT,
+        after_profit=after_profit,
+        after_key=after_key,
+        min_stake=min_stake,
+    )
+
+
+@router.get("/participants", response_model=list[dict[str, str | float]])
+async def participant_metrics(
+    request: Request,
+    sport: str | None = Query(default=None),
+    entity_id: int | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_BREAKDOWN_LIMIT, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    return await conditional_response(
+        request, db, "participants", user_id=user_id, sport=sport, entity_id=entity_id, limit=limit
+    )
+
+
+@router.get("/legs/{dimension}", response_model=list[dict[str, str | float]])
+async def leg_metrics(
+    request: Request,
+    dimension: str,
+    multis_only: bool = Query(default=True),
+    limit: int = Query(default=DEFAULT_BREAKDOWN_LIMIT, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    if dimension not in LEG_DIMENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported dimension")
+    return await conditional_response(
+        request, db, "legs", user_id=user_id, dimension=dimension, multis_only=multis_only, limit=limit
+    )
+
+
+@router.get("/highlights", response_model=dict[str, Any])
+async def metrics_highlights(
+    request: Request,
+    limit: int = Query(default=HIGHLIGHTS_TOP_K, ge=1, le=HIGHLIGHTS_TOP_K),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    return await conditional_response(request, db, "highlights", user_id=user_id, limit=limit)
 
 
-@router.get("/timeseries")
-def profit_timeseries(
+@router.get("/odds-bands", response_model=list[dict[str, str | float | None]])
+async def odds_band_metrics(
+    request: Request,
+    edges: list[float] | None = Query(default=None),
     category: str | None = Query(default=None),
-    db: Session = Depends(get_session),
-) -> list[dict[str, str | float]]:
+    sport: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    try:
+        normalized = normalize_edges(edges)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return await conditional_response(
+        request, db, "odds_bands", user_id=user_id, edges=normalized, category=category, sport=sport
+    )
+
+
+@router.get("/simulate", response_model=dict[str, Any])
+async def simulate(
+    request: Request,
+    category: str | None = Query(default=None),
+    sport: str | None = Query(default=None),
+    unit: float = Query(default=10.0, gt=0),
+    bankroll: float = Query(default=1000.0, gt=0),
+    fraction: float = Query(default=0.02, gt=0, le=1),
+    max_points: int = Query(default=DEFAULT_SIMULATION_POINTS, ge=2, le=5000),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    return await conditional_response(
+        request,
+        db,
+        "simulate",
+        user_id=user_id,
+        category=category,
+        sport=sport,
+        unit=unit,
+        bankroll=bankroll,
+        fraction=fraction,
+        max_points=max_points,
+    )
+
+
+@router.get("/cube", response_model=dict[str, list[dict[str, str | float]]])
+async def metrics_cube(
+    request: Request,
+    dimensions: list[str] = Query(default=list(DIMENSIONS)),
+    category: str | None = Query(default=None),
+    sport: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    if category not in (None, "sport", "racing"):
+        raise HTTPException(status_code=400, detail="Unsupported category")
+    try:
+        for grouping in dimensions:
+            parse_grouping(grouping)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return await conditional_response(
+        request,
+        db,
+        "cube",
+        user_id=user_id,
+        groupings=tuple(dict.fromkeys(dimensions)),
+        category=category,
+        sport=sport,
+    )
+
+
+@router.get("/timeseries", response_model=list[dict[str, str | float]])
+async def profit_timeseries(
+    request: Request,
+    category: str | None = Query(default=None),
+    granularity: str = Query(default="day"),
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    max_points: int | None = Query(default=None, ge=3),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
     if category not in (None, "sport", "racing"):
         raise HTTPException(status_code=400, detail="Unsupported category")
-    return fetch_profit_timeseries(db, category)
+    if granularity not in ("day", "week", "month"):
+        raise HTTPException(status_code=400, detail="Unsupported granularity")
+    return await conditional_response(
+        request,
+        db,
+        "timeseries",
+        user_id=user_id,
+        category=category,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        max_points=max_points,
+    )
+
+
+@router.get("/bankroll", response_model=list[dict[str, str | float | None]])
+async def bankroll_series(
+    request: Request,
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    max_points: int | None = Query(default=None, ge=3),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> Response:
+    return await conditional_response(
+        request,
+        db,
+        "bankroll",
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        max_points=max_points,
+    )
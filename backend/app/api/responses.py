@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import dumps
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON encoded with orjson, several times faster than ``json`` on large metrics payloads.
+
+    Payloads are plain dicts and lists built by the services, so there is no
+    response model to validate against.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
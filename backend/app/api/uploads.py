@@ -1,26 +1,73 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import current_user_id
+from app.core.database import get_async_session
 from app.models.schemas import UploadResponse
+from app.models.upload import Upload
 from app.services.ingestion_service import process_upload
+from app.services.metrics_cache import warm_metrics_cache
 from app.services.upload_service import persist_upload
 
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 
 
 @router.post("/csv", summary="Upload Sportsbet CSV", response_model=UploadResponse)
-async def upload_csv(file: UploadFile) -> UploadResponse:
+async def upload_csv(
+    file: UploadFile,
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(current_user_id),
+) -> UploadResponse:
     """Store uploaded CSV and enqueue ingestion."""
-    upload = persist_upload(file)
-    processed = process_upload(upload.id)
+    upload = await run_in_threadpool(persist_upload, file, user_id)
+    processed = await run_in_threadpool(process_upload, upload.id)
     await file.close()
+    background_tasks.add_task(warm_metrics_cache, user_id)
+    return upload_response(processed)
+
+
+@router.get("", summary="List recent uploads", response_model=list[UploadResponse])
+async def list_uploads(
+    limit: int = Query(default=20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> list[UploadResponse]:
+    uploads = await db.scalars(
+        select(Upload).where(Upload.user_id == user_id).order_by(Upload.created_at.desc()).limit(limit)
+    )
+    return [upload_response(upload) for upload in uploads]
+
+
+@router.get("/{upload_id}", summary="Get upload status", response_model=UploadResponse)
+async def get_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_session),
+    user_id: str = Depends(current_user_id),
+) -> UploadResponse:
+    upload = await db.get(Upload, upload_id)
+    if upload is None or upload.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload_response(upload)
+
+
+def upload_response(upload: Upload) -> UploadResponse:
     return UploadResponse(
-        upload_id=processed.id,
-        filename=processed.original_filename,
-        stored_path=processed.stored_path,
-        status=processed.status,
-        created_at=processed.created_at,
-        processed_at=processed.processed_at,
-        row_count=processed.row_count,
+        upload_id=upload.id,
+        filename=upload.original_filename,
+        stored_path=upload.stored_path,
+        status=upload.status,
+        created_at=upload.created_at,
+        processed_at=upload.processed_at,
+        row_count=upload.row_count,
     )
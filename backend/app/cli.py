@@ -2,28 +2,83 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
 
-from app.core.database import Base, engine
-from app import models  # noqa: F401 - ensure models are imported for metadata
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.bet_metrics import rebuild_bet_metrics
+from app.services.highlights import refresh_highlights
+from app.services.ingestion_service import rebuild_ledger
+from app.services.legs import rebuild_legs
 from app.services.reference_seed import seed_reference_data
 
 
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def migrate() -> None:
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+    migrate()
     seed_reference_data()
     print("Database schema initialised.")
 
 
+def rebuild_metrics() -> None:
+    db = SessionLocal()
+    try:
+        rebuild_bet_metrics(db)
+        for user_id in db.execute(select(User.id)).scalars().all():
+            refresh_highlights(db, user_id)
+        db.commit()
+    finally:
+        db.close()
+    print("Bet metrics rebuilt.")
+
+
+def rebuild_bet_legs() -> None:
+    db = SessionLocal()
+    try:
+        rebuild_legs(db)
+    finally:
+        db.close()
+    print("Bet legs rebuilt.")
+
+
+def rebuild_transactions() -> None:
+    db = SessionLocal()
+    try:
+        inserted = rebuild_ledger(db)
+    finally:
+        db.close()
+    print(f"Transaction ledger rebuilt ({inserted} new rows).")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="TrackMyBets backend CLI")
     subparsers = parser.add_subparsers(dest="command")
 
-    subparsers.add_parser("init-db", help="Create database tables using SQLAlchemy metadata")
+    subparsers.add_parser("init-db", help="Apply Alembic migrations and seed reference data")
+    subparsers.add_parser("rebuild-metrics", help="Recompute bet_metrics summary rows and highlights from bets")
+    subparsers.add_parser("rebuild-legs", help="Re-parse legs from stored bet descriptions")
+    subparsers.add_parser("rebuild-ledger", help="Backfill the transaction ledger from stored uploads")
 
     args = parser.parse_args()
 
     if args.command == "init-db":
         init_db()
+    elif args.command == "rebuild-metrics":
+        rebuild_metrics()
+    elif args.command == "rebuild-legs":
+        rebuild_bet_legs()
+    elif args.command == "rebuild-ledger":
+        rebuild_transactions()
     else:
         parser.print_help()
 
@@ -14,8 +14,20 @@ class Settings(BaseModel):
     api_host: str = os.getenv("API_HOST", "127.0.0.1")
     api_port: int = int(os.getenv("API_PORT", "8000"))
     database_url: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./data/trackmybets.db")
+    sqlite_profile: str = os.getenv("SQLITE_PROFILE", "performance")
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_cache_size_kib: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))
+    sqlite_read_pool_size: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
     raw_data_dir: Path = Path(os.getenv("RAW_DATA_DIR", "./data/raw"))
     rejects_dir: Path = Path(os.getenv("REJECTS_DIR", "./data/rejects"))
+    source_timezone: str = os.getenv("SOURCE_TIMEZONE", "Australia/Brisbane")
+    reporting_timezone: str = os.getenv("REPORTING_TIMEZONE", "Australia/Brisbane")
+    analytics_backend: str = os.getenv("ANALYTICS_BACKEND", "sqlite")
+    duckdb_path: Path = Path(os.getenv("DUCKDB_PATH", "./data/analytics.duckdb"))
+    metrics_cache_size: int = int(os.getenv("METRICS_CACHE_SIZE", "256"))
     allowed_origins: List[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173").split(",")
 
     class Config:
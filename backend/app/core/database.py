@@ -1,15 +1,141 @@
-"""Database session and engine setup."""
+"""Database session and engine setup.
+
+Ingestion, the CLI and other writers share ``engine``, which SQLite limits to
+a single pooled connection so writers queue instead of failing on the
+database lock. Metrics and other reads go through ``read_engine`` or
+``async_engine``, pooled ``query_only`` connections that, with the WAL journal
+of the ``performance`` profile, keep reading while an upload commits.
+Against Postgres both sides use the ``DB_POOL_*`` settings and readers open
+read-only transactions.
+"""
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url.replace("+aiosqlite", ""), future=True)
+SYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+asyncpg": "postgresql+psycopg",
+}
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+SQLITE_PROFILES = ("default", "performance")
+
+T = TypeVar("T")
+
+
+def with_driver(url: str, drivers: dict[str, str]) -> str:
+    parsed = make_url(url)
+    if parsed.drivername in drivers:
+        parsed = parsed.set(drivername=drivers[parsed.drivername])
+    return parsed.render_as_string(hide_password=False)
+
+
+def sync_database_url(url: str) -> str:
+    return with_driver(url, SYNC_DRIVERS)
+
+
+def async_database_url(url: str) -> str:
+    """psycopg 3 serves both modes, so Postgres URLs only change for other drivers."""
+    return with_driver(url, ASYNC_DRIVERS)
+
+
+def sqlite_pragmas(profile: str, mmap_size: int = 0, cache_size_kib: int = 0) -> dict[str, Any]:
+    """PRAGMAs applied to every SQLite connection for ``profile``."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}; expected one of {', '.join(SQLITE_PROFILES)}")
+    if profile == "default":
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": mmap_size,
+        # Negative cache sizes are in KiB rather than pages.
+        "cache_size": -cache_size_kib,
+        "temp_store": "MEMORY",
+    }
+
+
+def configure_sqlite(engine: Engine, pragmas: dict[str, Any], read_only: bool = False) -> None:
+    """Apply ``pragmas`` to each new connection of a SQLite ``engine``."""
+    if engine.dialect.name != "sqlite" or not (pragmas or read_only):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def is_file_database(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() != "sqlite" or parsed.database not in (None, "", ":memory:")
+
+
+def server_pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+    }
+
+
+def writer_pool_options(url: str) -> dict[str, Any]:
+    """One pooled connection for SQLite files, which only ever allow one writer.
+
+    Checkouts wait for it without a timeout: a second upload queues behind a
+    long ingestion instead of failing once the default 30 seconds run out.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return server_pool_options()
+    if is_file_database(url):
+        return {"pool_size": 1, "max_overflow": 0, "pool_timeout": None}
+    return {}
+
+
+def reader_pool_options(url: str) -> dict[str, Any]:
+    if make_url(url).get_backend_name() == "postgresql":
+        return {**server_pool_options(), "connect_args": {"options": "-c default_transaction_read_only=on"}}
+    if is_file_database(url):
+        return {"pool_size": settings.sqlite_read_pool_size, "max_overflow": 0}
+    return {}
+
+
+SYNC_URL = sync_database_url(settings.database_url)
+PRAGMAS = sqlite_pragmas(settings.sqlite_profile, settings.sqlite_mmap_size, settings.sqlite_cache_size_kib)
+
+engine = create_engine(SYNC_URL, future=True, **writer_pool_options(SYNC_URL))
+configure_sqlite(engine, PRAGMAS)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
+# An in-memory database is private to its connection, so it cannot have separate readers.
+read_engine = create_engine(SYNC_URL, future=True, **reader_pool_options(SYNC_URL)) if is_file_database(SYNC_URL) else engine
+if read_engine is not engine:
+    configure_sqlite(read_engine, PRAGMAS, read_only=True)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+
+async_engine = create_async_engine(async_database_url(settings.database_url), **reader_pool_options(SYNC_URL))
+configure_sqlite(async_engine.sync_engine, PRAGMAS, read_only=is_file_database(SYNC_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_session():
     db = SessionLocal()
@@ -17,3 +143,18 @@ def get_session():
         yield db
     finally:
         db.close()
+
+
+def with_read_session(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Call ``fn(db, *args, **kwargs)`` on a read-only session opened for the call.
+
+    Async routes hand this to the threadpool, so the session is only opened
+    when the work actually runs there rather than on every request.
+    """
+    with ReadSessionLocal() as db:
+        return fn(db, *args, **kwargs)
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,13 @@
+"""JSON encoding shared by API responses and the metrics cache."""
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` with orjson, which also handles dates, datetimes and numpy values."""
+    return orjson.dumps(content, option=JSON_OPTIONS)
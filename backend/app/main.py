@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app.api import metrics, uploads
+from app.api import bets, metrics, uploads
 from app.core.config import settings
+from app.core.database import ReadSessionLocal
+from app.services.analytics import sync_analytics_mirror
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    db = ReadSessionLocal()
+    try:
+        sync_analytics_mirror(db)
+    finally:
+        db.close()
+    yield
+
 
-app = FastAPI(title="TrackMyBets 2.0 API", version="0.1.0")
+app = FastAPI(title="TrackMyBets 2.0 API", version="0.1.0", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -13,10 +29,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 app.include_router(uploads.router)
 app.include_router(metrics.router)
+app.include_router(bets.router)
 
 
 @app.get("/health", tags=["health"])
@@ -1,6 +1,12 @@
 from app.core.database import Base  # noqa: F401
+from app.models import search  # noqa: F401 - registers the bets_fts DDL events
 from app.models.bet import Bet  # noqa: F401
+from app.models.leg import Leg  # noqa: F401
+from app.models.metrics import BetMetric, MetricSnapshot  # noqa: F401
+from app.models.participant import BetParticipant  # noqa: F401
 from app.models.reference import Sport, SportAlias, SportEntity  # noqa: F401
+from app.models.transaction import Transaction  # noqa: F401
 from app.models.upload import Upload  # noqa: F401
+from app.models.user import User  # noqa: F401
 
-__all__ = ["Base", "Upload", "Bet", "Sport", "SportEntity", "SportAlias"]
+__all__ = ["Base", "User", "Upload", "Bet", "BetMetric", "MetricSnapshot", "BetParticipant", "Leg", "Transaction", "Sport", "SportEntity", "SportAlias"]
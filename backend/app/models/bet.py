@@ -1,22 +1,47 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import DECIMAL, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DECIMAL,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.models.user import DEFAULT_USER_ID
 
 
 class Bet(Base):
     __tablename__ = "bets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "bet_id", name="uq_bets_user_id_bet_id"),
+        Index("ix_bets_user_id_category_sport_key", "user_id", "category", "sport_key"),
+        Index("ix_bets_user_id_settled_at_id", "user_id", "settled_at", "id"),
+        *(
+            Index(f"ix_bets_breakdown_{dimension}", "user_id", "category", "sport_key", dimension, "stake", "payout")
+            for dimension in ("team", "opponent", "competition", "runner_name")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), default=DEFAULT_USER_ID, server_default=DEFAULT_USER_ID
+    )
     upload_id: Mapped[str] = mapped_column(String(36), ForeignKey("uploads.id"), index=True)
-    bet_id: Mapped[str] = mapped_column(String(128), unique=True, index=True)
+    bet_id: Mapped[str] = mapped_column(String(128))
     last_transaction_id: Mapped[str] = mapped_column(String(128))
     sport: Mapped[str | None] = mapped_column(String(128))
+    sport_key: Mapped[str | None] = mapped_column(String(128))
+    category: Mapped[str | None] = mapped_column(String(16))
     competition: Mapped[str | None] = mapped_column(String(256))
     team: Mapped[str | None] = mapped_column(String(256))
     opponent: Mapped[str | None] = mapped_column(String(256))
@@ -28,9 +53,12 @@ class Bet(Base):
     runner_number: Mapped[str | None] = mapped_column(String(32))
     runner_name: Mapped[str | None] = mapped_column(String(256))
     odds: Mapped[str | None] = mapped_column(String(64))
+    decimal_odds: Mapped[Decimal | None] = mapped_column(DECIMAL(10, 4), index=True)
+    implied_probability: Mapped[Decimal | None] = mapped_column(DECIMAL(7, 6), index=True)
     result: Mapped[str | None] = mapped_column(String(32))
     stake: Mapped[Decimal | None] = mapped_column(DECIMAL(12, 2))
     payout: Mapped[Decimal | None] = mapped_column(DECIMAL(12, 2))
     settled_at: Mapped[datetime | None] = mapped_column(DateTime)
+    settled_day: Mapped[date | None] = mapped_column(Date, index=True)
 
     upload = relationship("Upload", backref="bets")
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class Leg(Base):
+    """One selection of a bet; singles have one leg, multis several."""
+
+    __tablename__ = "legs"
+    __table_args__ = (
+        Index("ix_legs_bet_id_leg_number", "bet_id", "leg_number", unique=True),
+        Index("ix_legs_sport_market_type", "sport", "market_type"),
+        Index("ix_legs_team", "team"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bet_id: Mapped[int] = mapped_column(Integer, ForeignKey("bets.id", ondelete="CASCADE"))
+    leg_number: Mapped[int] = mapped_column(Integer)
+    sport: Mapped[str | None] = mapped_column(String(128))
+    event: Mapped[str | None] = mapped_column(String(256))
+    team: Mapped[str | None] = mapped_column(String(256))
+    market_type: Mapped[str | None] = mapped_column(String(128))
+    selection: Mapped[str | None] = mapped_column(Text)
+    odds: Mapped[str | None] = mapped_column(String(64))
+    decimal_odds: Mapped[Decimal | None] = mapped_column(DECIMAL(10, 4), index=True)
+    result: Mapped[str | None] = mapped_column(String(32))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import DECIMAL, JSON, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.user import DEFAULT_USER_ID
+
+
+class BetMetric(Base):
+    """Per-group bet totals maintained incrementally during ingestion."""
+
+    __tablename__ = "bet_metrics"
+    __table_args__ = (
+        Index("ix_bet_metrics_user_id_category_day", "user_id", "category", "day"),
+        *(
+            Index(
+                f"ix_bet_metrics_breakdown_{dimension}",
+                "user_id",
+                "category",
+                "sport_key",
+                dimension,
+                "bet_count",
+                "win_count",
+                "stake",
+                "payout",
+                "profit",
+            )
+            for dimension in ("sport", "bet_type", "market_type", "track")
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), default=DEFAULT_USER_ID, server_default=DEFAULT_USER_ID
+    )
+    sport: Mapped[str | None] = mapped_column(String(128))
+    sport_key: Mapped[str | None] = mapped_column(String(128))
+    bet_type: Mapped[str | None] = mapped_column(String(64))
+    market_type: Mapped[str | None] = mapped_column(String(64))
+    track: Mapped[str | None] = mapped_column(String(128))
+    category: Mapped[str] = mapped_column(String(16))
+    day: Mapped[date | None] = mapped_column(Date)
+    bet_count: Mapped[int] = mapped_column(Integer, default=0)
+    win_count: Mapped[int] = mapped_column(Integer, default=0)
+    staked_count: Mapped[int] = mapped_column(Integer, default=0)
+    stake: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=Decimal("0"))
+    payout: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=Decimal("0"))
+    profit: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=Decimal("0"))
+
+
+class MetricSnapshot(Base):
+    """A precomputed metrics payload refreshed on ingest, keyed by user and name."""
+
+    __tablename__ = "metric_snapshots"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True)
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class BetParticipant(Base):
+    """Links a bet to each resolved team or player it involves."""
+
+    __tablename__ = "bet_participants"
+    __table_args__ = (
+        Index("ix_bet_participants_entity_id_bet_id", "entity_id", "bet_id"),
+    )
+
+    bet_id: Mapped[int] = mapped_column(Integer, ForeignKey("bets.id", ondelete="CASCADE"), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("sport_entities.id", ondelete="CASCADE"), primary_key=True
+    )
+    role: Mapped[str] = mapped_column(String(16), primary_key=True)
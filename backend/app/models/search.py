@@ -0,0 +1,55 @@
+"""Full-text index over the free text of bets, kept outside ``Base.metadata``.
+
+SQLite gets an FTS5 virtual table whose rowid is ``bets.id``; Postgres gets a
+``tsvector`` table with a GIN index. Neither can be declared portably, so both
+are created with ``bets`` by DDL events (migration 0010 repeats the DDL) and hidden
+from autogenerate with ``include_name``.
+"""
+from __future__ import annotations
+
+from sqlalchemy import event
+
+from app.models.bet import Bet
+
+SEARCH_TABLE = "bets_fts"
+SEARCH_COLUMNS = ("description", "runner_name", "team", "track")
+
+SEARCH_DDL = {
+    "sqlite": (
+        (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            f"{', '.join(SEARCH_COLUMNS)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ),
+    ),
+    "postgresql": (
+        (
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "id INTEGER PRIMARY KEY REFERENCES bets (id) ON DELETE CASCADE, document TSVECTOR NOT NULL)"
+        ),
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    ),
+}
+
+
+def create_search_table(connection) -> None:
+    for statement in SEARCH_DDL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
+
+
+def drop_search_table(connection) -> None:
+    if connection.dialect.name in SEARCH_DDL:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def is_search_table(name: str | None) -> bool:
+    """The index table and the shadow tables FTS5 keeps beside it."""
+    return name is not None and (name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_"))
+
+
+def include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    """Alembic ``include_name`` hook leaving the search tables out of autogenerate."""
+    return type_ != "table" or not is_search_table(name)
+
+
+event.listen(Bet.__table__, "after_create", lambda _table, connection, **_: create_search_table(connection))
+event.listen(Bet.__table__, "before_drop", lambda _table, connection, **_: drop_search_table(connection))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    DECIMAL,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.user import DEFAULT_USER_ID
+
+
+class Transaction(Base):
+    """One row of a Sportsbet export, stored once however many uploads repeat it."""
+
+    __tablename__ = "transactions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "transaction_id", name="uq_transactions_user_id_transaction_id"),
+        Index("ix_transactions_user_id_day_occurred_at", "user_id", "day", "occurred_at", "id"),
+        Index("ix_transactions_user_id_type_amount", "user_id", "type", "amount"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), default=DEFAULT_USER_ID, server_default=DEFAULT_USER_ID
+    )
+    transaction_id: Mapped[str] = mapped_column(String(128))
+    upload_id: Mapped[str] = mapped_column(String(36), ForeignKey("uploads.id"), index=True)
+    type: Mapped[str] = mapped_column(String(32))
+    amount: Mapped[Decimal] = mapped_column(DECIMAL(12, 2))
+    balance: Mapped[Decimal | None] = mapped_column(DECIMAL(12, 2))
+    occurred_at: Mapped[datetime | None] = mapped_column(DateTime)
+    day: Mapped[date | None] = mapped_column(Date)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DDL, DateTime, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# Owner of every row written before accounts existed, and of requests that name no user.
+DEFAULT_USER_ID = "local"
+
+
+class User(Base):
+    """An account whose uploads, bets and aggregates are partitioned by ``user_id``."""
+
+    __tablename__ = "users"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+# Every ``user_id`` column defaults to this row, so ``create_all`` seeds it as migration 0009 does.
+event.listen(
+    User.__table__,
+    "after_create",
+    DDL(f"INSERT INTO users (id, created_at) VALUES ('{DEFAULT_USER_ID}', CURRENT_TIMESTAMP)"),
+)
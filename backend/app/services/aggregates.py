@@ -0,0 +1,60 @@
+"""Conditional aggregates rendered with the best syntax each dialect offers.
+
+Postgres gets ``FILTER (WHERE ...)`` clauses, which skip non-matching rows
+instead of summing a ``CASE`` that yields zero for them; other dialects get
+the portable ``SUM(CASE ...)`` form. Both return 0 rather than NULL when no
+row matches.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Integer, case, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement, FunctionElement
+
+
+class sum_where(FunctionElement):
+    """``SUM(value)`` over the rows matching ``condition``."""
+
+    name = "sum_where"
+    inherit_cache = True
+
+    def __init__(self, value: Any, condition: ColumnElement[bool]) -> None:
+        super().__init__(value, condition)
+        self.type = self.clauses.clauses[0].type
+
+
+class count_where(FunctionElement):
+    """``COUNT(*)`` of the rows matching ``condition``."""
+
+    name = "count_where"
+    inherit_cache = True
+    type = Integer()
+
+    def __init__(self, condition: ColumnElement[bool]) -> None:
+        super().__init__(condition)
+
+
+@compiles(sum_where)
+def _sum_case(element: sum_where, compiler, **kw) -> str:
+    value, condition = element.clauses.clauses
+    return compiler.process(func.coalesce(func.sum(case((condition, value), else_=0)), 0), **kw)
+
+
+@compiles(sum_where, "postgresql")
+def _sum_filter(element: sum_where, compiler, **kw) -> str:
+    value, condition = element.clauses.clauses
+    return compiler.process(func.coalesce(func.sum(value).filter(condition), 0), **kw)
+
+
+@compiles(count_where)
+def _count_case(element: count_where, compiler, **kw) -> str:
+    (condition,) = element.clauses.clauses
+    return compiler.process(func.coalesce(func.sum(case((condition, 1), else_=0)), 0), **kw)
+
+
+@compiles(count_where, "postgresql")
+def _count_filter(element: count_where, compiler, **kw) -> str:
+    (condition,) = element.clauses.clauses
+    return compiler.process(func.count(literal_column("*")).filter(condition), **kw)
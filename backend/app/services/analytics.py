@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import duckdb
+import pandas as pd
+from loguru import logger
+from sqlalchemy import Executable, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql.base import PGTypeCompiler
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bet import Bet
+from app.models.upload import Upload
+from app.services.columnar import (
+    active_store,
+    load_columnar_store,
+    processed_uploads_select,
+)
+
+MIRROR_COLUMNS = (
+    "id",
+    "user_id",
+    "upload_id",
+    "sport",
+    "sport_key",
+    "category",
+    "competition",
+    "team",
+    "opponent",
+    "bet_type",
+    "market_type",
+    "track",
+    "runner_name",
+    "stake",
+    "payout",
+    "decimal_odds",
+    "settled_at",
+    "settled_day",
+)
+AMOUNT_COLUMNS = ("stake", "payout", "decimal_odds")
+
+MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bets (
+    id INTEGER PRIMARY KEY,
+    upload_id VARCHAR,
+    sport VARCHAR,
+    sport_key VARCHAR,
+    category VARCHAR,
+    competition VARCHAR,
+    team VARCHAR,
+    opponent VARCHAR,
+    bet_type VARCHAR,
+    market_type VARCHAR,
+    track VARCHAR,
+    runner_name VARCHAR,
+    stake DOUBLE,
+    payout DOUBLE,
+    decimal_odds DOUBLE,
+    settled_at TIMESTAMP,
+    settled_day DATE
+);
+ALTER TABLE bets ADD COLUMN IF NOT EXISTS user_id VARCHAR;
+CREATE TABLE IF NOT EXISTS synced_uploads (
+    upload_id VARCHAR PRIMARY KEY,
+    processed_at TIMESTAMP
+);
+CREATE OR REPLACE VIEW bet_metrics AS
+SELECT
+    user_id,
+    sport,
+    sport_key,
+    bet_type,
+    market_type,
+    track,
+    category,
+    settled_day AS day,
+    1 AS bet_count,
+    CASE WHEN payout > stake THEN 1 ELSE 0 END AS win_count,
+    CASE WHEN COALESCE(stake, 0) <> 0 THEN 1 ELSE 0 END AS staked_count,
+    COALESCE(stake, 0) AS stake,
+    COALESCE(payout, 0) AS payout,
+    COALESCE(payout, 0) - COALESCE(stake, 0) AS profit
+FROM bets;
+"""
+
+
+class DuckDBTypeCompiler(PGTypeCompiler):
+    """Render unbounded ``NUMERIC`` casts as ``DOUBLE``.
+
+    SQLAlchemy casts the divisor of numeric divisions to ``NUMERIC``, which
+    DuckDB reads as ``DECIMAL(18, 3)`` and would truncate ratios like ROI.
+    """
+
+    def visit_NUMERIC(self, type_, **kw):  # noqa: ANN001, ANN201
+        if type_.precision is None:
+            return "DOUBLE"
+        return super().visit_NUMERIC(type_, **kw)
+
+
+class DuckDBDialect(postgresql.dialect):
+    type_compiler_cls = DuckDBTypeCompiler
+
+
+class MirrorResult(list):
+    """The subset of SQLAlchemy's ``Result`` API the metrics services use."""
+
+    def all(self) -> list[Any]:
+        return list(self)
+
+    def one(self) -> Any:
+        if len(self) != 1:
+            raise ValueError(f"Expected one row, got {len(self)}")
+        return self[0]
+
+
+class DuckDBMirror:
+    """Columnar copy of ``bets`` in DuckDB for analytical scans.
+
+    SQLite stays the system of record. Amounts are stored as ``DOUBLE``,
+    matching SQLite's REAL storage so both stores round identically. The mirror is refreshed per upload
+    after ingestion commits, and exposes a ``bet_metrics`` view with the
+    summary table's columns, so the same SQLAlchemy statements run on either
+    store. ``synced_uploads`` records the ``processed_at`` of every upload
+    mirrored. A failed sync marks the mirror stale and queries fall back to
+    SQLite until it is rebuilt.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.stale = False
+        self._connection: duckdb.DuckDBPyConnection | None = None
+        self._lock = Lock()
+
+    def connection(self) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            if self._connection is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._connection = duckdb.connect(str(self.path))
+                self._connection.execute(MIRROR_SCHEMA)
+            return self._connection
+
+    def execute(self, stmt: Executable) -> MirrorResult:
+        sql = str(stmt.compile(dialect=DuckDBDialect(), compile_kwargs={"literal_binds": True}))
+        cursor = self.connection().cursor()
+        try:
+            cursor.execute(sql)
+            Row = namedtuple("Row", [column[0] for column in cursor.description], rename=True)
+            processors = result_processors(stmt)
+            return MirrorResult(
+                Row(*(process(value) if process else value for process, value in zip(processors, row)))
+                for row in cursor.fetchall()
+            )
+        finally:
+            cursor.close()
+
+    def sync_upload(self, db: Session, upload_id: str) -> None:
+        """Replace the mirrored rows of every bet last written by ``upload_id``."""
+        try:
+            uploads = db.execute(processed_uploads_select().where(Upload.id == upload_id)).all()
+            self._replace(mirror_frame(db.execute(mirror_select().where(Bet.upload_id == upload_id)).all()))
+            self._mark_synced(uploads)
+        except Exception:  # noqa: BLE001 - the mirror must never fail an upload
+            logger.exception("Failed to sync analytics mirror for upload {}", upload_id)
+            self.stale = True
+
+    def rebuild(self, db: Session, chunk_size: int = 100_000) -> None:
+        connection = self.connection()
+        uploads = db.execute(processed_uploads_select()).all()
+        with self._lock:
+            connection.execute("DELETE FROM bets")
+            connection.execute("DELETE FROM synced_uploads")
+        result = db.execute(mirror_select().order_by(Bet.id).execution_options(yield_per=chunk_size))
+        for rows in result.partitions():
+            self._replace(mirror_frame(rows))
+        self._mark_synced(uploads)
+        self.stale = False
+
+    def synced_uploads(self) -> dict[str, datetime | None]:
+        cursor = self.connection().cursor()
+        try:
+            return dict(cursor.execute("SELECT upload_id, processed_at FROM synced_uploads").fetchall())
+        finally:
+            cursor.close()
+
+    def mirrored_totals(self) -> tuple[int, int | None]:
+        """Row count and highest id of the mirrored bets, counting only rows with a ``user_id``."""
+        cursor = self.connection().cursor()
+        try:
+            return tuple(cursor.execute("SELECT count(user_id), max(id) FROM bets").fetchone())
+        finally:
+            cursor.close()
+
+    def ensure_synced(self, db: Session) -> None:
+        """Rebuild unless every processed upload is mirrored as of its ``processed_at``.
+
+        Re-ingested bets keep the row count and highest id, so the uploads'
+        ``processed_at`` is what reveals a sync the mirror missed. The row
+        counts are compared as well, counting only rows with a ``user_id`` so
+        a mirror written before bets were partitioned by user is rebuilt too.
+        """
+        expected = tuple(db.execute(select(func.count(), func.max(Bet.id)).select_from(Bet)).one())
+        actual = self.mirrored_totals()
+        uploads = dict(db.execute(processed_uploads_select()).all())
+        if self.stale or actual != expected or self.synced_uploads() != uploads:
+            logger.info("Rebuilding analytics mirror ({} rows in SQLite, {} mirrored)", expected[0], actual[0])
+            self.rebuild(db)
+
+    def _mark_synced(self, uploads: list[Any]) -> None:
+        if not uploads:
+            return
+        connection = self.connection()
+        with self._lock:
+            connection.executemany(
+                "INSERT OR REPLACE INTO synced_uploads VALUES (?, ?)", [tuple(row) for row in uploads]
+            )
+
+    def _replace(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        connection = self.connection()
+        with self._lock:
+            connection.register("incoming", frame)
+            try:
+                connection.execute("BEGIN")
+                connection.execute("DELETE FROM bets WHERE id IN (SELECT id FROM incoming)")
+                connection.execute(f"INSERT INTO bets ({', '.join(MIRROR_COLUMNS)}) SELECT * FROM incoming")
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            finally:
+                connection.unregister("incoming")
+
+
+def result_processors(stmt: Executable) -> list[Any]:
+    """SQLite's result processors for ``stmt``'s columns.
+
+    Applying them makes mirrored rows carry the same Python types and
+    ``Numeric`` scale rounding as rows read from SQLite.
+    """
+    dialect = sqlite.dialect()
+    return [column.type.result_processor(dialect, None) for column in stmt.selected_columns]
+
+
+def mirror_select():
+    return select(*(getattr(Bet, column) for column in MIRROR_COLUMNS))
+
+
+def mirror_frame(rows: list[Any]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=list(MIRROR_COLUMNS))
+    for column in AMOUNT_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    frame["settled_at"] = pd.to_datetime(frame["settled_at"])
+    frame["settled_day"] = pd.to_datetime(frame["settled_day"])
+    return frame
+
+
+analytics_mirror = DuckDBMirror(settings.duckdb_path) if settings.analytics_backend == "duckdb" else None
+
+
+def analytics_execute(db: Session, stmt: Executable) -> Any:
+    """Run an aggregate on the analytics mirror when enabled, else on SQLite."""
+    if analytics_mirror is not None and not analytics_mirror.stale:
+        return analytics_mirror.execute(stmt)
+    return db.execute(stmt)
+
+
+def analytics_dialect(db: Session) -> str:
+    """Name of the database ``analytics_execute`` will run statements on."""
+    if analytics_mirror is not None and not analytics_mirror.stale:
+        return "duckdb"
+    return db.get_bind().dialect.name
+
+
+def sync_analytics_mirror(db: Session, upload_id: str | None = None) -> None:
+    """Bring the configured analytics backend up to date with SQLite.
+
+    Without ``upload_id`` the backend is loaded or verified in full, as at
+    startup; with it only the bets written by that upload are refreshed.
+    """
+    store = active_store()
+    if store is not None:
+        load_columnar_store(db, store, upload_id)
+    if analytics_mirror is None:
+        return
+    if upload_id is None:
+        analytics_mirror.ensure_synced(db)
+    else:
+        analytics_mirror.sync_upload(db, upload_id)
+
+
+def refresh_analytics(db: Session) -> None:
+    """Load uploads processed since this process last synced its columnar store.
+
+    Ingestion refreshes the store of the worker that ran it; the others catch
+    up here before building a payload from theirs.
+    """
+    store = active_store()
+    if store is None:
+        return
+    for upload_id, processed_at in db.execute(processed_uploads_select()):
+        if store.synced.get(upload_id) != processed_at:
+            load_columnar_store(db, store, upload_id)
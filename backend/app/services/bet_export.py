@@ -0,0 +1,228 @@
+"""Reading normalised bets back out: keyset pages and streamed exports.
+
+Both walk a user's bets in ``(settled_at, id)`` order along
+``ix_bets_user_id_settled_at_id``. Pages resume after the last row a client
+received instead of using ``OFFSET``, and exports stream ``yield_per``
+partitions from a server-side cursor through an encoder, so memory stays
+bounded by one partition however many bets are exported.
+"""
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Select, and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bet import Bet
+from app.models.user import DEFAULT_USER_ID
+from app.services.metrics_breakdown import apply_filters
+
+EXPORT_COLUMNS = (
+    "id",
+    "bet_id",
+    "upload_id",
+    "settled_at",
+    "settled_day",
+    "sport",
+    "category",
+    "competition",
+    "team",
+    "opponent",
+    "track",
+    "race",
+    "runner_number",
+    "runner_name",
+    "bet_type",
+    "market_type",
+    "description",
+    "odds",
+    "decimal_odds",
+    "implied_probability",
+    "result",
+    "stake",
+    "payout",
+)
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+DEFAULT_PAGE_SIZE = 100
+EXPORT_CHUNK_SIZE = 5000
+
+
+def bets_select(category: str | None = None, sport: str | None = None, user_id: str = DEFAULT_USER_ID) -> Select:
+    stmt = select(*(getattr(Bet, column) for column in EXPORT_COLUMNS)).order_by(Bet.settled_at, Bet.id)
+    return apply_filters(stmt, category, sport, source=Bet, user_id=user_id)
+
+
+def nulls_sort_first(dialect_name: str) -> bool:
+    """Whether ascending ``ORDER BY`` puts NULLs first, as SQLite does and Postgres does not."""
+    return dialect_name != "postgresql"
+
+
+def after_bet(settled_at: datetime | None, bet_pk: int, nulls_first: bool):
+    """Rows after ``(settled_at, bet_pk)`` in ``(settled_at, id)`` order.
+
+    Unsettled bets sort together at whichever end the dialect puts NULLs.
+    """
+    if settled_at is None:
+        unsettled = and_(Bet.settled_at.is_(None), Bet.id > bet_pk)
+        return or_(unsettled, Bet.settled_at.isnot(None)) if nulls_first else unsettled
+    settled = tuple_(Bet.settled_at, Bet.id) > tuple_(settled_at, bet_pk)
+    return settled if nulls_first else or_(settled, Bet.settled_at.is_(None))
+
+
+def bets_page_select(
+    dialect_name: str,
+    category: str | None = None,
+    sport: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after_settled_at: datetime | None = None,
+    after_id: int | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> Select:
+    """One page of bets; pass the ``settled_at`` and ``id`` of the last row received to continue."""
+    stmt = bets_select(category, sport, user_id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(after_bet(after_settled_at, after_id, nulls_sort_first(dialect_name)))
+    return stmt
+
+
+def bet_record(row: Any) -> dict[str, Any]:
+    """A JSON-ready bet: amounts as floats, timestamps and days in ISO format."""
+    record = dict(zip(EXPORT_COLUMNS, row))
+    for name, value in record.items():
+        if isinstance(value, Decimal):
+            record[name] = float(value)
+        elif isinstance(value, (datetime, date)):
+            record[name] = value.isoformat()
+    return record
+
+
+class NDJSONEncoder:
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        return "".join(json.dumps(bet_record(row)) + "\n" for row in rows).encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CSVEncoder:
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def start(self) -> bytes:
+        self._writer.writerow(EXPORT_COLUMNS)
+        return self._drain()
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return b""
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class ChunkSink(io.RawIOBase):
+    """A write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetEncoder:
+    """Writes each partition as one Parquet row group; the footer follows the last one."""
+
+    def __init__(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        types = {
+            "id": pa.int64(),
+            "settled_at": pa.timestamp("us"),
+            "settled_day": pa.date32(),
+            "decimal_odds": pa.decimal128(10, 4),
+            "implied_probability": pa.decimal128(7, 6),
+            "stake": pa.decimal128(12, 2),
+            "payout": pa.decimal128(12, 2),
+        }
+        self.schema = pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS])
+        self._sink = ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self.schema)
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        arrays = [self._pa.array(values, type=field.type) for values, field in zip(zip(*rows), self.schema)]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+ENCODERS = {"ndjson": NDJSONEncoder, "csv": CSVEncoder, "parquet": ParquetEncoder}
+
+
+def parquet_available() -> bool:
+    """Parquet export needs ``pyarrow``, installed with the ``parquet`` extra."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+async def export_bets(
+    db: AsyncSession,
+    export_format: str,
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Stream a user's bets encoded as ``export_format``, one partition at a time."""
+    encoder = ENCODERS[export_format]()
+    header = encoder.start()
+    if header:
+        yield header
+    result = await db.stream(bets_select(category, sport, user_id).execution_options(yield_per=chunk_size))
+    async for rows in result.partitions():
+        yield encoder.encode(rows)
+    footer = encoder.finish()
+    if footer:
+        yield footer
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.metrics import BetMetric
+from app.services.aggregates import count_where
+from app.services.timeseries import settled_day
+
+MetricKey = tuple[str, str | None, str | None, str | None, str | None, str, date | None]
+
+KEY_COLUMNS = ("user_id", "sport", "bet_type", "market_type", "track", "category", "day")
+COUNTERS = ("bet_count", "win_count", "staked_count")
+AMOUNTS = ("stake", "payout", "profit")
+# Seven bound parameters per key, well under SQLite's limit of 999 per statement.
+FLUSH_CHUNK_SIZE = 100
+
+
+class MetricDeltas:
+    """Accumulates signed per-group changes to ``bet_metrics``.
+
+    ``upsert_bets`` removes a bet's previous contribution before it is
+    overwritten and adds the new one afterwards, so the summary table only
+    ever touches the groups affected by an upload. ``flush`` loads just those
+    groups' rows, so its cost follows the upload rather than the history.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[MetricKey, dict[str, int | Decimal]] = defaultdict(
+            lambda: {
+                "bet_count": 0,
+                "win_count": 0,
+                "staked_count": 0,
+                "stake": Decimal("0"),
+                "payout": Decimal("0"),
+                "profit": Decimal("0"),
+            }
+        )
+
+    def add(self, bet: Bet) -> None:
+        self._apply(bet, 1)
+
+    def remove(self, bet: Bet) -> None:
+        self._apply(bet, -1)
+
+    def _apply(self, bet: Bet, sign: int) -> None:
+        stake = bet.stake
+        payout = bet.payout
+        entry = self._deltas[metric_key(bet)]
+        entry["bet_count"] += sign
+        if stake is not None and payout is not None and payout > stake:
+            entry["win_count"] += sign
+        if stake:
+            entry["staked_count"] += sign
+        entry["stake"] += sign * (stake or Decimal("0"))
+        entry["payout"] += sign * (payout or Decimal("0"))
+        entry["profit"] += sign * ((payout or Decimal("0")) - (stake or Decimal("0")))
+
+    def flush(self, db: Session) -> None:
+        pending = {key: values for key, values in self._deltas.items() if any(values.values())}
+        self._deltas.clear()
+        if not pending:
+            return
+
+        keys = list(pending)
+        existing: dict[MetricKey, BetMetric] = {}
+        for offset in range(0, len(keys), FLUSH_CHUNK_SIZE):
+            stmt = select(BetMetric).where(matching_keys(keys[offset : offset + FLUSH_CHUNK_SIZE]))
+            existing.update((row_key(row), row) for row in db.execute(stmt).scalars())
+        for key, values in pending.items():
+            row = existing.get(key)
+            if row is None:
+                user_id, sport, bet_type, market_type, track, category, day = key
+                row = BetMetric(
+                    user_id=user_id,
+                    sport=sport,
+                    sport_key=normalize_key(sport),
+                    bet_type=bet_type,
+                    market_type=market_type,
+                    track=track,
+                    category=category,
+                    day=day,
+                    **{name: 0 for name in COUNTERS},
+                    **{name: Decimal("0") for name in AMOUNTS},
+                )
+                db.add(row)
+                existing[key] = row
+            for name in COUNTERS + AMOUNTS:
+                setattr(row, name, getattr(row, name) + values[name])
+            if row.bet_count <= 0:
+                if row.id is not None:
+                    db.delete(row)
+                else:
+                    db.expunge(row)
+                existing.pop(key)
+
+
+def metric_key(bet: Bet) -> MetricKey:
+    return (
+        bet.user_id,
+        bet.sport,
+        bet.bet_type,
+        bet.market_type,
+        bet.track,
+        bet_category(bet.track),
+        bet.settled_day,
+    )
+
+
+def row_key(row: BetMetric) -> MetricKey:
+    return tuple(getattr(row, name) for name in KEY_COLUMNS)
+
+
+def matching_keys(keys: Sequence[MetricKey]) -> ColumnElement[bool]:
+    """Rows whose group is one of ``keys``; a ``None`` in a key matches ``NULL``."""
+    columns = [getattr(BetMetric, name) for name in KEY_COLUMNS]
+    return or_(
+        *(and_(*(column.is_not_distinct_from(value) for column, value in zip(columns, key))) for key in keys)
+    )
+
+
+def bet_category(track: str | None) -> str:
+    return "racing" if track is not None else "sport"
+
+
+def normalize_key(value: str | None) -> str | None:
+    if value is None:
+        return None
+    return value.strip().lower() or None
+
+
+def rebuild_bet_metrics(db: Session) -> None:
+    """Recompute ``bet_metrics`` from scratch, e.g. after a schema reset."""
+    for bet in db.execute(select(Bet).where(Bet.settled_day.is_(None))).scalars():
+        bet.settled_day = settled_day(bet.settled_at, bet.upload.created_at if bet.upload else None)
+    db.execute(
+        update(Bet)
+        .where(Bet.category.is_(None))
+        .values(
+            category=case((Bet.track.isnot(None), "racing"), else_="sport"),
+            sport_key=func.nullif(func.lower(func.trim(Bet.sport)), ""),
+        )
+    )
+    db.execute(delete(BetMetric))
+
+    stake = func.coalesce(Bet.stake, 0)
+    payout = func.coalesce(Bet.payout, 0)
+    groups = select(
+        Bet.user_id,
+        Bet.sport,
+        Bet.sport_key,
+        Bet.bet_type,
+        Bet.market_type,
+        Bet.track,
+        Bet.category,
+        Bet.settled_day,
+        func.count(),
+        count_where(Bet.payout > Bet.stake),
+        func.count(func.nullif(Bet.stake, 0)),
+        func.coalesce(func.sum(stake), 0),
+        func.coalesce(func.sum(payout), 0),
+        func.coalesce(func.sum(payout - stake), 0),
+    ).group_by(
+        Bet.user_id,
+        Bet.sport,
+        Bet.sport_key,
+        Bet.bet_type,
+        Bet.market_type,
+        Bet.track,
+        Bet.category,
+        Bet.settled_day,
+    )
+    db.execute(
+        insert(BetMetric).from_select(
+            [
+                "user_id",
+                "sport",
+                "sport_key",
+                "bet_type",
+                "market_type",
+                "track",
+                "category",
+                "day",
+                *COUNTERS,
+                *AMOUNTS,
+            ],
+            groups,
+        )
+    )
+    db.commit()
@@ -0,0 +1,92 @@
+"""Bulk loading through ``COPY`` for Postgres.
+
+Ingestion on Postgres streams rows into a temporary staging table with
+``COPY ... FROM STDIN`` and applies them with one ``INSERT ... SELECT ...
+ON CONFLICT`` merge, instead of one statement (or one executemany batch) per
+row. Other dialects keep the ORM/executemany paths of the callers.
+"""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from sqlalchemy import Column, Integer, MetaData, Result, Table, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable, DropTable
+
+STAGED_POSITION = "staged_position"
+
+
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def staging_table(table: Table, columns: Sequence[str]) -> Table:
+    """A temporary copy of ``columns`` of ``table``, dropped at commit.
+
+    ``staged_position`` records input order so the merge inserts rows, and
+    assigns their serial ids, in the order they were given.
+    """
+    return Table(
+        f"staging_{table.name}",
+        MetaData(),
+        *(Column(name, table.c[name].type) for name in columns),
+        Column(STAGED_POSITION, Integer),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def merge_statement(
+    table: Table,
+    staging: Table,
+    columns: Sequence[str],
+    conflict: Sequence[str],
+    update: Sequence[str] = (),
+) -> postgresql.Insert:
+    """``INSERT INTO table SELECT ... FROM staging ON CONFLICT``.
+
+    Conflicting rows are updated with the staged values of ``update``, or
+    left untouched when ``update`` is empty.
+    """
+    source = select(*(staging.c[name] for name in columns)).order_by(staging.c[STAGED_POSITION])
+    stmt = postgresql.insert(table).from_select(list(columns), source)
+    if update:
+        return stmt.on_conflict_do_update(
+            index_elements=list(conflict),
+            set_={name: stmt.excluded[name] for name in update},
+        )
+    return stmt.on_conflict_do_nothing(index_elements=list(conflict))
+
+
+def copy_rows(db: Session, staging: Table, columns: Sequence[str], rows: Sequence[dict[str, Any]]) -> None:
+    """Stream ``rows`` into ``staging`` with ``COPY ... FROM STDIN`` (psycopg 3)."""
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    names = ", ".join(quote(name) for name in (*columns, STAGED_POSITION))
+    cursor = db.connection().connection.cursor()
+    try:
+        with cursor.copy(f"COPY {quote(staging.name)} ({names}) FROM STDIN") as copy:
+            for position, row in enumerate(rows):
+                copy.write_row([*(row.get(name) for name in columns), position])
+    finally:
+        cursor.close()
+
+
+def stage_and_merge(
+    db: Session,
+    table: Table,
+    rows: Sequence[dict[str, Any]],
+    conflict: Sequence[str],
+    update: Sequence[str] = (),
+    returning: Sequence[Column] = (),
+) -> Result:
+    """COPY ``rows`` into a staging table and merge them into ``table`` in one statement."""
+    columns = list(rows[0])
+    staging = staging_table(table, columns)
+    db.execute(DropTable(staging, if_exists=True))
+    db.execute(CreateTable(staging))
+    copy_rows(db, staging, columns, rows)
+    stmt = merge_statement(table, staging, columns, conflict, update)
+    if returning:
+        stmt = stmt.returning(*returning)
+    return db.execute(stmt)
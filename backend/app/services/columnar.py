@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from threading import RLock
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bet import Bet
+from app.models.upload import Upload
+
+ENCODED_DIMENSIONS = ("user_id", "sport", "sport_key", "bet_type", "market_type", "track", "category")
+UNCLASSIFIED_SPORTS = {"unknown", "unclassified"}
+EPOCH = date(1970, 1, 1)
+EPOCH_TIME = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NO_DAY = np.iinfo(np.int32).min
+NO_TIME = np.iinfo(np.int64).min
+FILL_VALUES = {"day": NO_DAY, "settled": NO_TIME}
+
+
+class GroupTotals(NamedTuple):
+    key: tuple[Any, ...]
+    bets: int
+    wins: int
+    staked_bets: int
+    stake: float
+    payout: float
+    profit: float
+
+
+class Dictionary:
+    """Dictionary encoding for one string column; code 0 is always ``None``."""
+
+    def __init__(self) -> None:
+        self.values: list[str | None] = [None]
+        self.codes: dict[str | None, int] = {None: 0}
+
+    def encode(self, value: str | None) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str | None) -> int | None:
+        return self.codes.get(value)
+
+
+class ColumnarStore:
+    """In-memory, column-oriented copy of the bets the metrics read.
+
+    Amounts are int64 cents, days are int32 days since the epoch, settlement
+    times are int64 microseconds since the epoch and the dimensions are
+    dictionary-encoded int32 codes, so a breakdown is a mask plus
+    ``np.bincount`` over a combined group code rather than a SQL scan.
+    Rows are addressed by ``bets.id``: re-ingested bets are overwritten in
+    place and new ones appended. ``synced`` holds the ``processed_at`` of each
+    upload loaded, so uploads processed by other workers can be caught up.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._lock = RLock()
+        self._size = 0
+        self._positions: dict[int, int] = {}
+        self.synced: dict[str, datetime | None] = {}
+        self.dictionaries = {name: Dictionary() for name in ENCODED_DIMENSIONS}
+        self._columns: dict[str, np.ndarray] = {
+            "id": np.zeros(capacity, dtype=np.int64),
+            "stake": np.zeros(capacity, dtype=np.int64),
+            "payout": np.zeros(capacity, dtype=np.int64),
+            "odds": np.zeros(capacity, dtype=np.float64),
+            "win": np.zeros(capacity, dtype=np.bool_),
+            "staked": np.zeros(capacity, dtype=np.bool_),
+            "day": np.full(capacity, NO_DAY, dtype=np.int32),
+            "settled": np.full(capacity, NO_TIME, dtype=np.int64),
+            **{name: np.zeros(capacity, dtype=np.int32) for name in ENCODED_DIMENSIONS},
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][: self._size]
+
+    def upsert(self, rows: Sequence[Any]) -> None:
+        """Write rows of ``store_select``'s columns."""
+        if not rows:
+            return
+        with self._lock:
+            positions = np.empty(len(rows), dtype=np.int64)
+            for index, row in enumerate(rows):
+                position = self._positions.get(row.id)
+                if position is None:
+                    position = self._positions[row.id] = self._size
+                    self._size += 1
+                positions[index] = position
+            self._reserve(self._size)
+
+            columns = self._columns
+            for name in ENCODED_DIMENSIONS:
+                encode = self.dictionaries[name].encode
+                columns[name][positions] = [encode(getattr(row, name)) for row in rows]
+            columns["id"][positions] = [row.id for row in rows]
+            columns["stake"][positions] = [to_cents(row.stake) for row in rows]
+            columns["payout"][positions] = [to_cents(row.payout) for row in rows]
+            columns["odds"][positions] = [float(row.decimal_odds or 0) for row in rows]
+            columns["win"][positions] = [
+                row.stake is not None and row.payout is not None and row.payout > row.stake for row in rows
+            ]
+            columns["staked"][positions] = [bool(row.stake) for row in rows]
+            columns["day"][positions] = [
+                (row.settled_day - EPOCH).days if row.settled_day else NO_DAY for row in rows
+            ]
+            columns["settled"][positions] = [
+                (row.settled_at - EPOCH_TIME) // MICROSECOND if row.settled_at else NO_TIME for row in rows
+            ]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._columns["stake"])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, values in self._columns.items():
+            grown = np.full(capacity, FILL_VALUES.get(name, 0), dtype=values.dtype)
+            grown[: len(values)] = values
+            self._columns[name] = grown
+
+    def aggregate(
+        self,
+        by: Sequence[str],
+        category: str | None = None,
+        sport_key: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        user_id: str | None = None,
+    ) -> list[GroupTotals]:
+        """Totals per distinct combination of ``by``, filtered like ``apply_filters``.
+
+        ``sport_key`` is an already normalized sport, as stored in ``bets.sport_key``.
+        Without ``user_id`` every user's bets are aggregated.
+        """
+        with self._lock:
+            mask = self._filter_mask(category, sport_key, date_from, date_to, user_id)
+            if mask is None or not mask.any():
+                return []
+
+            codes = [self._group_codes(name)[mask] for name in by]
+            combined = np.zeros(int(mask.sum()), dtype=np.int64)
+            for values, name in zip(codes, by):
+                combined = combined * self._cardinality(name) + values
+            groups, inverse = np.unique(combined, return_inverse=True)
+
+            stake = np.bincount(inverse, weights=self.column("stake")[mask], minlength=len(groups))
+            payout = np.bincount(inverse, weights=self.column("payout")[mask], minlength=len(groups))
+            bets = np.bincount(inverse, minlength=len(groups))
+            wins = np.bincount(inverse, weights=self.column("win")[mask], minlength=len(groups))
+            staked = np.bincount(inverse, weights=self.column("staked")[mask], minlength=len(groups))
+
+            first = np.zeros(len(groups), dtype=np.int64)
+            first[inverse[::-1]] = np.arange(len(inverse))[::-1]
+            keys = list(zip(*(self._decode(name, values[first]) for values, name in zip(codes, by))))
+            return [
+                GroupTotals(
+                    key=keys[index] if by else (),
+                    bets=int(bets[index]),
+                    wins=int(wins[index]),
+                    staked_bets=int(staked[index]),
+                    stake=stake[index] / 100,
+                    payout=payout[index] / 100,
+                    profit=(payout[index] - stake[index]) / 100,
+                )
+                for index in range(len(groups))
+            ]
+
+    def staked_bets(
+        self,
+        category: str | None = None,
+        sport_key: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Ids, stakes, payouts and decimal odds of staked bets in settlement order.
+
+        Filtered like ``aggregate``; bets without a settlement time sort first,
+        as SQLite orders ``NULL``.
+        """
+        with self._lock:
+            mask = self._filter_mask(category, sport_key, None, None, user_id)
+            if mask is None:
+                empty = np.zeros(0)
+                return np.zeros(0, dtype=np.int64), empty, empty, empty
+            mask &= self.column("stake") > 0
+            ids = self.column("id")[mask]
+            order = np.lexsort((ids, self.column("settled")[mask]))
+            return (
+                ids[order],
+                self.column("stake")[mask][order] / 100,
+                self.column("payout")[mask][order] / 100,
+                self.column("odds")[mask][order],
+            )
+
+    def _filter_mask(
+        self,
+        category: str | None,
+        sport_key: str | None,
+        date_from: date | None,
+        date_to: date | None,
+        user_id: str | None = None,
+    ) -> np.ndarray | None:
+        mask = np.ones(self._size, dtype=np.bool_)
+        if user_id is not None:
+            code = self.dictionaries["user_id"].lookup(user_id)
+            if code is None:
+                return None
+            mask &= self.column("user_id") == code
+        if category in ("racing", "sport"):
+            code = self.dictionaries["category"].lookup(category)
+            if code is None:
+                return None
+            mask &= self.column("category") == code
+        if sport_key:
+            code = self.dictionaries["sport_key"].lookup(None if sport_key in UNCLASSIFIED_SPORTS else sport_key)
+            if code is None:
+                return None
+            mask &= self.column("sport_key") == code
+        if date_from is not None or date_to is not None:
+            days = self.column("day")
+            mask &= days != NO_DAY
+            if date_from is not None:
+                mask &= days >= (date_from - EPOCH).days
+            if date_to is not None:
+                mask &= days <= (date_to - EPOCH).days
+        return mask
+
+    def _day_range(self) -> tuple[int, int]:
+        days = self.column("day")
+        valid = days[days != NO_DAY]
+        if not len(valid):
+            return 0, 0
+        return int(valid.min()), int(valid.max())
+
+    def _group_codes(self, name: str) -> np.ndarray:
+        """Dense non-negative codes per row; days are offset so code 0 is "no day"."""
+        if name == "day":
+            first, _ = self._day_range()
+            days = self.column("day").astype(np.int64)
+            return np.where(days == NO_DAY, 0, days - first + 1)
+        return self.column(name).astype(np.int64)
+
+    def _cardinality(self, name: str) -> int:
+        if name == "day":
+            first, last = self._day_range()
+            return last - first + 2
+        return len(self.dictionaries[name].values)
+
+    def _decode(self, name: str, codes: np.ndarray) -> list[Any]:
+        if name == "day":
+            first, _ = self._day_range()
+            return [EPOCH + timedelta(days=first + int(code) - 1) if code else None for code in codes]
+        values = self.dictionaries[name].values
+        return [values[code] for code in codes]
+
+
+def to_cents(value: Any) -> int:
+    return int(round(value * 100)) if value is not None else 0
+
+
+def store_select():
+    return select(
+        Bet.id,
+        Bet.user_id,
+        Bet.sport,
+        Bet.sport_key,
+        Bet.category,
+        Bet.bet_type,
+        Bet.market_type,
+        Bet.track,
+        Bet.stake,
+        Bet.payout,
+        Bet.decimal_odds,
+        Bet.settled_at,
+        Bet.settled_day,
+    )
+
+
+def load_columnar_store(db: Session, store: ColumnarStore, upload_id: str | None = None, chunk_size: int = 50_000) -> None:
+    """Load every bet, or only those last written by ``upload_id``, into ``store``.
+
+    The uploads are marked synced as of before their bets are read, so one
+    reprocessed mid-load is loaded again by the next ``refresh_analytics``.
+    """
+    stmt = store_select().order_by(Bet.id)
+    uploads = processed_uploads_select()
+    if upload_id is not None:
+        stmt = stmt.where(Bet.upload_id == upload_id)
+        uploads = uploads.where(Upload.id == upload_id)
+    synced = dict(db.execute(uploads).all())
+    for rows in db.execute(stmt.execution_options(yield_per=chunk_size)).partitions():
+        store.upsert(rows)
+    store.synced.update(synced)
+
+
+def processed_uploads_select():
+    return select(Upload.id, Upload.processed_at).where(Upload.status == "processed")
+
+
+columnar_store = ColumnarStore() if settings.analytics_backend == "memory" else None
+
+
+def active_store() -> ColumnarStore | None:
+    return columnar_store
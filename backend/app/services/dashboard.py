@@ -0,0 +1,125 @@
+"""Everything the dashboard's first render needs, in one payload.
+
+Fetched section by section, the dashboard costs a request, a session and a
+``bet_metrics`` scan per card, chart and breakdown. Here the overview cards
+and every breakdown the initial view shows are reduced from one scan grouped
+by all of their dimensions, beside one timeline query and one ledger query.
+Each section has the shape its own ``/metrics`` endpoint returns.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.metrics import BetMetric
+from app.models.user import DEFAULT_USER_ID
+from app.services.analytics import analytics_execute
+from app.services.bet_metrics import normalize_key
+from app.services.columnar import UNCLASSIFIED_SPORTS, GroupTotals, active_store
+from app.services.metrics_breakdown import breakdown_row
+from app.services.metrics_service import (
+    get_cashflow_totals,
+    overview_cards,
+    overview_groups_from_store,
+)
+from app.services.timeseries import fetch_profit_timeseries
+
+DASHBOARD_DIMENSIONS = ("category", "sport", "sport_key", "bet_type", "market_type", "track")
+# Sports open on the sport list and drill into the first sport; racing opens on its tabs.
+SPORT_DRILLDOWNS = ("bet_type", "market_type")
+RACING_BREAKDOWNS = ("track", "bet_type", "market_type")
+
+
+def dashboard_groups(db: Session, user_id: str = DEFAULT_USER_ID) -> list[GroupTotals]:
+    """A user's totals per combination of ``DASHBOARD_DIMENSIONS``, from one scan."""
+    store = active_store()
+    if store is not None:
+        return store.aggregate(DASHBOARD_DIMENSIONS, user_id=user_id)
+
+    keys = [getattr(BetMetric, dimension) for dimension in DASHBOARD_DIMENSIONS]
+    stmt = (
+        select(
+            *keys,
+            func.coalesce(func.sum(BetMetric.bet_count), 0).label("bets"),
+            func.coalesce(func.sum(BetMetric.win_count), 0).label("wins"),
+            func.coalesce(func.sum(BetMetric.staked_count), 0).label("staked_bets"),
+            func.coalesce(func.sum(BetMetric.stake), 0).label("stake"),
+            func.coalesce(func.sum(BetMetric.payout), 0).label("payout"),
+            func.coalesce(func.sum(BetMetric.profit), 0).label("profit"),
+        )
+        .where(BetMetric.user_id == user_id)
+        .group_by(*keys)
+    )
+    return [
+        GroupTotals(
+            key=tuple(row[: len(keys)]),
+            bets=int(row.bets),
+            wins=int(row.wins),
+            staked_bets=int(row.staked_bets),
+            stake=float(row.stake),
+            payout=float(row.payout),
+            profit=float(row.profit),
+        )
+        for row in analytics_execute(db, stmt)
+    ]
+
+
+def dimension_value(group: GroupTotals, dimension: str) -> Any:
+    return group.key[DASHBOARD_DIMENSIONS.index(dimension)]
+
+
+def fold_breakdown(groups: Iterable[GroupTotals], dimension: str) -> list[dict[str, str | float]]:
+    """``breakdown_payload`` rows for ``dimension``, reduced from dashboard groups."""
+    totals: dict[str | None, list[float]] = {}
+    for group in groups:
+        entry = totals.setdefault(dimension_value(group, dimension), [0.0, 0.0, 0, 0])
+        entry[0] += group.stake
+        entry[1] += group.payout
+        entry[2] += group.wins
+        entry[3] += group.bets
+
+    rows = [
+        breakdown_row(key or "Unclassified", stake, payout, wins, bets)
+        for key, (stake, payout, wins, bets) in totals.items()
+    ]
+    rows.sort(key=lambda row: row["profit"], reverse=True)
+    return rows
+
+
+def sport_key_of(sport: str) -> str | None:
+    """The ``sport_key`` the ``sport`` filter selects, as ``apply_filters`` reads it."""
+    normalized = normalize_key(sport)
+    return None if normalized in UNCLASSIFIED_SPORTS else normalized
+
+
+def dashboard_payload(db: Session, category: str = "sport", user_id: str = DEFAULT_USER_ID) -> dict[str, Any]:
+    """Overview, cash flow, timeline and opening breakdowns for ``category``."""
+    groups = dashboard_groups(db, user_id)
+    in_category = [group for group in groups if dimension_value(group, "category") == category]
+
+    selected_sport = None
+    if category == "sport":
+        sports = fold_breakdown(in_category, "sport")
+        breakdowns = {"sport": sports}
+        if sports:
+            selected_sport = sports[0]["key"]
+        sport_key = sport_key_of(selected_sport) if selected_sport else None
+        selected = [group for group in in_category if dimension_value(group, "sport_key") == sport_key]
+        for dimension in SPORT_DRILLDOWNS:
+            breakdowns[dimension] = fold_breakdown(selected, dimension) if selected_sport else []
+    else:
+        breakdowns = {dimension: fold_breakdown(in_category, dimension) for dimension in RACING_BREAKDOWNS}
+
+    by_sport_and_type = [
+        group._replace(key=(dimension_value(group, "sport"), dimension_value(group, "bet_type"))) for group in groups
+    ]
+    return {
+        "category": category,
+        "overview": overview_cards(overview_groups_from_store(by_sport_and_type)),
+        "cashflow": get_cashflow_totals(db, user_id),
+        "timeseries": fetch_profit_timeseries(db, category=category, user_id=user_id),
+        "breakdowns": breakdowns,
+        "selected_sport": selected_sport,
+    }
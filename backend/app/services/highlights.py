@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import heapq
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.metrics import MetricSnapshot
+from app.models.user import DEFAULT_USER_ID
+
+HIGHLIGHTS_SNAPSHOT = "highlights"
+HIGHLIGHTS_TOP_K = 10
+
+
+class StreakTracker:
+    """Tracks the longest run of consecutive winning or losing bets.
+
+    Pushes and voids neither extend nor break a run.
+    """
+
+    def __init__(self) -> None:
+        self.sign = 0
+        self.length = 0
+        self.profit = 0.0
+        self.start: date | None = None
+        self.longest: dict[int, dict[str, Any]] = {
+            1: {"length": 0, "profit": 0.0, "start": None, "end": None},
+            -1: {"length": 0, "profit": 0.0, "start": None, "end": None},
+        }
+
+    def add(self, profit: float, day: date | None) -> None:
+        sign = (profit > 0) - (profit < 0)
+        if sign == 0:
+            return
+        if sign != self.sign:
+            self.sign, self.length, self.profit, self.start = sign, 0, 0.0, day
+        self.length += 1
+        self.profit += profit
+        if self.length > self.longest[sign]["length"]:
+            self.longest[sign] = {
+                "length": self.length,
+                "profit": round(self.profit, 2),
+                "start": iso(self.start),
+                "end": iso(day),
+            }
+
+
+class DrawdownTracker:
+    """Largest peak-to-trough fall in cumulative P/L, via a running maximum."""
+
+    def __init__(self) -> None:
+        self.cumulative = 0.0
+        self.peak = 0.0
+        self.peak_day: date | None = None
+        self.worst = {"amount": 0.0, "peak": 0.0, "trough": 0.0, "start": None, "end": None}
+
+    def add(self, profit: float, day: date | None) -> None:
+        if self.peak_day is None:
+            self.peak_day = day
+        self.cumulative += profit
+        if self.cumulative > self.peak:
+            self.peak, self.peak_day = self.cumulative, day
+            return
+        drawdown = self.peak - self.cumulative
+        if drawdown > self.worst["amount"]:
+            self.worst = {
+                "amount": round(drawdown, 2),
+                "peak": round(self.peak, 2),
+                "trough": round(self.cumulative, 2),
+                "start": iso(self.peak_day),
+                "end": iso(day),
+            }
+
+
+def compute_highlights(db: Session, top_k: int = HIGHLIGHTS_TOP_K, user_id: str = DEFAULT_USER_ID) -> dict[str, Any]:
+    """Best and worst bets, streaks and max drawdown in one pass over a user's bets.
+
+    Bets stream in ``settled_at`` order through ``ix_bets_user_id_settled_at_id``;
+    bounded min-heaps keep the top wins and losses, so memory stays at
+    ``O(top_k)`` however many bets are stored.
+    """
+    stmt = (
+        select(
+            Bet.id,
+            Bet.bet_id,
+            Bet.description,
+            Bet.sport,
+            Bet.bet_type,
+            Bet.market_type,
+            Bet.stake,
+            Bet.payout,
+            Bet.settled_day,
+        )
+        .where(Bet.user_id == user_id, Bet.settled_at.isnot(None))
+        .order_by(Bet.settled_at, Bet.id)
+        .execution_options(yield_per=1000)
+    )
+
+    wins: list[tuple[float, int, Any]] = []
+    losses: list[tuple[float, int, Any]] = []
+    streaks = StreakTracker()
+    drawdown = DrawdownTracker()
+
+    for row in db.execute(stmt):
+        profit = float((row.payout or 0) - (row.stake or 0))
+        streaks.add(profit, row.settled_day)
+        drawdown.add(profit, row.settled_day)
+        if profit > 0:
+            push_bounded(wins, (profit, row.id, row), top_k)
+        elif profit < 0:
+            push_bounded(losses, (-profit, row.id, row), top_k)
+
+    return {
+        "top_wins": [highlight_bet(row) for _, _, row in sorted(wins, reverse=True)],
+        "top_losses": [highlight_bet(row) for _, _, row in sorted(losses, reverse=True)],
+        "longest_winning_streak": streaks.longest[1],
+        "longest_losing_streak": streaks.longest[-1],
+        "max_drawdown": drawdown.worst,
+    }
+
+
+def push_bounded(heap: list[tuple[float, int, Any]], item: tuple[float, int, Any], size: int) -> None:
+    if len(heap) < size:
+        heapq.heappush(heap, item)
+    elif item[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, item)
+
+
+def highlight_bet(row: Any) -> dict[str, Any]:
+    stake = float(row.stake or 0)
+    payout = float(row.payout or 0)
+    return {
+        "bet_id": row.bet_id,
+        "date": iso(row.settled_day),
+        "sport": row.sport,
+        "bet_type": row.bet_type,
+        "market_type": row.market_type,
+        "description": row.description,
+        "stake": round(stake, 2),
+        "payout": round(payout, 2),
+        "profit": round(payout - stake, 2),
+    }
+
+
+def iso(day: date | None) -> str | None:
+    return day.isoformat() if day else None
+
+
+def refresh_highlights(db: Session, user_id: str = DEFAULT_USER_ID) -> None:
+    """Recompute ``user_id``'s highlights snapshot; the caller commits."""
+    db.merge(
+        MetricSnapshot(
+            user_id=user_id,
+            name=HIGHLIGHTS_SNAPSHOT,
+            payload=compute_highlights(db, user_id=user_id),
+            computed_at=datetime.utcnow(),
+        )
+    )
+
+
+def get_highlights(db: Session, limit: int = HIGHLIGHTS_TOP_K, user_id: str = DEFAULT_USER_ID) -> dict[str, Any]:
+    """Serve highlights from the snapshot stored at ingest time."""
+    snapshot = db.get(MetricSnapshot, (user_id, HIGHLIGHTS_SNAPSHOT))
+    payload = snapshot.payload if snapshot is not None else compute_highlights(db, user_id=user_id)
+    return {
+        **payload,
+        "top_wins": payload["top_wins"][:limit],
+        "top_losses": payload["top_losses"][:limit],
+    }
@@ -15,12 +15,29 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.models.bet import Bet
 from app.models.upload import Upload
-from app.services.parsers.sportsbet import parse_summary
+from app.services.analytics import sync_analytics_mirror
+from app.services.bet_metrics import MetricDeltas, bet_category, normalize_key
+from app.services.bulk_load import stage_and_merge, supports_copy
+from app.services.highlights import refresh_highlights
+from app.services.ledger import sync_transactions
+from app.services.legs import sync_legs
+from app.services.metrics_cache import metrics_cache
+from app.services.odds import decimal_odds, implied_probability
+from app.services.parsers.sportsbet import parse_legs, parse_summary
+from app.services.participants import sync_participants
+from app.services.search import index_bets
+from app.services.timeseries import settled_day
 
 ROW_START = re.compile(r'^\s*"?\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}')
 
 
 def process_upload(upload_id: str) -> Upload:
+    """Ingest an upload's file and mark it processed, or failed.
+
+    Everything ``ingest_file`` writes commits together with the ``processed``
+    status, so a failure part way rolls the database back to the previous
+    dataset. The data token and cached payloads then still describe it.
+    """
     db = SessionLocal()
     try:
         upload = db.get(Upload, upload_id)
@@ -39,8 +56,6 @@ def process_upload(upload_id: str) -> Upload:
         upload.withdrawal_total = cash_totals.get("withdrawal")
         upload.processed_at = datetime.utcnow()
         db.commit()
-        db.refresh(upload)
-        return upload
     except Exception as exc:  # noqa: BLE001 - surface ingestion errors
         logger.exception("Failed to process upload %s", upload_id)
         db.rollback()
@@ -48,6 +63,13 @@ def process_upload(upload_id: str) -> Upload:
             upload.status = "failed"
             db.commit()
         raise exc
+    else:
+        # Committed: readers already see the new data, so invalidate the cache
+        # before bringing the analytics stores up to date.
+        metrics_cache.bump_version()
+        sync_analytics_mirror(db, upload.id)
+        db.refresh(upload)
+        return upload
     finally:
         db.close()
 
@@ -55,11 +77,27 @@ def process_upload(upload_id: str) -> Upload:
 def ingest_file(path: Path, upload: Upload, db: Session) -> tuple[int, dict[str, Decimal]]:
     rows = read_csv(path)
     aggregated = aggregate_bets(rows)
-    upsert_bets(db, upload, aggregated)
+    write_bets(db, upload, aggregated)
+    sync_transactions(db, upload.id, ledger_entries(rows, upload), upload.user_id)
+    refresh_highlights(db, upload.user_id)
     cash_totals = summarize_cash_movements(rows)
     return len(rows), cash_totals
 
 
+def rebuild_ledger(db: Session) -> int:
+    """Backfill ``transactions`` from the stored files of processed uploads."""
+    inserted = 0
+    uploads = db.execute(select(Upload).where(Upload.status == "processed").order_by(Upload.created_at)).scalars()
+    for upload in uploads.all():
+        path = Path(upload.stored_path)
+        if not path.exists():
+            logger.warning("Skipping upload {} - stored file {} is missing", upload.id, path)
+            continue
+        inserted += sync_transactions(db, upload.id, ledger_entries(read_csv(path), upload), upload.user_id)
+    db.commit()
+    return inserted
+
+
 def read_csv(path: Path) -> list[dict[str, str]]:
     with path.open("r", encoding="utf-8-sig") as handle:
         raw_lines = handle.read().splitlines()
@@ -102,6 +140,36 @@ def summarize_cash_movements(rows: list[dict[str, str]]) -> dict[str, Decimal]:
     return totals
 
 
+def ledger_entries(rows: list[dict[str, str]], upload: Upload) -> list[dict[str, object]]:
+    """Map export rows to ``transactions`` rows, oldest first.
+
+    Sportsbet exports newest first; reversing before the stable sort keeps
+    same-minute rows in the order their balances were produced.
+    """
+    entries: dict[str, dict[str, object]] = {}
+    for row in rows:
+        transaction_id = (row.get("Transaction Id") or "").strip()
+        if not transaction_id or transaction_id in entries:
+            continue
+        occurred_at = parse_datetime(row.get("Time (AEST)"))
+        balance = (row.get("Balance") or "").strip()
+        entries[transaction_id] = {
+            "transaction_id": transaction_id,
+            "type": (row.get("Type") or "").strip().lower(),
+            "amount": to_decimal(row.get("Amount")),
+            "balance": to_decimal(balance) if balance else None,
+            "occurred_at": occurred_at,
+            "day": settled_day(occurred_at, upload.created_at),
+        }
+
+    ordered = list(entries.values())
+    timestamps = [entry["occurred_at"] for entry in ordered if entry["occurred_at"] is not None]
+    if timestamps and timestamps[0] > timestamps[-1]:
+        ordered.reverse()
+    ordered.sort(key=lambda entry: entry["occurred_at"] or datetime.min)
+    return ordered
+
+
 def aggregate_bets(rows: list[dict[str, str]]) -> dict[str, dict[str, object]]:
     aggregates: dict[str, dict[str, object]] = defaultdict(lambda: {
         "stake": Decimal("0"),
@@ -163,6 +231,8 @@ def aggregate_bets(rows: list[dict[str, str]]) -> dict[str, dict[str, object]]:
         entry["last_transaction_id"] = transaction_id
 
     for payload in aggregates.values():
+        is_adjustment = payload.get("bet_type") == "Manual Adjustment"
+        payload["legs"] = [] if is_adjustment else parse_legs(str(payload.get("summary") or ""))
         if payload.pop("voided", False):
             payload["stake"] = Decimal("0")
             payload["payout"] = Decimal("0")
@@ -172,41 +242,102 @@ def aggregate_bets(rows: list[dict[str, str]]) -> dict[str, dict[str, object]]:
 
 
 def upsert_bets(db: Session, upload: Upload, aggregates: dict[str, dict[str, object]]) -> None:
+    write_bets(db, upload, aggregates)
+    db.commit()
+
+
+def write_bets(db: Session, upload: Upload, aggregates: dict[str, dict[str, object]]) -> None:
+    """Insert or update the aggregated bets and everything derived from them; the caller commits."""
     if not aggregates:
         return
 
     existing = {
         bet.bet_id: bet
-        for bet in db.execute(select(Bet).where(Bet.bet_id.in_(aggregates.keys()))).scalars().all()
+        for bet in db.execute(
+            select(Bet).where(Bet.user_id == upload.user_id, Bet.bet_id.in_(aggregates.keys()))
+        ).scalars()
     }
 
-    for bet_id, payload in aggregates.items():
-        bet = existing.get(bet_id)
-        if not bet:
-            bet = Bet(bet_id=bet_id)
-
-        bet.upload_id = upload.id
-        bet.last_transaction_id = str(payload.get("last_transaction_id"))
-        bet.bet_type = payload.get("bet_type")
-        bet.market_type = payload.get("market_type")
-        bet.description = payload.get("summary")
-        bet.sport = payload.get("sport")
-        bet.competition = payload.get("competition")
-        bet.team = payload.get("team")
-        bet.opponent = payload.get("opponent")
-        bet.track = payload.get("track")
-        bet.race = payload.get("race")
-        bet.runner_number = payload.get("runner_number")
-        bet.runner_name = payload.get("runner_name")
-        bet.odds = payload.get("odds")
-        bet.result = payload.get("result")
-        bet.stake = payload.get("stake")
-        bet.payout = payload.get("payout")
-        bet.settled_at = payload.get("occurred_at")
-
-        db.add(bet)
+    deltas = MetricDeltas()
+    for bet_id in aggregates:
+        if bet_id in existing:
+            deltas.remove(existing[bet_id])
+    values = {bet_id: bet_values(upload, bet_id, payload) for bet_id, payload in aggregates.items()}
+
+    if supports_copy(db):
+        touched = merge_bets(db, values)
+    else:
+        touched = []
+        for bet_id, columns in values.items():
+            bet = existing.get(bet_id) or Bet()
+            for name, value in columns.items():
+                setattr(bet, name, value)
+            db.add(bet)
+            touched.append(bet)
+
+    for bet in touched:
+        deltas.add(bet)
+    deltas.flush(db)
+    db.flush()
+    index_bets(db, [bet.id for bet in touched])
+    sync_participants(db, touched)
+    sync_legs(db, [(bet, aggregates[bet.bet_id].get("legs") or []) for bet in touched])
+
+
+def bet_values(upload: Upload, bet_id: str, payload: dict[str, object]) -> dict[str, object]:
+    """Column values of the ``bets`` row for one aggregated bet."""
+    sport = payload.get("sport")
+    track = payload.get("track")
+    odds = payload.get("odds")
+    occurred_at = payload.get("occurred_at")
+    price = decimal_odds(odds)
+    return {
+        "bet_id": bet_id,
+        "user_id": upload.user_id,
+        "upload_id": upload.id,
+        "last_transaction_id": str(payload.get("last_transaction_id")),
+        "bet_type": payload.get("bet_type"),
+        "market_type": payload.get("market_type"),
+        "description": payload.get("summary"),
+        "sport": sport,
+        "sport_key": normalize_key(sport),
+        "competition": payload.get("competition"),
+        "team": payload.get("team"),
+        "opponent": payload.get("opponent"),
+        "track": track,
+        "category": bet_category(track),
+        "race": payload.get("race"),
+        "runner_number": payload.get("runner_number"),
+        "runner_name": payload.get("runner_name"),
+        "odds": odds,
+        "decimal_odds": price,
+        "implied_probability": implied_probability(price),
+        "result": payload.get("result"),
+        "stake": payload.get("stake"),
+        "payout": payload.get("payout"),
+        "settled_at": occurred_at,
+        "settled_day": settled_day(occurred_at, upload.created_at),
+    }
 
-    db.commit()
+
+def merge_bets(db: Session, values: dict[str, dict[str, object]]) -> list[Bet]:
+    """COPY the bets into a staging table and upsert them in one statement.
+
+    Returns transient ``Bet`` objects carrying the merged ids, which is all
+    the participant and leg sync needs.
+    """
+    rows = list(values.values())
+    conflict = ("user_id", "bet_id")
+    updated = [name for name in rows[0] if name not in conflict]
+    result = stage_and_merge(
+        db,
+        Bet.__table__,
+        rows,
+        conflict=conflict,
+        update=updated,
+        returning=(Bet.__table__.c.id, Bet.__table__.c.bet_id),
+    )
+    return [Bet(id=bet_pk, **values[bet_id]) for bet_pk, bet_id in result]
 
 
 def parse_datetime(value: str | None) -> datetime | None:
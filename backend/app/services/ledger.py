@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.models.user import DEFAULT_USER_ID
+from app.services.bulk_load import stage_and_merge, supports_copy
+
+DEPOSIT_TYPES = ("deposit", "returned withdrawal")
+WITHDRAWAL_TYPES = ("withdrawal",)
+CASH_TYPES = DEPOSIT_TYPES + WITHDRAWAL_TYPES
+
+
+def sync_transactions(
+    db: Session,
+    upload_id: str,
+    entries: list[dict[str, Any]],
+    user_id: str = DEFAULT_USER_ID,
+) -> int:
+    """Insert ledger rows whose Transaction Id ``user_id`` has not seen before.
+
+    Transactions are immutable once exported, so rows repeated by
+    overlapping uploads are skipped rather than updated. ``entries`` should
+    be oldest first so insertion order breaks ``occurred_at`` ties. On
+    Postgres the rows are COPYed into a staging table and merged with
+    ``ON CONFLICT DO NOTHING`` in one statement.
+    """
+    if not entries:
+        return 0
+    if supports_copy(db):
+        rows = [{**entry, "upload_id": upload_id, "user_id": user_id} for entry in entries]
+        table = Transaction.__table__
+        conflict = ("user_id", "transaction_id")
+        return len(stage_and_merge(db, table, rows, conflict=conflict, returning=(table.c.id,)).all())
+
+    existing = set(
+        db.execute(
+            select(Transaction.transaction_id).where(
+                Transaction.user_id == user_id,
+                Transaction.transaction_id.in_([entry["transaction_id"] for entry in entries]),
+            )
+        ).scalars()
+    )
+    rows = [
+        {**entry, "upload_id": upload_id, "user_id": user_id}
+        for entry in entries
+        if entry["transaction_id"] not in existing
+    ]
+    if rows:
+        db.execute(insert(Transaction), rows)
+    return len(rows)
+
+
+def fetch_bankroll_series(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float | None]]:
+    """Daily closing balance and cumulative net cash from the ledger.
+
+    One windowed query picks each day's last balance and sums its deposits
+    and withdrawals. Days without a reported balance carry the previous one.
+    ``cumulative_net_cash`` always starts from the first ledger day so a
+    ``date_from`` does not reset it.
+    """
+    net_cash = case((Transaction.type.in_(CASH_TYPES), Transaction.amount), else_=0)
+    daily = (
+        select(
+            Transaction.day.label("day"),
+            Transaction.balance.label("balance"),
+            func.sum(net_cash).over(partition_by=Transaction.day).label("net_cash"),
+            func.row_number()
+            .over(
+                partition_by=Transaction.day,
+                order_by=(Transaction.balance.is_(None), Transaction.occurred_at.desc(), Transaction.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(Transaction.user_id == user_id, Transaction.day.isnot(None))
+        .subquery()
+    )
+    stmt = select(daily.c.day, daily.c.balance, daily.c.net_cash).where(daily.c.position == 1)
+    if date_to is not None:
+        stmt = stmt.where(daily.c.day <= date_to)
+
+    output: list[dict[str, str | float | None]] = []
+    balance: float | None = None
+    cumulative = 0.0
+    for row in db.execute(stmt.order_by(daily.c.day)):
+        if row.balance is not None:
+            balance = float(row.balance)
+        cumulative += float(row.net_cash or 0)
+        if date_from is not None and row.day < date_from:
+            continue
+        output.append(
+            {
+                "date": str(row.day),
+                "balance": round(balance, 2) if balance is not None else None,
+                "net_cash": round(float(row.net_cash or 0), 2),
+                "cumulative_net_cash": round(cumulative, 2),
+            }
+        )
+    return output
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.leg import Leg
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import count_where
+from app.services.metrics_breakdown import DEFAULT_BREAKDOWN_LIMIT, breakdown_row
+from app.services.metrics_service import MULTI_BET_TYPES
+from app.services.odds import decimal_odds
+from app.services.parsers.sportsbet import ParsedLeg, parse_legs
+
+LEG_DIMENSIONS = ("sport", "market_type", "team")
+
+
+def sync_legs(db: Session, bet_legs: list[tuple[Bet, list[ParsedLeg]]]) -> None:
+    """Replace the stored legs of each bet with the legs parsed at ingest."""
+    if not bet_legs:
+        return
+
+    db.execute(delete(Leg).where(Leg.bet_id.in_([bet.id for bet, _ in bet_legs])))
+    insert_legs(db, bet_legs)
+
+
+def insert_legs(db: Session, bet_legs: Iterable[tuple[Any, list[ParsedLeg]]]) -> None:
+    rows = [
+        {
+            "bet_id": bet.id,
+            "leg_number": leg.leg_number,
+            "sport": leg.sport,
+            "event": leg.event,
+            "team": leg.team,
+            "market_type": leg.market_type,
+            "selection": leg.selection,
+            "odds": leg.odds,
+            "decimal_odds": decimal_odds(leg.odds),
+            "result": leg.result,
+        }
+        for bet, legs in bet_legs
+        for leg in legs
+    ]
+    if rows:
+        db.execute(insert(Leg), rows)
+
+
+def rebuild_legs(db: Session, chunk_size: int = 10_000) -> None:
+    """Re-parse legs for every stored bet, e.g. for bets ingested before legs existed.
+
+    Every leg is deleted in one statement and the bets are streamed in
+    chunks, so neither their rows nor their ids are held at once.
+    """
+    db.execute(delete(Leg))
+    stmt = select(Bet.id, Bet.bet_type, Bet.description).execution_options(yield_per=chunk_size)
+    for bets in db.execute(stmt).partitions():
+        insert_legs(
+            db,
+            (
+                (bet, [] if bet.bet_type == "Manual Adjustment" else parse_legs(bet.description or ""))
+                for bet in bets
+            ),
+        )
+    db.commit()
+
+
+def leg_breakdown(
+    db: Session,
+    dimension: str,
+    multis_only: bool = True,
+    limit: int = DEFAULT_BREAKDOWN_LIMIT,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float]]:
+    """P/L of the bets containing each leg sport, market or team.
+
+    A bet counts once per key however many of its legs share it, so a
+    two-leg same-market multi does not double its stake.
+    """
+    key = func.coalesce(getattr(Leg, dimension), "")
+    leg_keys = (
+        select(Leg.bet_id.label("bet_id"), key.label("key"), func.count().label("legs"))
+        .where(Leg.bet_id.in_(select(Bet.id).where(Bet.user_id == user_id)))
+        .group_by(Leg.bet_id, key)
+        .subquery()
+    )
+    stake = func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0)
+    payout = func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0)
+    stmt = (
+        select(
+            leg_keys.c.key,
+            func.sum(leg_keys.c.legs).label("legs"),
+            func.count().label("bets"),
+            stake.label("stake"),
+            payout.label("payout"),
+            count_where(Bet.payout > Bet.stake).label("wins"),
+        )
+        .join(Bet, Bet.id == leg_keys.c.bet_id)
+        .group_by(leg_keys.c.key)
+        .order_by((payout - stake).desc(), leg_keys.c.key)
+        .limit(limit)
+    )
+    if multis_only:
+        stmt = stmt.where(func.lower(func.coalesce(Bet.bet_type, "")).in_(MULTI_BET_TYPES))
+
+    return [
+        {
+            **breakdown_row(row.key or "Unclassified", row.stake, row.payout, row.wins, row.bets),
+            "legs": int(row.legs),
+            "bets": int(row.bets),
+        }
+        for row in db.execute(stmt)
+    ]
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Iterator, Literal
 
-from sqlalchemy import case, func, select
+from sqlalchemy import Select, and_, func, or_, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.bet import Bet
+from app.models.metrics import BetMetric
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import count_where
+from app.services.analytics import analytics_dialect, analytics_execute
+from app.services.bet_metrics import normalize_key
+from app.services.columnar import UNCLASSIFIED_SPORTS, active_store
 
 
 @dataclass
@@ -20,6 +26,10 @@ class BreakdownRow:
 
 
 Dimension = Literal["sport", "bet_type", "market_type", "track"]
+HighCardinalityDimension = Literal["team", "opponent", "competition", "runner_name"]
+
+HIGH_CARDINALITY_DIMENSIONS: tuple[HighCardinalityDimension, ...] = ("team", "opponent", "competition", "runner_name")
+DEFAULT_BREAKDOWN_LIMIT = 50
 
 
 def breakdown_by(
@@ -27,50 +37,331 @@ def breakdown_by(
     dimension: Dimension,
     category: str | None = None,
     sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
 ) -> list[BreakdownRow]:
-    column = getattr(Bet, dimension)
+    return [BreakdownRow(*totals) for totals in breakdown_totals(db, dimension, category, sport, user_id)]
+
+
+def breakdown_totals(
+    db: Session,
+    dimension: Dimension,
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> Iterator[tuple[str | None, float, float, float, float, float]]:
+    """``(key, stake, payout, profit, roi, win_rate)`` per group, best profit first, cast once."""
+    store = active_store()
+    if store is not None:
+        groups = store.aggregate((dimension,), category, normalize_key(sport), user_id=user_id)
+        for group in sorted(groups, key=lambda group: group.profit, reverse=True):
+            yield (
+                group.key[0],
+                group.stake,
+                group.payout,
+                group.profit,
+                roi_of(group.profit, group.stake),
+                group.wins / group.bets if group.bets else 0.0,
+            )
+        return
+
+    column = getattr(BetMetric, dimension)
+    profit = func.coalesce(func.sum(BetMetric.profit), 0)
     stmt = (
         select(
             column.label("key"),
-            func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0).label("stake"),
-            func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0).label("payout"),
-            func.coalesce(
-                func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0)),
-                0,
-            ).label("profit"),
+            func.coalesce(func.sum(BetMetric.stake), 0).label("stake"),
+            func.coalesce(func.sum(BetMetric.payout), 0).label("payout"),
+            profit.label("profit"),
             func.coalesce(
-                func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0))
-                / func.nullif(func.sum(func.coalesce(Bet.stake, 0)), 0),
+                func.sum(BetMetric.win_count) * 1.0 / func.nullif(func.sum(BetMetric.bet_count), 0),
                 0,
-            ).label("roi"),
-            func.coalesce(func.avg(case((Bet.payout > Bet.stake, 1), else_=0)), 0).label("win_rate"),
+            ).label("win_rate"),
         )
         .group_by(column)
-        .order_by(func.coalesce(func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0)), 0).desc())
+        .order_by(profit.desc())
     )
 
-    if category == "racing":
-        stmt = stmt.where(Bet.track.isnot(None))
-    elif category == "sport":
-        stmt = stmt.where(Bet.track.is_(None))
+    stmt = apply_filters(stmt, category, sport, user_id=user_id)
+
+    for row in analytics_execute(db, stmt):
+        stake = float(row.stake or 0)
+        profit = float(row.profit or 0)
+        yield (
+            row.key,
+            stake,
+            float(row.payout or 0),
+            profit,
+            roi_of(profit, stake),
+            float(row.win_rate or 0),
+        )
+
+
+def apply_filters(
+    stmt: Select,
+    category: str | None,
+    sport: str | None,
+    source: type[BetMetric] | type[Bet] = BetMetric,
+    user_id: str = DEFAULT_USER_ID,
+) -> Select:
+    """Scope ``stmt`` to one user's rows, leading every ``ix_*_user_id_*`` index, then filter."""
+    stmt = stmt.where(source.user_id == user_id)
+    if category in ("racing", "sport"):
+        stmt = stmt.where(source.category == category)
 
     if sport:
-        normalized = sport.strip().lower()
-        if normalized in {"unknown", "unclassified"}:
-            stmt = stmt.where(Bet.sport.is_(None))
+        normalized = normalize_key(sport)
+        if normalized in UNCLASSIFIED_SPORTS:
+            stmt = stmt.where(source.sport_key.is_(None))
         else:
-            stmt = stmt.where(func.lower(Bet.sport) == normalized)
-
-    results = []
-    for row in db.execute(stmt):
-        results.append(
-            BreakdownRow(
-                key=row.key,
-                stake=float(row.stake or 0),
-                payout=float(row.payout or 0),
-                profit=float(row.profit or 0),
-                roi=float(row.roi or 0),
-                win_rate=float(row.win_rate or 0),
-            )
-        )
+            stmt = stmt.where(source.sport_key == normalized)
+    return stmt
+
+
+def breakdown_payload(
+    db: Session,
+    dimension: Dimension,
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float]]:
+    return [
+        {
+            "key": key or "Unclassified",
+            "stake": stake,
+            "payout": payout,
+            "profit": profit,
+            "roi": roi,
+            "win_rate": win_rate,
+        }
+        for key, stake, payout, profit, roi, win_rate in breakdown_totals(db, dimension, category, sport, user_id)
+    ]
+
+
+DIMENSIONS: tuple[Dimension, ...] = ("sport", "bet_type", "market_type", "track")
+GROUPING_SETS_DIALECTS = ("postgresql", "duckdb")
+
+
+def parse_grouping(value: str) -> tuple[Dimension, ...]:
+    """Parse ``sport`` or a two-level drilldown such as ``sport:bet_type``."""
+    parts = tuple(part.strip() for part in value.split(":"))
+    if not 1 <= len(parts) <= 2 or len(set(parts)) != len(parts):
+        raise ValueError(f"Unsupported grouping {value!r}")
+    for part in parts:
+        if part not in DIMENSIONS:
+            raise ValueError(f"Unsupported dimension {part!r}")
+    return parts  # type: ignore[return-value]
+
+
+def breakdown_cube(
+    db: Session,
+    groupings: tuple[str, ...],
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> dict[str, list[dict[str, str | float]]]:
+    """Compute several breakdowns and drilldowns from one ``bet_metrics`` scan.
+
+    Where the database supports ``GROUPING SETS`` every grouping is reduced
+    by that one query; otherwise the summary rows are grouped once by every
+    requested dimension and each grouping is reduced in Python. Either way
+    the cost is a single query whatever the number of groupings.
+    """
+    parsed = {grouping: parse_grouping(grouping) for grouping in groupings}
+    columns = [dimension for dimension in DIMENSIONS if any(dimension in dims for dims in parsed.values())]
+    if not columns:
+        return {}
+
+    store = active_store()
+    if store is None and analytics_dialect(db) in GROUPING_SETS_DIALECTS:
+        totals = grouping_set_totals(db, parsed, columns, category, sport, user_id)
+    else:
+        if store is not None:
+            rows = [
+                (dict(zip(columns, group.key)), (group.stake, group.payout, group.wins, group.bets))
+                for group in store.aggregate(columns, category, normalize_key(sport), user_id=user_id)
+            ]
+        else:
+            rows = [
+                (dict(zip(columns, row)), (float(row.stake), float(row.payout), int(row.wins), int(row.bets)))
+                for row in analytics_execute(db, cube_select(columns, category, sport, user_id))
+            ]
+        totals = {grouping: {} for grouping in parsed}
+        for values, measures in rows:
+            for grouping, dims in parsed.items():
+                entry = totals[grouping].setdefault(tuple(values[dim] for dim in dims), [0.0, 0.0, 0, 0])
+                for index, measure in enumerate(measures):
+                    entry[index] += measure
+
+    cube: dict[str, list[dict[str, str | float]]] = {}
+    for grouping, groups in totals.items():
+        rows = []
+        for key, (stake, payout, wins, bets) in groups.items():
+            row = breakdown_row(key[-1] or "Unclassified", stake, payout, wins, bets)
+            if len(key) == 2:
+                row = {"parent": key[0] or "Unclassified", **row}
+            rows.append(row)
+        rows.sort(key=lambda item: item["profit"], reverse=True)
+        cube[grouping] = rows
+    return cube
+
+
+def cube_select(
+    columns: list[str],
+    category: str | None,
+    sport: str | None,
+    user_id: str = DEFAULT_USER_ID,
+) -> Select:
+    keys = [getattr(BetMetric, dimension) for dimension in columns]
+    stmt = select(
+        *keys,
+        func.coalesce(func.sum(BetMetric.stake), 0).label("stake"),
+        func.coalesce(func.sum(BetMetric.payout), 0).label("payout"),
+        func.coalesce(func.sum(BetMetric.win_count), 0).label("wins"),
+        func.coalesce(func.sum(BetMetric.bet_count), 0).label("bets"),
+    ).group_by(*keys)
+    return apply_filters(stmt, category, sport, user_id=user_id)
+
+
+def grouping_set_totals(
+    db: Session,
+    parsed: dict[str, tuple[str, ...]],
+    columns: list[str],
+    category: str | None,
+    sport: str | None,
+    user_id: str = DEFAULT_USER_ID,
+) -> dict[str, dict[tuple[str | None, ...], list[float]]]:
+    """Totals per grouping from one ``GROUP BY GROUPING SETS`` query.
+
+    ``GROUPING(...)`` over every column tells the sets apart: each bit is set
+    when its column is rolled up, so groupings over the same dimensions, in
+    any order, share one set.
+    """
+    keys = [getattr(BetMetric, dimension) for dimension in columns]
+    masks: dict[int, list[str]] = {}
+    sets = []
+    for grouping, dims in parsed.items():
+        mask = sum(1 << (len(columns) - 1 - index) for index, column in enumerate(columns) if column not in dims)
+        if mask not in masks:
+            sets.append(tuple_(*(getattr(BetMetric, dimension) for dimension in columns if dimension in dims)))
+        masks.setdefault(mask, []).append(grouping)
+
+    stmt = select(
+        *keys,
+        func.grouping(*keys).label("grouping_id"),
+        func.coalesce(func.sum(BetMetric.stake), 0).label("stake"),
+        func.coalesce(func.sum(BetMetric.payout), 0).label("payout"),
+        func.coalesce(func.sum(BetMetric.win_count), 0).label("wins"),
+        func.coalesce(func.sum(BetMetric.bet_count), 0).label("bets"),
+    ).group_by(func.grouping_sets(*sets))
+    stmt = apply_filters(stmt, category, sport, user_id=user_id)
+
+    totals: dict[str, dict[tuple[str | None, ...], list[float]]] = {grouping: {} for grouping in parsed}
+    for row in analytics_execute(db, stmt):
+        values = dict(zip(columns, row))
+        measures = [float(row.stake), float(row.payout), int(row.wins), int(row.bets)]
+        for grouping in masks.get(row.grouping_id, ()):
+            totals[grouping][tuple(values[dim] for dim in parsed[grouping])] = measures
+    return totals
+
+
+def ranked_breakdown(
+    db: Session,
+    dimension: Dimension | HighCardinalityDimension,
+    category: str | None = None,
+    sport: str | None = None,
+    limit: int = DEFAULT_BREAKDOWN_LIMIT,
+    after_profit: float | None = None,
+    after_key: str | None = None,
+    min_stake: float | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float]]:
+    """Return one page of a breakdown ranked by profit, plus an "Other" roll-up.
+
+    Pages are addressed by keyset: pass the ``profit`` and ``key`` of the last
+    row received as ``after_profit``/``after_key`` to fetch the next page.
+    Groups staking less than ``min_stake`` are excluded entirely. The "Other"
+    row aggregates every remaining group after the page. Dimensions kept in
+    ``bet_metrics`` read the summary table; the high-cardinality ones read
+    ``bets`` through the ``ix_bets_breakdown_*`` covering indexes.
+    """
+    if dimension in HIGH_CARDINALITY_DIMENSIONS:
+        source = Bet
+        stake = func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0)
+        payout = func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0)
+        wins = count_where(Bet.payout > Bet.stake)
+        bets = func.count()
+    else:
+        source = BetMetric
+        stake = func.coalesce(func.sum(BetMetric.stake), 0)
+        payout = func.coalesce(func.sum(BetMetric.payout), 0)
+        wins = func.coalesce(func.sum(BetMetric.win_count), 0)
+        bets = func.coalesce(func.sum(BetMetric.bet_count), 0)
+
+    key = func.coalesce(getattr(source, dimension), "")
+    grouped = select(
+        key.label("key"),
+        stake.label("stake"),
+        payout.label("payout"),
+        func.round(payout - stake, 2).label("profit"),
+        wins.label("wins"),
+        bets.label("bets"),
+    ).group_by(key)
+    grouped = apply_filters(grouped, category, sport, source, user_id)
+    if min_stake is not None:
+        grouped = grouped.having(stake >= min_stake)
+    groups = grouped.subquery()
+
+    def after(profit: float, last_key: str):
+        return or_(groups.c.profit < profit, and_(groups.c.profit == profit, groups.c.key > last_key))
+
+    page = select(groups).order_by(groups.c.profit.desc(), groups.c.key).limit(limit)
+    if after_profit is not None and after_key is not None:
+        page = page.where(after(after_profit, "" if after_key == "Unclassified" else after_key))
+    rows = analytics_execute(db, page).all()
+
+    results = [
+        breakdown_row(row.key or "Unclassified", row.stake, row.payout, row.wins, row.bets)
+        for row in rows
+    ]
+    if len(rows) == limit:
+        last = rows[-1]
+        rest = analytics_execute(
+            db,
+            select(
+                func.count().label("groups"),
+                func.sum(groups.c.stake).label("stake"),
+                func.sum(groups.c.payout).label("payout"),
+                func.sum(groups.c.wins).label("wins"),
+                func.sum(groups.c.bets).label("bets"),
+            ).where(after(last.profit, last.key)),
+        ).one()
+        if rest.groups:
+            other = breakdown_row("Other", rest.stake, rest.payout, rest.wins, rest.bets)
+            other["groups"] = int(rest.groups)
+            results.append(other)
     return results
+
+
+def breakdown_row(
+    key: str,
+    stake: float | None,
+    payout: float | None,
+    wins: int | None,
+    bets: int | None,
+) -> dict[str, str | float]:
+    stake = round(float(stake or 0), 2)
+    payout = round(float(payout or 0), 2)
+    profit = round(payout - stake, 2)
+    return {
+        "key": key,
+        "stake": stake,
+        "payout": payout,
+        "profit": profit,
+        "roi": roi_of(profit, stake),
+        "win_rate": int(wins or 0) / int(bets) if bets else 0.0,
+    }
+
+
+def roi_of(profit: float, stake: float) -> float:
+    """Profit per unit staked, from totals already rounded to cents, so every backend agrees."""
+    return profit / stake if stake else 0.0
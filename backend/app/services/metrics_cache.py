@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import ReadSessionLocal, with_read_session
+from app.core.serialization import dumps
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID
+from app.services.analytics import refresh_analytics
+from app.services.dashboard import dashboard_payload
+from app.services.highlights import HIGHLIGHTS_TOP_K, get_highlights
+from app.services.ledger import fetch_bankroll_series
+from app.services.legs import leg_breakdown
+from app.services.metrics_breakdown import (
+    DIMENSIONS,
+    breakdown_cube,
+    breakdown_payload,
+    ranked_breakdown,
+)
+from app.services.metrics_service import get_cashflow_totals, get_overview_metrics
+from app.services.odds import odds_bands
+from app.services.participants import participant_breakdown
+from app.services.simulation import simulate_staking
+from app.services.timeseries import downsample_lttb, fetch_profit_timeseries
+
+CacheKey = tuple[Hashable, ...]
+
+
+class MetricsCache:
+    """Bounded LRU cache for metrics payloads, invalidated by a data version.
+
+    Entries are keyed by the requesting user's ``data_token``, read from the
+    database on every request, so each worker process sees another's uploads
+    without being told. The version is bumped whenever an upload reaches
+    ``processed`` in this process, which drops the entries it made obsolete
+    at once instead of leaving them to age out. Entries computed while the
+    version changed underneath them are discarded rather than stored, so a
+    slow query can never repopulate the cache with stale results.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, Any] = OrderedDict()
+        self._lock = Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: CacheKey) -> Any | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: CacheKey, value: Any, version: int | None = None) -> None:
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], Any]) -> Any:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        version = self._version
+        value = compute()
+        self.set(key, value, version=version)
+        return value
+
+    def bump_version(self) -> int:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            return self._version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+metrics_cache = MetricsCache(settings.metrics_cache_size)
+
+
+def downsampled_series(
+    db: Session,
+    name: str,
+    fetch: Callable[[], list[dict[str, Any]]],
+    max_points: int | None,
+    value_key: str,
+    **params: Any,
+) -> list[dict[str, Any]]:
+    """Downsample a cached full-resolution series rather than re-querying it."""
+    token = data_token(db, params.get("user_id", DEFAULT_USER_ID))
+    series = metrics_cache.get_or_compute((token, *cache_key(name, **params)), fetch)
+    if max_points:
+        return downsample_lttb(series, max_points, value_key=value_key)
+    return series
+
+
+def timeseries_payload(db: Session, max_points: int | None = None, **params: Any) -> list[dict[str, str | float]]:
+    return downsampled_series(
+        db,
+        "timeseries-points",
+        lambda: fetch_profit_timeseries(db, **params),
+        max_points,
+        "cumulative",
+        **params,
+    )
+
+
+def bankroll_payload(db: Session, max_points: int | None = None, **params: Any) -> list[dict[str, str | float | None]]:
+    return downsampled_series(
+        db,
+        "bankroll-points",
+        lambda: fetch_bankroll_series(db, **params),
+        max_points,
+        "balance",
+        **params,
+    )
+
+
+PAYLOAD_BUILDERS: dict[str, Callable[..., Any]] = {
+    "overview": get_overview_metrics,
+    "cashflow": get_cashflow_totals,
+    "breakdown": breakdown_payload,
+    "cube": breakdown_cube,
+    "ranked_breakdown": ranked_breakdown,
+    "participants": participant_breakdown,
+    "legs": leg_breakdown,
+    "odds_bands": odds_bands,
+    "timeseries": timeseries_payload,
+    "bankroll": bankroll_payload,
+    "highlights": get_highlights,
+    "simulate": simulate_staking,
+    "dashboard": dashboard_payload,
+}
+
+WARM_REQUESTS: list[tuple[str, dict[str, Any]]] = [
+    ("overview", {}),
+    ("cashflow", {}),
+    (
+        "timeseries",
+        {"category": None, "granularity": "day", "date_from": None, "date_to": None, "max_points": None},
+    ),
+    ("bankroll", {"date_from": None, "date_to": None, "max_points": None}),
+    ("highlights", {"limit": HIGHLIGHTS_TOP_K}),
+    *[
+        ("breakdown", {"dimension": dimension, "category": None, "sport": None})
+        for dimension in DIMENSIONS
+    ],
+    ("cube", {"groupings": DIMENSIONS, "category": None, "sport": None}),
+    ("dashboard", {"category": "sport"}),
+]
+
+
+def cache_key(endpoint: str, **params: Any) -> CacheKey:
+    return (endpoint, *sorted(params.items()))
+
+
+def body_key(token: str, endpoint: str, **params: Any) -> CacheKey:
+    return ("body", token, *cache_key(endpoint, **params))
+
+
+def cached_body(db: Session, token: str, endpoint: str, **params: Any) -> bytes:
+    """The payload already encoded as JSON, so cache hits skip building and encoding alike."""
+    builder = PAYLOAD_BUILDERS[endpoint]
+
+    def build() -> bytes:
+        refresh_analytics(db)
+        return dumps(builder(db, **params))
+
+    return metrics_cache.get_or_compute(body_key(token, endpoint, **params), build)
+
+
+def data_token_select(user_id: str) -> Select:
+    return (
+        select(Upload.id, Upload.processed_at)
+        .where(Upload.user_id == user_id, Upload.status == "processed")
+        .order_by(Upload.processed_at.desc())
+        .limit(1)
+    )
+
+
+def token_of(row: Any) -> str:
+    if row is None:
+        return "empty"
+    return f"{row.id}:{row.processed_at.isoformat() if row.processed_at else ''}"
+
+
+def data_token(db: Session, user_id: str = DEFAULT_USER_ID) -> str:
+    """Identify a user's current dataset by their latest processed upload.
+
+    Read from the database rather than cached, so it changes in every worker
+    as soon as any of them finishes an upload.
+    """
+    return token_of(db.execute(data_token_select(user_id)).first())
+
+
+async def data_token_async(db: AsyncSession, user_id: str = DEFAULT_USER_ID) -> str:
+    return token_of((await db.execute(data_token_select(user_id))).first())
+
+
+def etag_for(token: str, endpoint: str, **params: Any) -> str:
+    digest = hashlib.sha1(repr((token, cache_key(endpoint, **params))).encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
+async def cached_body_async(token: str, endpoint: str, **params: Any) -> bytes:
+    """Serve hits straight from the cache; build misses on the threadpool so the event loop keeps serving."""
+    cached = metrics_cache.get(body_key(token, endpoint, **params))
+    if cached is not None:
+        return cached
+    return await run_in_threadpool(with_read_session, cached_body, token, endpoint, **params)
+
+
+def warm_metrics_cache(user_id: str = DEFAULT_USER_ID) -> None:
+    """Precompute the payloads ``user_id``'s dashboard requests on first load."""
+    db = ReadSessionLocal()
+    try:
+        token = data_token(db, user_id)
+        for endpoint, params in WARM_REQUESTS:
+            cached_body(db, token, endpoint, user_id=user_id, **params)
+    except Exception:  # noqa: BLE001 - warming is best effort
+        logger.exception("Failed to warm metrics cache")
+    finally:
+        db.close()
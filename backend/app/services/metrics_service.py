@@ -1,34 +1,41 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import List
 
 from sqlalchemy import case, func, select
-from sqlalchemy.sql import desc, asc
 from sqlalchemy.orm import Session
 
-from app.models.bet import Bet
-from app.models.upload import Upload
+from app.models.metrics import BetMetric
+from app.models.transaction import Transaction
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import sum_where
+from app.services.analytics import analytics_execute
+from app.services.columnar import active_store
+from app.services.ledger import CASH_TYPES, DEPOSIT_TYPES, WITHDRAWAL_TYPES
 
+MULTI_BET_TYPES = ("same game multi", "multi", "exotic")
 
-def get_overview_metrics(db: Session) -> List[dict[str, str | float]]:
-    has_bets_stmt = select(func.count()).select_from(Bet)
-    has_bets = db.execute(has_bets_stmt).scalar_one()
-    if not has_bets:
-        return []
 
-    total_profit_stmt = select(
-        func.coalesce(func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0)), 0)
-    )
-    total_profit = float(db.execute(total_profit_stmt).scalar_one() or 0)
+def get_overview_metrics(db: Session, user_id: str = DEFAULT_USER_ID) -> List[dict[str, str | float]]:
+    return overview_cards(fetch_overview_groups(db, user_id))
+
+
+def overview_cards(groups: list[dict[str, object]]) -> List[dict[str, str | float]]:
+    """Reduce (sport, single/multi) groups to the overview cards."""
+    if not groups:
+        return []
 
-    win_rate_stmt = select(func.coalesce(func.avg(case((Bet.payout > Bet.stake, 1), else_=0)), 0))
-    win_rate = float(db.execute(win_rate_stmt).scalar_one() or 0)
+    bet_count = sum(group["bets"] for group in groups)
+    total_profit = sum(group["profit"] for group in groups)
+    wins = sum(group["wins"] for group in groups)
+    staked_count = sum(group["staked_bets"] for group in groups)
+    staked_total = sum(group["stake"] for group in groups)
 
-    avg_stake_stmt = select(func.coalesce(func.avg(func.nullif(Bet.stake, 0)), 0))
-    avg_stake = float(db.execute(avg_stake_stmt).scalar_one() or 0)
+    win_rate = wins / bet_count if bet_count else 0.0
+    avg_stake = staked_total / staked_count if staked_count else 0.0
 
-    best_sport = fetch_sport_extreme(db, order="desc")
-    worst_sport = fetch_sport_extreme(db, order="asc")
+    best_sport, worst_sport = sport_extremes(groups)
 
     cards = [
         {
@@ -58,35 +65,98 @@ def get_overview_metrics(db: Session) -> List[dict[str, str | float]]:
         },
     ]
 
-    single_multi = fetch_single_multi_metrics(db)
-    cards.extend(single_multi)
+    cards.extend(single_multi_cards(groups))
     return cards
 
 
-def fetch_sport_extreme(db: Session, order: str) -> str:
-    ordering = desc if order == "desc" else asc
+def fetch_overview_groups(db: Session, user_id: str = DEFAULT_USER_ID) -> list[dict[str, object]]:
+    """Aggregate ``bet_metrics`` per (sport, single/multi) in a single scan.
+
+    Every overview card is reduced from these groups, so a dashboard load
+    costs one pass over the user's summary rows regardless of how many
+    cards are shown.
+    """
+    store = active_store()
+    if store is not None:
+        return overview_groups_from_store(store.aggregate(("sport", "bet_type"), user_id=user_id))
+
+    classification = bet_classification(BetMetric.bet_type)
     stmt = (
         select(
-            Bet.sport,
-            func.coalesce(
-                func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0))
-                / func.nullif(func.sum(func.coalesce(Bet.stake, 0)), 0),
-                0,
-            ).label("roi"),
+            BetMetric.sport.label("sport"),
+            classification.label("grouping"),
+            func.coalesce(func.sum(BetMetric.bet_count), 0).label("bets"),
+            func.coalesce(func.sum(BetMetric.stake), 0).label("stake"),
+            func.coalesce(func.sum(BetMetric.profit), 0).label("profit"),
+            func.coalesce(func.sum(BetMetric.win_count), 0).label("wins"),
+            func.coalesce(func.sum(BetMetric.staked_count), 0).label("staked_bets"),
         )
-        .group_by(Bet.sport)
-        .order_by(ordering("roi"))
-        .limit(1)
+        .where(BetMetric.user_id == user_id)
+        .group_by(BetMetric.sport, classification)
     )
-    row = db.execute(stmt).first()
-    return row[0] if row else "Unclassified"
 
+    return [
+        {
+            "sport": row.sport,
+            "grouping": (row.grouping or "Single").title(),
+            "bets": int(row.bets or 0),
+            "stake": float(row.stake or 0),
+            "profit": float(row.profit or 0),
+            "wins": int(row.wins or 0),
+            "staked_bets": int(row.staked_bets or 0),
+        }
+        for row in analytics_execute(db, stmt)
+    ]
 
-def get_cashflow_totals(db: Session) -> dict[str, float]:
-    stmt = select(
-        func.coalesce(func.sum(func.coalesce(Upload.deposit_total, 0)), 0).label("deposits"),
-        func.coalesce(func.sum(func.coalesce(Upload.withdrawal_total, 0)), 0).label("withdrawals"),
+
+def overview_groups_from_store(groups: list) -> list[dict[str, object]]:
+    """Fold ``GroupTotals`` keyed by (sport, bet_type) into (sport, single/multi) groups."""
+    folded: dict[tuple[str | None, str], dict[str, object]] = {}
+    for group in groups:
+        sport, bet_type = group.key
+        grouping = "Multi" if (bet_type or "").lower() in MULTI_BET_TYPES else "Single"
+        entry = folded.setdefault(
+            (sport, grouping),
+            {"sport": sport, "grouping": grouping, "bets": 0, "stake": 0.0, "profit": 0.0, "wins": 0, "staked_bets": 0},
+        )
+        entry["bets"] += group.bets
+        entry["stake"] += group.stake
+        entry["profit"] += group.profit
+        entry["wins"] += group.wins
+        entry["staked_bets"] += group.staked_bets
+    return list(folded.values())
+
+
+def bet_classification(bet_type):
+    return case(
+        (func.lower(func.coalesce(bet_type, "")).in_(MULTI_BET_TYPES), "Multi"),
+        else_="Single",
     )
+
+
+def sport_extremes(groups: list[dict[str, object]]) -> tuple[str, str]:
+    by_sport: dict[str | None, list[float]] = defaultdict(lambda: [0.0, 0.0])
+    for group in groups:
+        totals = by_sport[group["sport"]]
+        totals[0] += group["profit"]
+        totals[1] += group["stake"]
+
+    if not by_sport:
+        return "Unclassified", "Unclassified"
+
+    roi = {sport: (profit / stake if stake else 0.0) for sport, (profit, stake) in by_sport.items()}
+    best = max(roi, key=roi.__getitem__)
+    worst = min(roi, key=roi.__getitem__)
+    return best, worst
+
+
+def get_cashflow_totals(db: Session, user_id: str = DEFAULT_USER_ID) -> dict[str, float]:
+    """Deposits and withdrawals from the deduplicated transaction ledger."""
+    amount = func.abs(Transaction.amount)
+    stmt = select(
+        sum_where(amount, Transaction.type.in_(DEPOSIT_TYPES)).label("deposits"),
+        sum_where(amount, Transaction.type.in_(WITHDRAWAL_TYPES)).label("withdrawals"),
+    ).where(Transaction.user_id == user_id, Transaction.type.in_(CASH_TYPES))
     result = db.execute(stmt).one()
     return {
         "deposits": float(result.deposits or 0),
@@ -94,46 +164,18 @@ def get_cashflow_totals(db: Session) -> dict[str, float]:
     }
 
 
-def fetch_single_multi_metrics(db: Session) -> list[dict[str, str | float]]:
-    classification = case(
-        (
-            func.lower(func.coalesce(Bet.bet_type, "")) == "same game multi",
-            "Multi",
-        ),
-        (
-            func.lower(func.coalesce(Bet.bet_type, "")) == "multi",
-            "Multi",
-        ),
-        (
-            func.lower(func.coalesce(Bet.bet_type, "")) == "exotic",
-            "Multi",
-        ),
-        else_="Single",
-    )
-
-    stmt = (
-        select(
-            classification.label("grouping"),
-            func.coalesce(
-                func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0)),
-                0,
-            ).label("profit"),
-            func.coalesce(func.avg(case((Bet.payout > Bet.stake, 1), else_=0)), 0).label("win_rate"),
-        )
-        .group_by(classification)
-    )
-
-    aggregates: dict[str, tuple[float, float]] = {}
-    for row in db.execute(stmt):
-        label = (row.grouping or "Single").title()
-        aggregates[label] = (
-            float(row.profit or 0),
-            float(row.win_rate or 0),
-        )
+def single_multi_cards(groups: list[dict[str, object]]) -> list[dict[str, str | float]]:
+    aggregates: dict[str, list[float]] = defaultdict(lambda: [0.0, 0, 0])
+    for group in groups:
+        totals = aggregates[group["grouping"]]
+        totals[0] += group["profit"]
+        totals[1] += group["wins"]
+        totals[2] += group["bets"]
 
     response: list[dict[str, str | float]] = []
     for label in ("Single", "Multi"):
-        profit, win_rate = aggregates.get(label, (0.0, 0.0))
+        profit, wins, bets = aggregates.get(label, (0.0, 0, 0))
+        win_rate = wins / bets if bets else 0.0
         response.append(
             {
                 "label": f"{label}s P/L",
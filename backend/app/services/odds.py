@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from typing import Sequence
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import count_where
+from app.services.metrics_breakdown import apply_filters, breakdown_row
+
+DEFAULT_ODDS_EDGES: tuple[float, ...] = (1.5, 2.0, 3.0, 5.0, 10.0)
+MAX_ODDS_EDGES = 20
+
+ODDS_PLACES = Decimal("0.0001")
+PROBABILITY_PLACES = Decimal("0.000001")
+
+
+def decimal_odds(odds: str | None) -> Decimal | None:
+    """Convert "12.00" or fractional "5/2" odds to decimal odds (3.5)."""
+    if not odds:
+        return None
+    try:
+        if "/" in odds:
+            numerator, denominator = odds.split("/", 1)
+            value = Decimal(numerator) / Decimal(denominator) + 1
+        else:
+            value = Decimal(odds)
+    except (InvalidOperation, ZeroDivisionError):
+        return None
+    if not value.is_finite() or value <= 1:
+        return None
+    return value.quantize(ODDS_PLACES)
+
+
+def implied_probability(odds: Decimal | None) -> Decimal | None:
+    if odds is None:
+        return None
+    return (1 / odds).quantize(PROBABILITY_PLACES)
+
+
+def normalize_edges(edges: Sequence[float] | None) -> tuple[float, ...]:
+    if not edges:
+        return DEFAULT_ODDS_EDGES
+    ordered = tuple(sorted(set(edges)))
+    if len(ordered) > MAX_ODDS_EDGES:
+        raise ValueError(f"At most {MAX_ODDS_EDGES} odds edges are supported")
+    if ordered[0] <= 1:
+        raise ValueError("Odds edges must be greater than 1")
+    return ordered
+
+
+def band_label(lower: float | None, upper: float | None) -> str:
+    if lower is None:
+        return f"< {upper:.2f}"
+    if upper is None:
+        return f"{lower:.2f}+"
+    return f"{lower:.2f}-{upper:.2f}"
+
+
+def odds_bands(
+    db: Session,
+    edges: Sequence[float] = DEFAULT_ODDS_EDGES,
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float | None]]:
+    """ROI and win rate per decimal-odds band.
+
+    ``edges`` split the odds range into ``len(edges) + 1`` half-open bands,
+    bucketed by a single ``CASE`` inside one grouped aggregate. Every band is
+    returned, empty ones included, so charts keep a stable x-axis. Bets
+    without parseable odds are excluded.
+    """
+    edges = normalize_edges(edges)
+    band = case(
+        *[(Bet.decimal_odds < edge, index) for index, edge in enumerate(edges)],
+        else_=len(edges),
+    ).label("band")
+    stmt = (
+        select(
+            band,
+            func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0).label("stake"),
+            func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0).label("payout"),
+            count_where(Bet.payout > Bet.stake).label("wins"),
+            func.count().label("bets"),
+            func.avg(Bet.implied_probability).label("implied_probability"),
+        )
+        .where(Bet.decimal_odds.isnot(None))
+        .group_by(band)
+    )
+    stmt = apply_filters(stmt, category, sport, source=Bet, user_id=user_id)
+    totals = {row.band: row for row in db.execute(stmt)}
+
+    bounds: list[float | None] = [None, *edges, None]
+    results = []
+    for index in range(len(edges) + 1):
+        lower, upper = bounds[index], bounds[index + 1]
+        row = totals.get(index)
+        results.append(
+            {
+                **breakdown_row(
+                    band_label(lower, upper),
+                    row.stake if row else 0,
+                    row.payout if row else 0,
+                    row.wins if row else 0,
+                    row.bets if row else 0,
+                ),
+                "min_odds": lower,
+                "max_odds": upper,
+                "bets": int(row.bets) if row else 0,
+                "implied_probability": float(row.implied_probability or 0) if row else 0.0,
+            }
+        )
+    return results
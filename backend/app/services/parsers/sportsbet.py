@@ -17,6 +17,9 @@ OUTCOME_REGEX = re.compile(r"\((?P<result>Win|Place|Each Way)\)", re.IGNORECASE)
 TEAM_DELIMITERS = [" v ", " vs ", " at ", " @ "]
 PLAYER_MARKET_SPLIT = re.compile(r"\s+[–-]\s+")
 TRACK_RACE_PREFIX = re.compile(r"^(r\d+|race\b|heat\b|trial\b|leg\b|bm\d+)", re.IGNORECASE)
+MULTI_HEADER = re.compile(r"^(\d+\s*legs?\s+)?(same game\s+)?multi(bet)?$", re.IGNORECASE)
+EVENT_DELIMITER = re.compile(r"\s(?:v|vs\.?|at)\s", re.IGNORECASE)
+SELECTION_SUFFIX = re.compile(r"\s*(@\s*[\d\./]+.*|\((?:win|place|each way)\).*)$", re.IGNORECASE)
 
 TEAM_LOOKUP, TEAM_SPORT_LOOKUP, AMBIGUOUS_TEAM_LOOKUP = load_reference_mappings()
 
@@ -37,6 +40,18 @@ class ParsedBet:
     summary: str
 
 
+@dataclass
+class ParsedLeg:
+    leg_number: int
+    sport: str | None
+    event: str | None
+    team: str | None
+    market_type: str | None
+    selection: str | None
+    odds: str | None
+    result: str | None
+
+
 def parse_summary(summary: str) -> ParsedBet:
     event_line, market_line, selection_line = split_summary_lines(summary)
     normalized = summary.lower()
@@ -254,3 +269,95 @@ def extract_result(summary: str) -> str | None:
     if not match:
         return None
     return match.group("result").title()
+
+
+def parse_legs(summary: str) -> list[ParsedLeg]:
+    """Split a summary into its legs.
+
+    Each event line (``A v B`` or ``Track - R1``) opens a leg group followed
+    by its market and selection lines. Under a "Same Game Multi" marker
+    every following line is a separate leg of the same event. Singles yield
+    one leg.
+    """
+    lines = [line.strip() for line in summary.split("\n") if line.strip()]
+    if lines and MULTI_HEADER.match(lines[0]):
+        lines = lines[1:]
+
+    groups: list[tuple[str, list[str]]] = []
+    for line in lines:
+        if not groups or is_event_line(line):
+            groups.append((line, []))
+        else:
+            groups[-1][1].append(line)
+
+    legs: list[ParsedLeg] = []
+    for event, details in groups:
+        teams = detect_teams(event)
+        track, _ = extract_track_and_race(event)
+        if track:
+            teams = []
+        sport = infer_sport(teams, event) or ("Racing" if track else None)
+        if details and details[0].lower() == "same game multi":
+            selections = [split_leg_selection(line, teams) for line in details[1:]]
+        else:
+            _, player_market = extract_player_market(details[0] if details else None)
+            market = normalize_label(player_market or (details[0] if details else None))
+            selection = " ".join(details[1:]) or None
+            selections = [(market, selection, selection_team(selection, teams))]
+        for market, selection, team in selections:
+            text = selection or ""
+            legs.append(
+                ParsedLeg(
+                    leg_number=len(legs) + 1,
+                    sport=sport,
+                    event=event,
+                    team=team,
+                    market_type=market,
+                    selection=selection,
+                    odds=extract_odds(text),
+                    result=extract_result(text),
+                )
+            )
+    return legs
+
+
+def is_event_line(line: str) -> bool:
+    if "@" in line:
+        return False
+    if EVENT_DELIMITER.search(line):
+        return True
+    track, _ = extract_track_and_race(line)
+    return track is not None
+
+
+def split_leg_selection(line: str, teams: list[str]) -> tuple[str | None, str, str | None]:
+    """Return (market, selection, team) for one same-game-multi leg line."""
+    parts = PLAYER_MARKET_SPLIT.split(SELECTION_SUFFIX.sub("", line), maxsplit=1)
+    if len(parts) == 2:
+        left, right = (part.strip() for part in parts)
+        if resolve_team(left):
+            return normalize_label(right), line, resolve_team(left)
+        if resolve_team(right):
+            return normalize_label(left), line, resolve_team(right)
+        return normalize_label(right), line, selection_team(line, teams)
+    return None, line, selection_team(line, teams)
+
+
+def resolve_team(value: str | None) -> str | None:
+    if not value:
+        return None
+    return TEAM_LOOKUP.get(re.sub(r"\s+", " ", value).strip().lower())
+
+
+def selection_team(selection: str | None, teams: list[str]) -> str | None:
+    if not selection:
+        return None
+    name = SELECTION_SUFFIX.sub("", selection)
+    resolved = resolve_team(name)
+    if resolved:
+        return resolved
+    lowered = name.lower()
+    for team in teams:
+        if team.lower() in lowered:
+            return team
+    return None
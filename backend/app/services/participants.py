@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.participant import BetParticipant
+from app.models.reference import Sport, SportAlias, SportEntity
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import count_where
+from app.services.bet_metrics import normalize_key
+from app.services.metrics_breakdown import DEFAULT_BREAKDOWN_LIMIT, breakdown_row
+
+PARTICIPANT_ROLES = ("team", "opponent")
+
+
+def load_entity_ids(db: Session) -> dict[tuple[str, str], int]:
+    """Map lowercased ``(sport, name)`` pairs, for entity names and aliases, to ``sport_entities`` ids.
+
+    A name that several entities of one sport answer to is ambiguous and left
+    out, as the reference loader does, rather than linked to whichever loads first.
+    """
+    candidates: dict[tuple[str, str], set[int]] = defaultdict(set)
+    entities = select(Sport.name, SportEntity.name, SportEntity.id).join(Sport, Sport.id == SportEntity.sport_id)
+    aliases = (
+        select(Sport.name, SportAlias.normalized_alias, SportAlias.entity_id)
+        .join(SportEntity, SportEntity.id == SportAlias.entity_id)
+        .join(Sport, Sport.id == SportEntity.sport_id)
+    )
+    for stmt in (entities, aliases):
+        for sport, name, entity_id in db.execute(stmt):
+            candidates[(sport.lower(), name.lower())].add(entity_id)
+    return {key: next(iter(ids)) for key, ids in candidates.items() if len(ids) == 1}
+
+
+def sync_participants(db: Session, bets: list[Bet], entity_ids: dict[tuple[str, str], int] | None = None) -> None:
+    """Replace the participant links of ``bets`` from their team names, resolved within each bet's sport."""
+    if not bets:
+        return
+    if entity_ids is None:
+        entity_ids = load_entity_ids(db)
+
+    db.execute(delete(BetParticipant).where(BetParticipant.bet_id.in_([bet.id for bet in bets])))
+
+    rows = []
+    for bet in bets:
+        sport = normalize_key(bet.sport)
+        linked: set[int] = set()
+        for role, name in zip(PARTICIPANT_ROLES, (bet.team, bet.opponent)):
+            entity_id = entity_ids.get((sport, name.strip().lower())) if sport and name else None
+            if entity_id is not None and entity_id not in linked:
+                linked.add(entity_id)
+                rows.append({"bet_id": bet.id, "entity_id": entity_id, "role": role})
+    if rows:
+        db.execute(insert(BetParticipant), rows)
+
+
+def participant_breakdown(
+    db: Session,
+    sport: str | None = None,
+    entity_id: int | None = None,
+    limit: int = DEFAULT_BREAKDOWN_LIMIT,
+    user_id: str = DEFAULT_USER_ID,
+) -> list[dict[str, str | float]]:
+    """P/L per team or player, joined through the ``bet_participants`` index."""
+    stake = func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0)
+    payout = func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0)
+    stmt = (
+        select(
+            SportEntity.id.label("entity_id"),
+            SportEntity.name.label("name"),
+            Sport.name.label("sport"),
+            stake.label("stake"),
+            payout.label("payout"),
+            count_where(Bet.payout > Bet.stake).label("wins"),
+            func.count().label("bets"),
+        )
+        .select_from(BetParticipant)
+        .join(Bet, Bet.id == BetParticipant.bet_id)
+        .join(SportEntity, SportEntity.id == BetParticipant.entity_id)
+        .join(Sport, Sport.id == SportEntity.sport_id)
+        .where(Bet.user_id == user_id)
+        .group_by(SportEntity.id, SportEntity.name, Sport.name)
+        .order_by((payout - stake).desc(), SportEntity.name)
+        .limit(limit)
+    )
+    if entity_id is not None:
+        stmt = stmt.where(BetParticipant.entity_id == entity_id)
+    if sport:
+        stmt = stmt.where(func.lower(Sport.name) == normalize_key(sport))
+
+    return [
+        {
+            "entity_id": row.entity_id,
+            "sport": row.sport,
+            "bets": int(row.bets),
+            **breakdown_row(row.name, row.stake, row.payout, row.wins, row.bets),
+        }
+        for row in db.execute(stmt)
+    ]
@@ -0,0 +1,118 @@
+"""Ranked full-text search over bets through the ``bets_fts`` index.
+
+``index_bets`` keeps the index in step with ``bets``: ingestion reindexes the
+bets each upload touched, migration 0010 indexes the existing ones. Searches
+match every term as a prefix, so "bucka" finds "Buckaroo" and "flemington r7"
+finds bets mentioning both, without scanning ``bets.description``.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Sequence
+
+from sqlalchemy import (
+    Select,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.search import SEARCH_COLUMNS, SEARCH_TABLE
+from app.models.user import DEFAULT_USER_ID
+from app.services.aggregates import count_where
+from app.services.bet_export import EXPORT_COLUMNS, bet_record
+from app.services.metrics_breakdown import apply_filters, breakdown_row
+
+DEFAULT_SEARCH_LIMIT = 50
+TERM = re.compile(r"\w+")
+
+sqlite_index = table(SEARCH_TABLE, column("rowid"), *(column(name) for name in SEARCH_COLUMNS))
+postgres_index = table(SEARCH_TABLE, column("id"), column("document"))
+
+
+def index_bets(db: Session, bet_ids: Sequence[int] | None = None) -> None:
+    """Write the searchable text of ``bet_ids``, or of every bet, to ``bets_fts``."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        document = func.to_tsvector("simple", func.concat_ws(" ", *(getattr(Bet, name) for name in SEARCH_COLUMNS)))
+        source = select(Bet.id, document)
+        if bet_ids is not None:
+            source = source.where(Bet.id.in_(bet_ids))
+        stmt = postgresql.insert(postgres_index).from_select(["id", "document"], source)
+        db.execute(stmt.on_conflict_do_update(index_elements=["id"], set_={"document": stmt.excluded.document}))
+    elif dialect == "sqlite":
+        source = select(Bet.id, *(getattr(Bet, name) for name in SEARCH_COLUMNS))
+        if bet_ids is not None:
+            db.execute(delete(sqlite_index).where(sqlite_index.c.rowid.in_(bet_ids)))
+            source = source.where(Bet.id.in_(bet_ids))
+        else:
+            db.execute(delete(sqlite_index))
+        db.execute(insert(sqlite_index).from_select(["rowid", *SEARCH_COLUMNS], source))
+
+
+def search_terms(query: str) -> list[str]:
+    return [term.lower() for term in TERM.findall(query)]
+
+
+def match_select(dialect: str, terms: list[str]) -> Select:
+    """``(id, score)`` of the bets matching every term, best first when ordered by score."""
+    if dialect == "postgresql":
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return select(
+            postgres_index.c.id.label("id"),
+            (-func.ts_rank(postgres_index.c.document, query)).label("score"),
+        ).where(postgres_index.c.document.op("@@")(query))
+    # FTS5's ``rank`` is bm25, where lower is better.
+    query = " ".join(f'"{term}"*' for term in terms)
+    return select(
+        sqlite_index.c.rowid.label("id"),
+        literal_column("rank").label("score"),
+    ).where(literal_column(SEARCH_TABLE).match(query))
+
+
+def search_bets(
+    db: Session,
+    query: str,
+    category: str | None = None,
+    sport: str | None = None,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+    user_id: str = DEFAULT_USER_ID,
+) -> dict[str, Any]:
+    """The best ``limit`` matches for ``query`` and P/L totals over every match."""
+    terms = search_terms(query)
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+    matches = match_select(db.get_bind().dialect.name, terms).subquery()
+
+    def matched(stmt: Select) -> Select:
+        return apply_filters(stmt.join(matches, matches.c.id == Bet.id), category, sport, source=Bet, user_id=user_id)
+
+    rows = db.execute(
+        matched(select(*(getattr(Bet, name) for name in EXPORT_COLUMNS)).select_from(Bet))
+        .order_by(matches.c.score, Bet.id)
+        .limit(limit)
+    ).all()
+    totals = db.execute(
+        matched(
+            select(
+                func.count().label("bets"),
+                func.coalesce(func.sum(func.coalesce(Bet.stake, 0)), 0).label("stake"),
+                func.coalesce(func.sum(func.coalesce(Bet.payout, 0)), 0).label("payout"),
+                count_where(Bet.payout > Bet.stake).label("wins"),
+            ).select_from(Bet)
+        )
+    ).one()
+    return {
+        "summary": {
+            "bets": int(totals.bets),
+            **breakdown_row(query, totals.stake, totals.payout, totals.wins, totals.bets),
+        },
+        "bets": [bet_record(row) for row in rows],
+    }
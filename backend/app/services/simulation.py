@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.bet import Bet
+from app.models.user import DEFAULT_USER_ID
+from app.services.bet_metrics import normalize_key
+from app.services.columnar import active_store
+from app.services.metrics_breakdown import apply_filters
+
+STRATEGIES = ("actual", "flat", "fixed_win", "percent_bankroll")
+DEFAULT_SIMULATION_POINTS = 500
+BET_ARRAYS = np.dtype([("id", np.int64), ("stake", np.float64), ("payout", np.float64), ("odds", np.float64)])
+
+
+def load_bet_arrays(
+    db: Session,
+    category: str | None = None,
+    sport: str | None = None,
+    user_id: str = DEFAULT_USER_ID,
+    chunk_size: int = 50_000,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Ids, stakes, payouts and decimal odds of staked bets in settlement order.
+
+    Read from the columnar store when it is active. Otherwise the amounts are
+    cast to floats in SQL and streamed ``chunk_size`` rows at a time into one
+    structured array, without building ``Decimal`` values or a list of rows.
+    """
+    store = active_store()
+    if store is not None:
+        return store.staked_bets(category, normalize_key(sport), user_id)
+
+    stmt = (
+        select(
+            Bet.id,
+            cast(Bet.stake, Float),
+            cast(func.coalesce(Bet.payout, 0), Float),
+            cast(func.coalesce(Bet.decimal_odds, 0), Float),
+        )
+        .where(Bet.stake > 0)
+        .order_by(Bet.settled_at, Bet.id)
+    )
+    stmt = apply_filters(stmt, category, sport, source=Bet, user_id=user_id)
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    bets = np.fromiter(map(tuple, result), dtype=BET_ARRAYS)
+    return bets["id"], bets["stake"], bets["payout"], bets["odds"]
+
+
+def settled_days(db: Session, ids: list[int]) -> dict[int, date | None]:
+    """``settled_day`` of each bet in ``ids``, for labelling sampled curve points."""
+    return dict(db.execute(select(Bet.id, Bet.settled_day).where(Bet.id.in_(ids))).all())
+
+
+def strategy_curves(
+    stakes: np.ndarray,
+    payouts: np.ndarray,
+    odds: np.ndarray,
+    unit: float,
+    bankroll: float,
+    fraction: float,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Per-bet stakes and cumulative profit for each strategy.
+
+    Every strategy replays the realised return multiple (payout / stake) of
+    each bet, so each-way, cash-out and dead-heat results scale correctly.
+    ``fixed_win`` stakes to win ``unit`` at the bet's odds, falling back to
+    ``unit`` when odds are unknown; ``percent_bankroll`` compounds a fixed
+    fraction of the running bankroll.
+    """
+    returns = payouts / stakes
+    fixed_win_stakes = np.where(odds > 1, unit / np.maximum(odds - 1, 1e-9), unit)
+    growth = np.clip(1 + fraction * (returns - 1), 0, None)
+    with np.errstate(over="ignore"):
+        # Long winning runs can compound past float range; saturate instead of inf.
+        balances = np.nan_to_num(bankroll * np.cumprod(growth), posinf=np.finfo(np.float64).max)
+    percent_stakes = fraction * np.concatenate(([bankroll], balances[:-1]))
+
+    flat_stakes = np.full_like(stakes, unit)
+    return {
+        "actual": (stakes, np.cumsum(payouts - stakes)),
+        "flat": (flat_stakes, np.cumsum(flat_stakes * (returns - 1))),
+        "fixed_win": (fixed_win_stakes, np.cumsum(fixed_win_stakes * (returns - 1))),
+        "percent_bankroll": (percent_stakes, balances - bankroll),
+    }
+
+
+def sample_indices(length: int, max_points: int) -> np.ndarray:
+    if length <= max_points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, max_points).round().astype(np.int64))
+
+
+def simulate_staking(
+    db: Session,
+    category: str | None = None,
+    sport: str | None = None,
+    unit: float = 10.0,
+    bankroll: float = 1000.0,
+    fraction: float = 0.02,
+    max_points: int = DEFAULT_SIMULATION_POINTS,
+    user_id: str = DEFAULT_USER_ID,
+) -> dict[str, Any]:
+    """Replay the filtered bets under each staking strategy.
+
+    Curves are sampled at evenly spaced bets so payloads stay bounded; the
+    summaries are computed over every bet.
+    """
+    ids, stakes, payouts, odds = load_bet_arrays(db, category, sport, user_id)
+    if not len(stakes):
+        return {"bets": 0, "summary": {}, "curves": []}
+
+    curves = strategy_curves(stakes, payouts, odds, unit, bankroll, fraction)
+    summary = {}
+    for name, (staked, profit) in curves.items():
+        total_staked = float(staked.sum())
+        summary[name] = {
+            "profit": round(float(profit[-1]), 2),
+            "staked": round(total_staked, 2),
+            "roi": float(profit[-1]) / total_staked if total_staked else 0.0,
+            "max_drawdown": round(float((np.maximum.accumulate(np.maximum(profit, 0)) - profit).max()), 2),
+        }
+
+    indices = sample_indices(len(stakes), max_points)
+    sampled = {name: np.round(profit[indices], 2).tolist() for name, (_, profit) in curves.items()}
+    sampled_ids = ids[indices].tolist()
+    days = settled_days(db, sampled_ids)
+    points = [
+        {
+            "bet": int(index) + 1,
+            "date": str(days[bet_id]) if days.get(bet_id) else None,
+            **{name: values[position] for name, values in sampled.items()},
+        }
+        for position, (index, bet_id) in enumerate(zip(indices.tolist(), sampled_ids))
+    ]
+    return {"bets": int(len(stakes)), "summary": summary, "curves": points}
@@ -1,37 +1,137 @@
 from __future__ import annotations
 
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Literal
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.models.bet import Bet
-from app.models.upload import Upload
+from app.core.config import settings
+from app.models.metrics import BetMetric
+from app.models.user import DEFAULT_USER_ID
+from app.services.analytics import analytics_execute
+from app.services.columnar import active_store
 
+Granularity = Literal["day", "week", "month"]
+
+SOURCE_TZ = ZoneInfo(settings.source_timezone)
+REPORTING_TZ = ZoneInfo(settings.reporting_timezone)
+
+
+def settled_day(settled_at: datetime | None, fallback: datetime | None = None) -> date | None:
+    """Bucket a bet into a reporting-timezone day.
+
+    ``settled_at`` comes from the export's naive "Time (AEST)" column, while
+    the fallback is an upload's naive UTC ``created_at``.
+    """
+    if settled_at is not None:
+        moment = settled_at.replace(tzinfo=SOURCE_TZ)
+    elif fallback is not None:
+        moment = fallback.replace(tzinfo=timezone.utc)
+    else:
+        return None
+    return moment.astimezone(REPORTING_TZ).date()
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def fetch_profit_timeseries(
+    db: Session,
+    category: str | None = None,
+    granularity: Granularity = "day",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    user_id: str = DEFAULT_USER_ID,
+) -> List[dict[str, str | float]]:
+    store = active_store()
+    if store is not None:
+        groups = store.aggregate(("day",), category=category, date_from=date_from, date_to=date_to, user_id=user_id)
+        daily = sorted((group.key[0], group.profit) for group in groups if group.key[0] is not None)
+        undated = [(None, group.profit) for group in groups if group.key[0] is None]
+        return cumulative_series([*undated, *daily], granularity)
 
-def fetch_profit_timeseries(db: Session, category: str | None = None) -> List[dict[str, str | float]]:
-    date_column = func.date(func.coalesce(Bet.settled_at, Upload.created_at))
     stmt = (
         select(
-            date_column.label("bucket"),
-            func.coalesce(func.sum(func.coalesce(Bet.payout, 0) - func.coalesce(Bet.stake, 0)), 0).label("profit"),
+            BetMetric.day.label("bucket"),
+            func.coalesce(func.sum(BetMetric.profit), 0).label("profit"),
         )
-        .select_from(Bet)
-        .join(Upload, Bet.upload_id == Upload.id)
-        .group_by(date_column)
-        .order_by(date_column)
+        .where(BetMetric.user_id == user_id)
+        .group_by(BetMetric.day)
+        .order_by(BetMetric.day)
     )
 
-    if category == "racing":
-        stmt = stmt.where(Bet.track.isnot(None))
-    elif category == "sport":
-        stmt = stmt.where(Bet.track.is_(None))
+    if category in ("racing", "sport"):
+        stmt = stmt.where(BetMetric.category == category)
+    if date_from is not None:
+        stmt = stmt.where(BetMetric.day >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(BetMetric.day <= date_to)
+
+    return cumulative_series(((row.bucket, row.profit) for row in analytics_execute(db, stmt)), granularity)
+
+
+def cumulative_series(
+    daily: Iterable[tuple[date | None, float | None]],
+    granularity: Granularity,
+) -> List[dict[str, str | float]]:
+    buckets: dict[date | None, float] = {}
+    for day, profit in daily:
+        key = bucket_start(day, granularity) if day else None
+        buckets[key] = buckets.get(key, 0.0) + float(profit or 0)
 
-    rows = db.execute(stmt).all()
     cumulative = 0.0
     output: List[dict[str, str | float]] = []
-    for row in rows:
-        profit = float(row.profit or 0)
+    for bucket, profit in buckets.items():
         cumulative += profit
-        output.append({"date": str(row.bucket), "profit": profit, "cumulative": round(cumulative, 2)})
+        output.append({"date": str(bucket), "profit": round(profit, 2), "cumulative": round(cumulative, 2)})
     return output
+
+
+def downsample_lttb(
+    points: List[dict[str, str | float]],
+    max_points: int,
+    value_key: str = "cumulative",
+) -> List[dict[str, str | float]]:
+    """Reduce a series to ``max_points`` with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the first and last points and, from each bucket in between,
+    the point forming the largest triangle with its neighbours, so peaks and
+    drawdowns survive the reduction. Points are spaced by position.
+    """
+    total = len(points)
+    if max_points >= total or max_points < 3:
+        return points
+
+    values = [float(point[value_key] or 0) for point in points]
+    sampled = [points[0]]
+    bucket_size = (total - 2) / (max_points - 2)
+    anchor = 0
+
+    for bucket in range(max_points - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, total)
+        if end >= next_end:
+            avg_x, avg_y = float(total - 1), values[-1]
+        else:
+            avg_x = (end + next_end - 1) / 2
+            avg_y = sum(values[end:next_end]) / (next_end - end)
+
+        anchor_y = values[anchor]
+        best_index, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((anchor - avg_x) * (values[index] - anchor_y) - (anchor - index) * (avg_y - anchor_y))
+            if area > best_area:
+                best_index, best_area = index, area
+        sampled.append(points[best_index])
+        anchor = best_index
+
+    sampled.append(points[-1])
+    return sampled
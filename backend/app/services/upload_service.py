@@ -9,6 +9,7 @@ from fastapi import UploadFile
 from app.core.config import settings
 from app.core.database import SessionLocal
 from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID, User
 
 
 class UploadService:
@@ -17,7 +18,7 @@ class UploadService:
     def __init__(self) -> None:
         self.raw_dir = settings.raw_data_dir
 
-    def persist_upload(self, file: UploadFile) -> Upload:
+    def persist_upload(self, file: UploadFile, user_id: str = DEFAULT_USER_ID) -> Upload:
         upload_id = str(uuid.uuid4())
         target_path = self._target_path(upload_id, file.filename or "upload.csv")
 
@@ -27,8 +28,12 @@ class UploadService:
 
         db = SessionLocal()
         try:
+            if db.get(User, user_id) is None:
+                db.add(User(id=user_id))
+                db.flush()
             upload = Upload(
                 id=upload_id,
+                user_id=user_id,
                 original_filename=file.filename or "upload.csv",
                 stored_path=str(target_path),
                 status="received",
@@ -45,5 +50,5 @@ class UploadService:
         return self.raw_dir / f"{upload_id}-{safe_name}"
 
 
-def persist_upload(file: UploadFile) -> Upload:
-    return UploadService().persist_upload(file)
+def persist_upload(file: UploadFile, user_id: str = DEFAULT_USER_ID) -> Upload:
+    return UploadService().persist_upload(file, user_id)
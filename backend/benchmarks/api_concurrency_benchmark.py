@@ -0,0 +1,136 @@
+"""Benchmark concurrent dashboard requests against sync and async routes.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.api_concurrency_benchmark --rows 100000 --concurrency 200
+
+Builds a throwaway SQLite database with synthetic bets, then fires bursts of
+concurrent requests through ``httpx.ASGITransport`` at the real async routes
+and at equivalent ``def`` routes backed by the sync ``Session``, which
+FastAPI runs on its threadpool. Both serve the same pre-encoded bodies from
+``cached_body``, from a cold cache on every round so both modes reach the
+database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models  # noqa: F401 - ensure models are imported for metadata
+from app.core import database
+from app.core.database import Base, get_async_session
+from app.main import app as async_app
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID
+from app.services.bet_metrics import rebuild_bet_metrics
+from app.services.metrics_cache import cached_body, data_token, metrics_cache
+from benchmarks.breakdown_benchmark import populate
+
+PATHS = ["/metrics/overview", "/metrics/breakdown/sport", "/metrics/breakdown/bet_type", "/uploads/benchmark"]
+
+
+def sync_app(sessions: sessionmaker) -> FastAPI:
+    """The same payloads served by ``def`` routes on a sync session."""
+    app = FastAPI()
+
+    def get_session():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def serve(db: Session, endpoint: str, **params) -> Response:
+        body = cached_body(db, data_token(db, DEFAULT_USER_ID), endpoint, user_id=DEFAULT_USER_ID, **params)
+        return Response(body, media_type="application/json")
+
+    @app.get("/metrics/overview")
+    def overview(db: Session = Depends(get_session)):
+        return serve(db, "overview")
+
+    @app.get("/metrics/breakdown/{dimension}")
+    def breakdown(dimension: str, db: Session = Depends(get_session)):
+        return serve(db, "breakdown", dimension=dimension, category=None, sport=None)
+
+    @app.get("/uploads/{upload_id}")
+    def upload(upload_id: str, db: Session = Depends(get_session)):
+        found = db.get(Upload, upload_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return {"upload_id": found.id, "status": found.status}
+
+    return app
+
+
+async def burst(app: FastAPI, concurrency: int) -> float:
+    metrics_cache.bump_version()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get(PATHS[index % len(PATHS)]) for index in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+    failed = [response.status_code for response in responses if response.status_code != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} requests failed: {sorted(set(failed))}")
+    return elapsed * 1000
+
+
+async def compare(apps: dict[str, FastAPI], concurrency: int, repeat: int) -> None:
+    print(f"{'mode':<6} {'requests':>8} {'best':>10} {'req/s':>10}")
+    for name, app in apps.items():
+        best = min([await burst(app, concurrency) for _ in range(repeat)])
+        print(f"{name:<6} {concurrency:>8} {best:>8.1f}ms {concurrency / best * 1000:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "benchmark.db"
+        engine = create_engine(f"sqlite:///{path}", future=True)
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            populate(session, args.rows)
+            rebuild_bet_metrics(session)
+            session.get(Upload, "benchmark").status = "processed"
+            session.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def get_benchmark_session():
+            async with async_sessions() as db:
+                yield db
+
+        sessions = sessionmaker(bind=engine, autoflush=False)
+        read_sessions = database.ReadSessionLocal
+        database.ReadSessionLocal = sessions
+
+        async_app.dependency_overrides[get_async_session] = get_benchmark_session
+        try:
+            apps = {"sync": sync_app(sessions), "async": async_app}
+            asyncio.run(compare(apps, args.concurrency, args.repeat))
+        finally:
+            async_app.dependency_overrides.clear()
+            database.ReadSessionLocal = read_sessions
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark breakdown queries against a synthetic bets table.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.breakdown_benchmark --rows 1000000
+
+Builds a throwaway SQLite database, fills ``bets`` with synthetic rows,
+rebuilds ``bet_metrics`` and compares the indexed summary-table breakdowns
+with the equivalent full scan over ``bets``, with the DuckDB analytics
+mirror and with the in-memory columnar store.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import case, create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401 - ensure models are imported for metadata
+from app.core.database import Base
+from app.models.bet import Bet
+from app.models.upload import Upload
+from app.services import analytics, columnar
+from app.services.bet_metrics import rebuild_bet_metrics
+from app.services.metrics_breakdown import breakdown_by
+
+SPORTS = ["AFL", "NRL", "Soccer", "Basketball", "Cricket", "Tennis", None]
+BET_TYPES = ["Single", "Multi", "Same Game Multi", "Exotic"]
+MARKETS = [f"Market {index}" for index in range(40)]
+TRACKS = [f"Track {index}" for index in range(120)]
+CASES = [
+    ("sport", None, None),
+    ("bet_type", None, None),
+    ("market_type", "sport", "afl"),
+    ("track", "racing", None),
+]
+
+
+def populate(session: Session, rows: int, chunk_size: int = 50_000) -> None:
+    rng = random.Random(42)
+    session.add(Upload(id="benchmark", original_filename="benchmark.csv", stored_path="benchmark.csv"))
+    session.commit()
+
+    start_day = date(2015, 1, 1)
+    for offset in range(0, rows, chunk_size):
+        batch = []
+        for index in range(offset, min(offset + chunk_size, rows)):
+            racing = rng.random() < 0.4
+            sport = "Racing" if racing else rng.choice(SPORTS)
+            track = rng.choice(TRACKS) if racing else None
+            stake = round(rng.uniform(1, 100), 2)
+            payout = round(stake * rng.uniform(1.2, 8), 2) if rng.random() < 0.35 else 0
+            day = start_day + timedelta(days=rng.randrange(3650))
+            batch.append(
+                {
+                    "upload_id": "benchmark",
+                    "bet_id": str(index),
+                    "last_transaction_id": str(index),
+                    "sport": sport,
+                    "sport_key": sport.lower() if sport else None,
+                    "category": "racing" if racing else "sport",
+                    "bet_type": rng.choice(BET_TYPES),
+                    "market_type": rng.choice(MARKETS),
+                    "track": track,
+                    "stake": stake,
+                    "payout": payout,
+                    "settled_at": datetime.combine(day, datetime.min.time()),
+                    "settled_day": day,
+                    "decimal_odds": round(rng.uniform(1.1, 10), 2),
+                }
+            )
+        session.execute(insert(Bet), batch)
+        session.commit()
+
+
+def scan_breakdown(session: Session, dimension: str, category: str | None, sport: str | None) -> list:
+    column = getattr(Bet, dimension)
+    stake = func.coalesce(Bet.stake, 0)
+    payout = func.coalesce(Bet.payout, 0)
+    stmt = (
+        select(
+            column,
+            func.sum(stake),
+            func.sum(payout),
+            func.sum(payout - stake),
+            func.avg(case((Bet.payout > Bet.stake, 1), else_=0)),
+        )
+        .group_by(column)
+        .order_by(func.sum(payout - stake).desc())
+    )
+    if category == "racing":
+        stmt = stmt.where(Bet.track.isnot(None))
+    elif category == "sport":
+        stmt = stmt.where(Bet.track.is_(None))
+    if sport:
+        stmt = stmt.where(func.lower(Bet.sport) == sport)
+    return session.execute(stmt).all()
+
+
+def timed(callback, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callback()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'benchmark.db'}", future=True)
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            started = time.perf_counter()
+            populate(session, args.rows)
+            print(f"Inserted {args.rows:,} bets in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            rebuild_bet_metrics(session)
+            groups = session.execute(select(func.count()).select_from(models.BetMetric)).scalar_one()
+            print(f"Rebuilt bet_metrics ({groups:,} groups) in {time.perf_counter() - started:.1f}s\n")
+
+            mirror = analytics.DuckDBMirror(Path(workdir) / "analytics.duckdb")
+            started = time.perf_counter()
+            mirror.rebuild(session)
+            print(f"Mirrored bets into DuckDB in {time.perf_counter() - started:.1f}s")
+
+            store = columnar.ColumnarStore()
+            started = time.perf_counter()
+            columnar.load_columnar_store(session, store)
+            print(f"Loaded the columnar store in {time.perf_counter() - started:.1f}s\n")
+
+            print(
+                f"{'dimension':<12} {'category':<8} {'sport':<6} "
+                f"{'bets scan':>12} {'bet_metrics':>12} {'duckdb':>12} {'memory':>12}"
+            )
+            for dimension, category, sport in CASES:
+                scan_ms = timed(lambda: scan_breakdown(session, dimension, category, sport), args.repeat)
+                summary_ms = timed(lambda: breakdown_by(session, dimension, category, sport=sport), args.repeat)
+                analytics.analytics_mirror = mirror
+                try:
+                    duckdb_ms = timed(lambda: breakdown_by(session, dimension, category, sport=sport), args.repeat)
+                finally:
+                    analytics.analytics_mirror = None
+                columnar.columnar_store = store
+                try:
+                    memory_ms = timed(lambda: breakdown_by(session, dimension, category, sport=sport), args.repeat)
+                finally:
+                    columnar.columnar_store = None
+                print(
+                    f"{dimension:<12} {category or '-':<8} {sport or '-':<6} "
+                    f"{scan_ms:>10.1f}ms {summary_ms:>10.1f}ms {duckdb_ms:>10.1f}ms {memory_ms:>10.1f}ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark JSON serialization of large metrics payloads.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.serialization_benchmark --rows 10000 --points 20000
+
+Builds a breakdown of ``--rows`` groups with ``breakdown_row`` and a daily
+timeseries of ``--points`` days with ``cumulative_series``, the shapes the
+metrics endpoints return, and times turning each into a response body:
+
+* ``json`` - ``JSONResponse``, the standard library encoder;
+* ``encoder`` - ``jsonable_encoder`` then ``JSONResponse``, what FastAPI does
+  with a plain dict returned from a route;
+* ``model`` - validating against the route's ``response_model`` and dumping
+  it with pydantic, what FastAPI does when the model is enforced;
+* ``orjson`` - ``app.core.serialization.dumps``, used by the metrics cache;
+* ``cached`` - a ``Response`` around bytes the metrics cache already holds,
+  which is what every request after the first in a data version costs.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.serialization import dumps
+from app.services.metrics_breakdown import breakdown_row
+from app.services.timeseries import cumulative_series
+from benchmarks.breakdown_benchmark import timed
+
+ROW_MODEL = TypeAdapter(list[dict[str, str | float]])
+
+
+def breakdown_payload(rows: int) -> list[dict[str, str | float]]:
+    rng = random.Random(42)
+    payload = []
+    for index in range(rows):
+        stake = rng.uniform(10, 5000)
+        bets = rng.randrange(1, 400)
+        payload.append(breakdown_row(f"Runner {index}", stake, stake * rng.uniform(0, 2), rng.randrange(bets), bets))
+    payload.sort(key=lambda row: row["profit"], reverse=True)
+    return payload
+
+
+def timeseries_payload(points: int) -> list[dict[str, str | float]]:
+    rng = random.Random(42)
+    start = date(1970, 1, 1)
+    return cumulative_series(((start + timedelta(days=day), rng.uniform(-200, 200)) for day in range(points)), "day")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--points", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        "breakdown": breakdown_payload(args.rows),
+        "timeseries": timeseries_payload(args.points),
+    }
+    print(
+        f"{'payload':<11} {'rows':>7} {'bytes':>10} "
+        f"{'json':>10} {'encoder':>10} {'model':>10} {'orjson':>10} {'cached':>10}"
+    )
+    for name, payload in payloads.items():
+        body = dumps(payload)
+        if JSONResponse(payload).body != JSONResponse(ROW_MODEL.validate_python(payload)).body:
+            raise RuntimeError(f"{name}: the response model changes the payload")
+        timings = [
+            timed(lambda: JSONResponse(payload), args.repeat),
+            timed(lambda: JSONResponse(jsonable_encoder(payload)), args.repeat),
+            timed(lambda: ROW_MODEL.dump_json(ROW_MODEL.validate_python(payload)), args.repeat),
+            timed(lambda: Response(dumps(payload), media_type="application/json"), args.repeat),
+            timed(lambda: Response(body, media_type="application/json"), args.repeat),
+        ]
+        print(f"{name:<11} {len(payload):>7,} {len(body):>10,} " + " ".join(f"{ms:>8.2f}ms" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
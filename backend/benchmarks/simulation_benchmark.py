@@ -0,0 +1,77 @@
+"""Benchmark the staking simulator end to end against a synthetic bets table.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.simulation_benchmark --rows 500000
+
+Fills a throwaway SQLite database with ``populate`` from the breakdown
+benchmark and times ``simulate_staking`` for each filter, split into loading
+the bet arrays with ``load_bet_arrays`` and replaying the strategies over
+them with ``strategy_curves``. Loading and the end-to-end total are timed
+reading SQLite and reading the in-memory columnar store.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401 - ensure models are imported for metadata
+from app.core.database import Base
+from app.services import columnar
+from app.services.simulation import load_bet_arrays, simulate_staking, strategy_curves
+from benchmarks.breakdown_benchmark import populate, timed
+
+CASES = [(None, None), ("sport", None), ("sport", "afl"), ("racing", None)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'benchmark.db'}", future=True)
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            started = time.perf_counter()
+            populate(session, args.rows)
+            print(f"Inserted {args.rows:,} bets in {time.perf_counter() - started:.1f}s")
+
+            store = columnar.ColumnarStore()
+            started = time.perf_counter()
+            columnar.load_columnar_store(session, store)
+            print(f"Loaded the columnar store in {time.perf_counter() - started:.1f}s\n")
+
+            print(
+                f"{'category':<8} {'sport':<6} {'bets':>9} {'load sql':>10} {'load mem':>10} "
+                f"{'curves':>10} {'total sql':>10} {'total mem':>10}"
+            )
+            for category, sport in CASES:
+                _, stakes, payouts, odds = load_bet_arrays(session, category, sport)
+                load_ms = timed(lambda: load_bet_arrays(session, category, sport), args.repeat)
+                curves_ms = timed(lambda: strategy_curves(stakes, payouts, odds, 10.0, 1000.0, 0.02), args.repeat)
+                total_ms = timed(lambda: simulate_staking(session, category, sport), args.repeat)
+                expected = simulate_staking(session, category, sport)
+                columnar.columnar_store = store
+                try:
+                    if simulate_staking(session, category, sport) != expected:
+                        raise RuntimeError(f"{category}/{sport}: the columnar store changes the simulation")
+                    memory_load_ms = timed(lambda: load_bet_arrays(session, category, sport), args.repeat)
+                    memory_total_ms = timed(lambda: simulate_staking(session, category, sport), args.repeat)
+                finally:
+                    columnar.columnar_store = None
+                print(
+                    f"{category or '-':<8} {sport or '-':<6} {len(stakes):>9,} {load_ms:>8.1f}ms "
+                    f"{memory_load_ms:>8.1f}ms {curves_ms:>8.1f}ms {total_ms:>8.1f}ms {memory_total_ms:>8.1f}ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Alembic environment bound to the application's engine and metadata."""
+from __future__ import annotations
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from app import models  # noqa: F401 - ensure models are imported for metadata
+from app.core.database import Base, engine
+from app.models.search import include_name
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with_connection(connection)
+        return
+    with engine.connect() as connection:
+        run_with_connection(connection)
+
+
+def run_with_connection(connection) -> None:  # noqa: ANN001
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,169 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 14:16:47.018130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Databases created with ``Base.metadata.create_all`` before migrations
+    existed already hold some of these tables. Those are kept and only what
+    is missing is added, so the later revisions apply on top of them.
+    """
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+
+    if 'bet_metrics' not in existing:
+        op.create_table('bet_metrics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('sport', sa.String(length=128), nullable=True),
+        sa.Column('bet_type', sa.String(length=64), nullable=True),
+        sa.Column('market_type', sa.String(length=64), nullable=True),
+        sa.Column('track', sa.String(length=128), nullable=True),
+        sa.Column('category', sa.String(length=16), nullable=False),
+        sa.Column('day', sa.Date(), nullable=True),
+        sa.Column('bet_count', sa.Integer(), nullable=False),
+        sa.Column('win_count', sa.Integer(), nullable=False),
+        sa.Column('staked_count', sa.Integer(), nullable=False),
+        sa.Column('stake', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.Column('payout', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.Column('profit', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+            batch_op.create_index('ix_bet_metrics_category_day', ['category', 'day'], unique=False)
+            batch_op.create_index(batch_op.f('ix_bet_metrics_day'), ['day'], unique=False)
+
+    if 'sports' not in existing:
+        op.create_table('sports',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('slug', sa.String(length=64), nullable=False),
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.Column('category', sa.String(length=32), nullable=False),
+        sa.Column('is_user_defined', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        with op.batch_alter_table('sports', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_sports_slug'), ['slug'], unique=True)
+
+    if 'uploads' not in existing:
+        op.create_table('uploads',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('original_filename', sa.String(length=512), nullable=False),
+        sa.Column('stored_path', sa.String(length=1024), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=True),
+        sa.Column('deposit_total', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('withdrawal_total', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'bets' not in existing:
+        op.create_table('bets',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('upload_id', sa.String(length=36), nullable=False),
+        sa.Column('bet_id', sa.String(length=128), nullable=False),
+        sa.Column('last_transaction_id', sa.String(length=128), nullable=False),
+        sa.Column('sport', sa.String(length=128), nullable=True),
+        sa.Column('competition', sa.String(length=256), nullable=True),
+        sa.Column('team', sa.String(length=256), nullable=True),
+        sa.Column('opponent', sa.String(length=256), nullable=True),
+        sa.Column('bet_type', sa.String(length=64), nullable=True),
+        sa.Column('market_type', sa.String(length=64), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('track', sa.String(length=128), nullable=True),
+        sa.Column('race', sa.String(length=256), nullable=True),
+        sa.Column('runner_number', sa.String(length=32), nullable=True),
+        sa.Column('runner_name', sa.String(length=256), nullable=True),
+        sa.Column('odds', sa.String(length=64), nullable=True),
+        sa.Column('result', sa.String(length=32), nullable=True),
+        sa.Column('stake', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('payout', sa.DECIMAL(precision=12, scale=2), nullable=True),
+        sa.Column('settled_at', sa.DateTime(), nullable=True),
+        sa.Column('settled_day', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['upload_id'], ['uploads.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('bets', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_bets_bet_id'), ['bet_id'], unique=True)
+            batch_op.create_index(batch_op.f('ix_bets_settled_day'), ['settled_day'], unique=False)
+            batch_op.create_index(batch_op.f('ix_bets_upload_id'), ['upload_id'], unique=False)
+    elif 'settled_day' not in {column['name'] for column in inspector.get_columns('bets')}:
+        # Filled by ``rebuild-metrics``, which derives missing settled days.
+        with op.batch_alter_table('bets', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('settled_day', sa.Date(), nullable=True))
+            batch_op.create_index(batch_op.f('ix_bets_settled_day'), ['settled_day'], unique=False)
+
+    if 'sport_entities' not in existing:
+        op.create_table('sport_entities',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('sport_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=256), nullable=False),
+        sa.Column('entity_type', sa.String(length=32), nullable=True),
+        sa.Column('is_user_defined', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['sport_id'], ['sports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        with op.batch_alter_table('sport_entities', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_sport_entities_sport_id'), ['sport_id'], unique=False)
+
+    if 'sport_aliases' not in existing:
+        op.create_table('sport_aliases',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('alias', sa.String(length=256), nullable=False),
+        sa.Column('normalized_alias', sa.String(length=256), nullable=False),
+        sa.ForeignKeyConstraint(['entity_id'], ['sport_entities.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('sport_aliases', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_sport_aliases_entity_id'), ['entity_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_sport_aliases_normalized_alias'), ['normalized_alias'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sport_aliases', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sport_aliases_normalized_alias'))
+        batch_op.drop_index(batch_op.f('ix_sport_aliases_entity_id'))
+
+    op.drop_table('sport_aliases')
+    with op.batch_alter_table('sport_entities', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sport_entities_sport_id'))
+
+    op.drop_table('sport_entities')
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bets_upload_id'))
+        batch_op.drop_index(batch_op.f('ix_bets_settled_day'))
+        batch_op.drop_index(batch_op.f('ix_bets_bet_id'))
+
+    op.drop_table('bets')
+    op.drop_table('uploads')
+    with op.batch_alter_table('sports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sports_slug'))
+
+    op.drop_table('sports')
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bet_metrics_day'))
+        batch_op.drop_index('ix_bet_metrics_category_day')
+
+    op.drop_table('bet_metrics')
@@ -0,0 +1,61 @@
+"""Breakdown keys
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 14:17:16.917414
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add normalized breakdown keys and covering indexes."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sport_key', sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column('category', sa.String(length=16), nullable=True))
+
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sport_key', sa.String(length=128), nullable=True))
+
+    op.execute(
+        "UPDATE bets SET sport_key = NULLIF(LOWER(TRIM(sport)), ''), "
+        "category = CASE WHEN track IS NOT NULL THEN 'racing' ELSE 'sport' END"
+    )
+    op.execute("UPDATE bet_metrics SET sport_key = NULLIF(LOWER(TRIM(sport)), '')")
+
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.create_index('ix_bets_category_sport_key', ['category', 'sport_key'], unique=False)
+
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        for dimension in ('sport', 'bet_type', 'market_type', 'track'):
+            batch_op.create_index(
+                f'ix_bet_metrics_breakdown_{dimension}',
+                ['category', 'sport_key', dimension, 'bet_count', 'win_count', 'stake', 'payout', 'profit'],
+                unique=False,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_index('ix_bets_category_sport_key')
+        batch_op.drop_column('category')
+        batch_op.drop_column('sport_key')
+
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        batch_op.drop_index('ix_bet_metrics_breakdown_track')
+        batch_op.drop_index('ix_bet_metrics_breakdown_sport')
+        batch_op.drop_index('ix_bet_metrics_breakdown_market_type')
+        batch_op.drop_index('ix_bet_metrics_breakdown_bet_type')
+        batch_op.drop_column('sport_key')
+
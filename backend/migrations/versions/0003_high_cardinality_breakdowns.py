@@ -0,0 +1,37 @@
+"""High-cardinality breakdown indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:02:11.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIMENSIONS = ('team', 'opponent', 'competition', 'runner_name')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        for dimension in DIMENSIONS:
+            batch_op.create_index(
+                f'ix_bets_breakdown_{dimension}',
+                ['category', 'sport_key', dimension, 'stake', 'payout'],
+                unique=False,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        for dimension in reversed(DIMENSIONS):
+            batch_op.drop_index(f'ix_bets_breakdown_{dimension}')
@@ -0,0 +1,68 @@
+"""Bet participants
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 15:40:27.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RESOLVED_NAMES = (
+    "WITH names AS ("
+    "SELECT LOWER(sports.name) AS sport, LOWER(sport_entities.name) AS name, sport_entities.id AS entity_id "
+    "FROM sport_entities JOIN sports ON sports.id = sport_entities.sport_id "
+    "UNION "
+    "SELECT LOWER(sports.name), LOWER(sport_aliases.normalized_alias), sport_aliases.entity_id "
+    "FROM sport_aliases JOIN sport_entities ON sport_entities.id = sport_aliases.entity_id "
+    "JOIN sports ON sports.id = sport_entities.sport_id"
+    "), resolved AS ("
+    "SELECT sport, name, MIN(entity_id) AS entity_id FROM names "
+    "GROUP BY sport, name HAVING COUNT(DISTINCT entity_id) = 1"
+    ")"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bet_participants',
+    sa.Column('bet_id', sa.Integer(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=16), nullable=False),
+    sa.ForeignKeyConstraint(['bet_id'], ['bets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['entity_id'], ['sport_entities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bet_id', 'entity_id', 'role')
+    )
+    with op.batch_alter_table('bet_participants', schema=None) as batch_op:
+        batch_op.create_index('ix_bet_participants_entity_id_bet_id', ['entity_id', 'bet_id'], unique=False)
+
+    # Link existing bets the way ingestion does: team names and aliases are
+    # matched within the bet's sport, and names that several entities of a
+    # sport answer to are skipped.
+    for role in ('team', 'opponent'):
+        op.execute(
+            f"{RESOLVED_NAMES} "
+            "INSERT INTO bet_participants (bet_id, entity_id, role) "
+            f"SELECT bets.id, resolved.entity_id, '{role}' FROM bets "
+            "JOIN resolved ON resolved.sport = LOWER(TRIM(bets.sport)) "
+            f"AND resolved.name = LOWER(TRIM(bets.{role})) "
+            "WHERE NOT EXISTS (SELECT 1 FROM bet_participants AS linked "
+            "WHERE linked.bet_id = bets.id AND linked.entity_id = resolved.entity_id)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bet_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_bet_participants_entity_id_bet_id')
+
+    op.drop_table('bet_participants')
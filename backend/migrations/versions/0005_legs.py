@@ -0,0 +1,51 @@
+"""Legs table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 14:24:44.256473
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('legs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bet_id', sa.Integer(), nullable=False),
+    sa.Column('leg_number', sa.Integer(), nullable=False),
+    sa.Column('sport', sa.String(length=128), nullable=True),
+    sa.Column('event', sa.String(length=256), nullable=True),
+    sa.Column('team', sa.String(length=256), nullable=True),
+    sa.Column('market_type', sa.String(length=128), nullable=True),
+    sa.Column('selection', sa.Text(), nullable=True),
+    sa.Column('odds', sa.String(length=64), nullable=True),
+    sa.Column('result', sa.String(length=32), nullable=True),
+    sa.ForeignKeyConstraint(['bet_id'], ['bets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('legs', schema=None) as batch_op:
+        batch_op.create_index('ix_legs_bet_id_leg_number', ['bet_id', 'leg_number'], unique=True)
+        batch_op.create_index('ix_legs_sport_market_type', ['sport', 'market_type'], unique=False)
+        batch_op.create_index('ix_legs_team', ['team'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('legs', schema=None) as batch_op:
+        batch_op.drop_index('ix_legs_team')
+        batch_op.drop_index('ix_legs_sport_market_type')
+        batch_op.drop_index('ix_legs_bet_id_leg_number')
+
+    op.drop_table('legs')
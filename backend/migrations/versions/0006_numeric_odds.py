@@ -0,0 +1,92 @@
+"""Numeric odds columns
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:26:41.234915
+
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def decimal_odds(odds):
+    """"12.00" or fractional "5/2" odds as decimal odds, as ingestion computed them at this revision."""
+    if not odds:
+        return None
+    try:
+        if '/' in odds:
+            numerator, denominator = odds.split('/', 1)
+            value = Decimal(numerator) / Decimal(denominator) + 1
+        else:
+            value = Decimal(odds)
+    except (InvalidOperation, ZeroDivisionError):
+        return None
+    if not value.is_finite() or value <= 1:
+        return None
+    return value.quantize(Decimal('0.0001'))
+
+
+def upgrade() -> None:
+    """Add numeric decimal odds and implied probability to bets."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('decimal_odds', sa.DECIMAL(precision=10, scale=4), nullable=True))
+        batch_op.add_column(sa.Column('implied_probability', sa.DECIMAL(precision=7, scale=6), nullable=True))
+        batch_op.create_index(batch_op.f('ix_bets_decimal_odds'), ['decimal_odds'], unique=False)
+        batch_op.create_index(batch_op.f('ix_bets_implied_probability'), ['implied_probability'], unique=False)
+
+    # Fractional odds cannot be converted portably in SQL, so backfill in
+    # Python, walking the bets by id one batch at a time.
+    bind = op.get_bind()
+    bets = sa.table(
+        'bets',
+        sa.column('id', sa.Integer()),
+        sa.column('odds', sa.String()),
+        sa.column('decimal_odds', sa.DECIMAL(precision=10, scale=4)),
+        sa.column('implied_probability', sa.DECIMAL(precision=7, scale=6)),
+    )
+    update = (
+        bets.update()
+        .where(bets.c.id == sa.bindparam('bet_id'))
+        .values(decimal_odds=sa.bindparam('decimal_odds'), implied_probability=sa.bindparam('implied_probability'))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(bets.c.id, bets.c.odds)
+            .where(bets.c.id > last_id, bets.c.odds.isnot(None))
+            .order_by(bets.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        updates = []
+        for bet_id, odds in rows:
+            value = decimal_odds(odds)
+            if value is not None:
+                probability = (1 / value).quantize(Decimal('0.000001'))
+                updates.append({'bet_id': bet_id, 'decimal_odds': value, 'implied_probability': probability})
+        if updates:
+            bind.execute(update, updates)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bets_implied_probability'))
+        batch_op.drop_index(batch_op.f('ix_bets_decimal_odds'))
+        batch_op.drop_column('implied_probability')
+        batch_op.drop_column('decimal_odds')
+
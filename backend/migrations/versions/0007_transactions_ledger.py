@@ -0,0 +1,50 @@
+"""Transactions ledger
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 14:28:24.973634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('transaction_id', sa.String(length=128), nullable=False),
+    sa.Column('upload_id', sa.String(length=36), nullable=False),
+    sa.Column('type', sa.String(length=32), nullable=False),
+    sa.Column('amount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('balance', sa.DECIMAL(precision=12, scale=2), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['upload_id'], ['uploads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_day_occurred_at', ['day', 'occurred_at', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transactions_transaction_id'), ['transaction_id'], unique=True)
+        batch_op.create_index('ix_transactions_type_amount', ['type', 'amount'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transactions_upload_id'), ['upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_transactions_upload_id'))
+        batch_op.drop_index('ix_transactions_type_amount')
+        batch_op.drop_index(batch_op.f('ix_transactions_transaction_id'))
+        batch_op.drop_index('ix_transactions_day_occurred_at')
+
+    op.drop_table('transactions')
@@ -0,0 +1,38 @@
+"""Highlights snapshot
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 14:29:32.672440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('metric_snapshots',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.create_index('ix_bets_settled_at_id', ['settled_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_index('ix_bets_settled_at_id')
+
+    op.drop_table('metric_snapshots')
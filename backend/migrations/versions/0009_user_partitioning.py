@@ -0,0 +1,132 @@
+"""User partitioning
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 14:54:35.185594
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BET_METRIC_DIMENSIONS = ('bet_type', 'market_type', 'sport', 'track')
+BET_DIMENSIONS = ('competition', 'opponent', 'runner_name', 'team')
+
+
+def upgrade() -> None:
+    """Scope uploads, bets, transactions and aggregates by user."""
+    op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Existing rows are assigned to the default user through the column server defaults.
+    op.execute("INSERT INTO users (id, created_at) VALUES ('local', CURRENT_TIMESTAMP)")
+
+    with op.batch_alter_table('uploads', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.String(length=36), server_default='local', nullable=False))
+        batch_op.create_index('ix_uploads_user_id_created_at', ['user_id', 'created_at'], unique=False)
+        batch_op.create_foreign_key('fk_uploads_user_id_users', 'users', ['user_id'], ['id'])
+
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.String(length=36), server_default='local', nullable=False))
+        batch_op.drop_index('ix_bets_bet_id')
+        batch_op.drop_index('ix_bets_category_sport_key')
+        batch_op.drop_index('ix_bets_settled_at_id')
+        for dimension in BET_DIMENSIONS:
+            batch_op.drop_index(f'ix_bets_breakdown_{dimension}')
+            batch_op.create_index(f'ix_bets_breakdown_{dimension}', ['user_id', 'category', 'sport_key', dimension, 'stake', 'payout'], unique=False)
+        batch_op.create_index('ix_bets_user_id_category_sport_key', ['user_id', 'category', 'sport_key'], unique=False)
+        batch_op.create_index('ix_bets_user_id_settled_at_id', ['user_id', 'settled_at', 'id'], unique=False)
+        batch_op.create_unique_constraint('uq_bets_user_id_bet_id', ['user_id', 'bet_id'])
+        batch_op.create_foreign_key('fk_bets_user_id_users', 'users', ['user_id'], ['id'])
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.String(length=36), server_default='local', nullable=False))
+        batch_op.drop_index('ix_transactions_day_occurred_at')
+        batch_op.drop_index('ix_transactions_transaction_id')
+        batch_op.drop_index('ix_transactions_type_amount')
+        batch_op.create_index('ix_transactions_user_id_day_occurred_at', ['user_id', 'day', 'occurred_at', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_user_id_type_amount', ['user_id', 'type', 'amount'], unique=False)
+        batch_op.create_unique_constraint('uq_transactions_user_id_transaction_id', ['user_id', 'transaction_id'])
+        batch_op.create_foreign_key('fk_transactions_user_id_users', 'users', ['user_id'], ['id'])
+
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.String(length=36), server_default='local', nullable=False))
+        batch_op.drop_index('ix_bet_metrics_category_day')
+        batch_op.drop_index('ix_bet_metrics_day')
+        for dimension in BET_METRIC_DIMENSIONS:
+            batch_op.drop_index(f'ix_bet_metrics_breakdown_{dimension}')
+            batch_op.create_index(f'ix_bet_metrics_breakdown_{dimension}', ['user_id', 'category', 'sport_key', dimension, 'bet_count', 'win_count', 'stake', 'payout', 'profit'], unique=False)
+        batch_op.create_index('ix_bet_metrics_user_id_category_day', ['user_id', 'category', 'day'], unique=False)
+        batch_op.create_foreign_key('fk_bet_metrics_user_id_users', 'users', ['user_id'], ['id'])
+
+    # Snapshots are recomputed on the next ingest, so the table is recreated with its new key.
+    op.drop_table('metric_snapshots')
+    op.create_table('metric_snapshots',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_metric_snapshots_user_id_users'),
+    sa.PrimaryKeyConstraint('user_id', 'name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('metric_snapshots')
+    op.create_table('metric_snapshots',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    with op.batch_alter_table('bet_metrics', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_bet_metrics_user_id_users', type_='foreignkey')
+        batch_op.drop_index('ix_bet_metrics_user_id_category_day')
+        for dimension in BET_METRIC_DIMENSIONS:
+            batch_op.drop_index(f'ix_bet_metrics_breakdown_{dimension}')
+            batch_op.create_index(f'ix_bet_metrics_breakdown_{dimension}', ['category', 'sport_key', dimension, 'bet_count', 'win_count', 'stake', 'payout', 'profit'], unique=False)
+        batch_op.create_index('ix_bet_metrics_day', ['day'], unique=False)
+        batch_op.create_index('ix_bet_metrics_category_day', ['category', 'day'], unique=False)
+        batch_op.drop_column('user_id')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_transactions_user_id_users', type_='foreignkey')
+        batch_op.drop_constraint('uq_transactions_user_id_transaction_id', type_='unique')
+        batch_op.drop_index('ix_transactions_user_id_type_amount')
+        batch_op.drop_index('ix_transactions_user_id_day_occurred_at')
+        batch_op.create_index('ix_transactions_type_amount', ['type', 'amount'], unique=False)
+        batch_op.create_index('ix_transactions_transaction_id', ['transaction_id'], unique=True)
+        batch_op.create_index('ix_transactions_day_occurred_at', ['day', 'occurred_at', 'id'], unique=False)
+        batch_op.drop_column('user_id')
+
+    with op.batch_alter_table('bets', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_bets_user_id_users', type_='foreignkey')
+        batch_op.drop_constraint('uq_bets_user_id_bet_id', type_='unique')
+        batch_op.drop_index('ix_bets_user_id_settled_at_id')
+        batch_op.drop_index('ix_bets_user_id_category_sport_key')
+        for dimension in BET_DIMENSIONS:
+            batch_op.drop_index(f'ix_bets_breakdown_{dimension}')
+            batch_op.create_index(f'ix_bets_breakdown_{dimension}', ['category', 'sport_key', dimension, 'stake', 'payout'], unique=False)
+        batch_op.create_index('ix_bets_settled_at_id', ['settled_at', 'id'], unique=False)
+        batch_op.create_index('ix_bets_category_sport_key', ['category', 'sport_key'], unique=False)
+        batch_op.create_index('ix_bets_bet_id', ['bet_id'], unique=True)
+        batch_op.drop_column('user_id')
+
+    with op.batch_alter_table('uploads', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_uploads_user_id_users', type_='foreignkey')
+        batch_op.drop_index('ix_uploads_user_id_created_at')
+        batch_op.drop_column('user_id')
+
+    op.drop_table('users')
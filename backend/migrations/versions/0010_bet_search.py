@@ -0,0 +1,49 @@
+"""Full-text search over bets
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 16:02:18.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the bets_fts index and fill it from the existing bets."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bets_fts USING fts5(description, runner_name, team, track, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute("DELETE FROM bets_fts")
+        op.execute(
+            "INSERT INTO bets_fts (rowid, description, runner_name, team, track) "
+            "SELECT id, description, runner_name, team, track FROM bets"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS bets_fts ("
+            "id INTEGER PRIMARY KEY REFERENCES bets (id) ON DELETE CASCADE, document TSVECTOR NOT NULL)"
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_bets_fts_document ON bets_fts USING GIN (document)")
+        op.execute(
+            "INSERT INTO bets_fts (id, document) "
+            "SELECT id, to_tsvector('simple', concat_ws(' ', description, runner_name, team, track)) FROM bets "
+            "ON CONFLICT (id) DO UPDATE SET document = excluded.document"
+        )
+
+
+def downgrade() -> None:
+    """Drop the bets_fts index."""
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute("DROP TABLE IF EXISTS bets_fts")
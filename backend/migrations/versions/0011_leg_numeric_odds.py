@@ -0,0 +1,83 @@
+"""Numeric leg odds
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 17:41:09.552871
+
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def decimal_odds(odds):
+    """"12.00" or fractional "5/2" odds as decimal odds, as ingestion computed them at this revision."""
+    if not odds:
+        return None
+    try:
+        if '/' in odds:
+            numerator, denominator = odds.split('/', 1)
+            value = Decimal(numerator) / Decimal(denominator) + 1
+        else:
+            value = Decimal(odds)
+    except (InvalidOperation, ZeroDivisionError):
+        return None
+    if not value.is_finite() or value <= 1:
+        return None
+    return value.quantize(Decimal('0.0001'))
+
+
+def upgrade() -> None:
+    """Add numeric decimal odds to legs, as 0006 did for bets."""
+    with op.batch_alter_table('legs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('decimal_odds', sa.DECIMAL(precision=10, scale=4), nullable=True))
+        batch_op.create_index(batch_op.f('ix_legs_decimal_odds'), ['decimal_odds'], unique=False)
+
+    bind = op.get_bind()
+    legs = sa.table(
+        'legs',
+        sa.column('id', sa.Integer()),
+        sa.column('odds', sa.String()),
+        sa.column('decimal_odds', sa.DECIMAL(precision=10, scale=4)),
+    )
+    update = (
+        legs.update()
+        .where(legs.c.id == sa.bindparam('leg_id'))
+        .values(decimal_odds=sa.bindparam('decimal_odds'))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(legs.c.id, legs.c.odds)
+            .where(legs.c.id > last_id, legs.c.odds.isnot(None))
+            .order_by(legs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        updates = [
+            {'leg_id': leg_id, 'decimal_odds': value}
+            for leg_id, odds in rows
+            if (value := decimal_odds(odds)) is not None
+        ]
+        if updates:
+            bind.execute(update, updates)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('legs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_legs_decimal_odds'))
+        batch_op.drop_column('decimal_odds')
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401 - register tables on Base.metadata
+from app.core.database import Base
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def engine(database_path):
+    engine = create_engine(f"sqlite:///{database_path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, database_path):
+    """An aiosqlite engine over the same file the sync ``db`` fixture writes."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False, future=True)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def query_counter(engine, async_engine):
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        statements.append(statement)
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _record)
+    yield statements
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def client(db, engine, async_engine, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.core import database
+    from app.core.database import get_async_session, get_session
+    from app.main import app
+    from app.services.metrics_cache import metrics_cache
+
+    sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def _override_session():
+        yield db
+
+    async def _override_async_session():
+        async with sessions() as session:
+            yield session
+
+    metrics_cache.bump_version()
+    app.dependency_overrides[get_session] = _override_session
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=engine, autoflush=False, future=True))
+    app.dependency_overrides[get_async_session] = _override_async_session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        metrics_cache.bump_version()
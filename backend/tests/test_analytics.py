@@ -0,0 +1,168 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID
+from app.services import analytics, columnar
+from app.services.analytics import DuckDBMirror, refresh_analytics
+from app.services.columnar import ColumnarStore, load_columnar_store
+from app.services.dashboard import dashboard_payload
+from app.services.ingestion_service import upsert_bets
+from app.services.metrics_breakdown import (
+    breakdown_cube,
+    breakdown_payload,
+    ranked_breakdown,
+)
+from app.services.metrics_service import get_overview_metrics
+from app.services.timeseries import fetch_profit_timeseries
+
+
+def seed(db, upload_id, bets, user_id=DEFAULT_USER_ID):
+    upload = Upload(id=upload_id, user_id=user_id, original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    upsert_bets(db, upload, bet_payloads(bets))
+
+
+def bet_payloads(bets):
+    return {
+        bet_id: {
+            "last_transaction_id": bet_id,
+            "sport": sport,
+            "bet_type": "Single",
+            "market_type": market,
+            "team": team,
+            "stake": Decimal(stake),
+            "payout": Decimal(payout),
+            "occurred_at": datetime(2024, 1, day, 12),
+        }
+        for bet_id, (sport, market, team, stake, payout, day) in bets.items()
+    }
+
+
+def snapshot(db):
+    return (
+        breakdown_payload(db, "sport"),
+        breakdown_payload(db, "market_type", category="sport", sport="afl"),
+        breakdown_cube(db, ("sport", "sport:market_type")),
+        ranked_breakdown(db, "team", limit=1),
+        get_overview_metrics(db),
+        fetch_profit_timeseries(db, granularity="week"),
+        breakdown_cube(db, ("sport", "sport:market_type"), user_id="alice"),
+        dashboard_payload(db),
+    )
+
+
+def test_duckdb_mirror_matches_sqlite_aggregates(db, tmp_path, monkeypatch):
+    seed(
+        db,
+        "u1",
+        {
+            "b1": ("AFL", "Head to Head", "Collingwood", "10", "25", 1),
+            "b2": ("AFL", "Line", "Geelong", "20", "0", 2),
+            "b3": ("NRL", "Head to Head", "Broncos", "5", "9.50", 9),
+            "b4": (None, None, None, "4", "0", 10),
+        },
+    )
+    mirror = DuckDBMirror(tmp_path / "analytics.duckdb")
+    mirror.ensure_synced(db)
+    expected = snapshot(db)
+
+    monkeypatch.setattr(analytics, "analytics_mirror", mirror)
+    assert snapshot(db) == expected
+
+    seed(db, "u2", {"b2": ("AFL", "Line", "Geelong", "20", "44", 2), "b5": ("NRL", "Line", "Storm", "8", "0", 3)})
+    seed(db, "u3", {"b2": ("AFL", "Line", "Geelong", "7", "14", 4)}, user_id="alice")
+    mirror.sync_upload(db, "u2")
+    mirror.sync_upload(db, "u3")
+    mirrored = snapshot(db)
+
+    monkeypatch.setattr(analytics, "analytics_mirror", None)
+    assert mirrored == snapshot(db)
+
+
+def test_duckdb_mirror_rebuilds_after_a_missed_reprocess(db, tmp_path, monkeypatch):
+    seed(db, "u1", {"b1": ("AFL", "Head to Head", "Collingwood", "10", "25", 1)})
+    mark_processed(db, "u1", datetime(2024, 2, 1))
+    DuckDBMirror(tmp_path / "analytics.duckdb").ensure_synced(db)
+
+    # The upload is reprocessed while the mirror is not listening: same rows, new amounts.
+    reprocessed = bet_payloads({"b1": ("AFL", "Head to Head", "Collingwood", "10", "0", 1)})
+    upsert_bets(db, db.get(Upload, "u1"), {"b1": {**reprocessed["b1"], "last_transaction_id": "t2"}})
+    mark_processed(db, "u1", datetime(2024, 2, 2))
+    expected = snapshot(db)
+
+    mirror = DuckDBMirror(tmp_path / "analytics.duckdb")
+    mirror.ensure_synced(db)
+    monkeypatch.setattr(analytics, "analytics_mirror", mirror)
+
+    assert snapshot(db) == expected
+
+
+def test_columnar_store_matches_sqlite_aggregates(db, monkeypatch):
+    seed(
+        db,
+        "u1",
+        {
+            "b1": ("AFL", "Head to Head", "Collingwood", "10", "25", 1),
+            "b2": ("AFL", "Line", "Geelong", "20", "0", 2),
+            "b3": ("NRL", "Head to Head", "Broncos", "5", "9.50", 9),
+            "b4": (None, None, None, "4", "0", 10),
+        },
+    )
+    seed(db, "u2", {"b2": ("AFL", "Line", "Geelong", "20", "44", 2), "b5": ("NRL", "Line", "Storm", "8", "0", 3)})
+    seed(db, "u3", {"b2": ("AFL", "Line", "Geelong", "7", "14", 4)}, user_id="alice")
+    expected = columnar_snapshot(db)
+
+    store = ColumnarStore(capacity=2)
+    load_columnar_store(db, store, "u1")
+    load_columnar_store(db, store, "u2")
+    load_columnar_store(db, store, "u3")
+    monkeypatch.setattr(columnar, "columnar_store", store)
+
+    assert len(store) == 6
+    assert columnar_snapshot(db) == expected
+
+
+def test_columnar_store_catches_up_with_uploads_processed_elsewhere(db, monkeypatch):
+    seed(db, "u1", {"b1": ("AFL", "Head to Head", "Collingwood", "10", "25", 1)})
+    mark_processed(db, "u1", datetime(2024, 2, 1))
+    store = ColumnarStore()
+    load_columnar_store(db, store)
+    monkeypatch.setattr(columnar, "columnar_store", store)
+
+    # Another worker ingests an upload and reprocesses the first one.
+    seed(db, "u2", {"b2": ("NRL", "Line", "Storm", "8", "0", 3)})
+    mark_processed(db, "u2", datetime(2024, 2, 2))
+    reprocessed = bet_payloads({"b1": ("AFL", "Head to Head", "Collingwood", "10", "0", 1)})
+    upsert_bets(db, db.get(Upload, "u1"), {"b1": {**reprocessed["b1"], "last_transaction_id": "t2"}})
+    mark_processed(db, "u1", datetime(2024, 2, 3))
+    assert len(store) == 1
+
+    refresh_analytics(db)
+
+    assert len(store) == 2
+    with_store = get_overview_metrics(db)
+    monkeypatch.setattr(columnar, "columnar_store", None)
+    assert with_store == get_overview_metrics(db)
+
+
+def mark_processed(db, upload_id, processed_at):
+    upload = db.get(Upload, upload_id)
+    upload.status = "processed"
+    upload.processed_at = processed_at
+    db.commit()
+
+
+def columnar_snapshot(db):
+    return (
+        breakdown_payload(db, "sport"),
+        breakdown_payload(db, "market_type", sport="afl"),
+        breakdown_payload(db, "track", category="racing"),
+        breakdown_cube(db, ("sport", "sport:market_type"), category="sport"),
+        get_overview_metrics(db),
+        fetch_profit_timeseries(db, granularity="week"),
+        fetch_profit_timeseries(db, date_from=date(2024, 1, 2), date_to=date(2024, 1, 9)),
+        get_overview_metrics(db, user_id="alice"),
+        dashboard_payload(db),
+    )
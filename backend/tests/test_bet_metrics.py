@@ -0,0 +1,161 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event, select
+
+from app.models.metrics import BetMetric
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID
+from app.services.bet_metrics import row_key
+from app.services.ingestion_service import upsert_bets
+from app.services.metrics_breakdown import breakdown_by, breakdown_cube
+from app.services.timeseries import fetch_profit_timeseries, settled_day
+
+
+def make_upload(db, upload_id):
+    upload = Upload(id=upload_id, original_filename=f"{upload_id}.csv", stored_path=f"{upload_id}.csv")
+    db.add(upload)
+    db.commit()
+    return upload
+
+
+def payload(stake, payout, occurred_at, **fields):
+    return {
+        "last_transaction_id": "t",
+        "bet_type": "Single",
+        "stake": Decimal(stake),
+        "payout": Decimal(payout),
+        "occurred_at": occurred_at,
+        **fields,
+    }
+
+
+def test_upsert_bets_maintains_bet_metrics_deltas(db):
+    first = make_upload(db, "u1")
+    upsert_bets(
+        db,
+        first,
+        {
+            "b1": payload("10", "0", datetime(2024, 1, 1, 12), sport="AFL"),
+            "b2": payload("5", "12", datetime(2024, 1, 2, 12), sport="NRL"),
+        },
+    )
+
+    second = make_upload(db, "u2")
+    upsert_bets(
+        db,
+        second,
+        {
+            "b1": payload("10", "30", datetime(2024, 1, 1, 12), sport="AFL"),
+            "b3": payload("4", "0", datetime(2024, 1, 2, 18), track="Flemington", sport="Racing"),
+        },
+    )
+
+    rows = db.execute(select(BetMetric)).scalars().all()
+    assert sum(row.bet_count for row in rows) == 3
+    assert sum(row.win_count for row in rows) == 2
+    assert sum(row.profit for row in rows) == Decimal("23")
+
+    sports = {row.key: row for row in breakdown_by(db, "sport", category="sport")}
+    assert sports["AFL"].profit == 20.0
+    assert sports["AFL"].win_rate == 1.0
+    assert "Racing" not in sports
+
+    series = fetch_profit_timeseries(db)
+    assert series == [
+        {"date": "2024-01-01", "profit": 20.0, "cumulative": 20.0},
+        {"date": "2024-01-02", "profit": 3.0, "cumulative": 23.0},
+    ]
+
+
+def test_bet_metrics_drop_emptied_groups(db):
+    first = make_upload(db, "u1")
+    upsert_bets(db, first, {"b1": payload("10", "0", datetime(2024, 1, 1), sport="AFL")})
+
+    second = make_upload(db, "u2")
+    upsert_bets(db, second, {"b1": payload("10", "0", datetime(2024, 1, 1), sport="Cricket")})
+
+    rows = db.execute(select(BetMetric)).scalars().all()
+    assert [(row.sport, row.bet_count) for row in rows] == [("Cricket", 1)]
+
+
+def test_bet_metrics_flush_loads_only_the_changed_groups(db):
+    first = make_upload(db, "u1")
+    upsert_bets(
+        db,
+        first,
+        {f"b{day}": payload("10", "0", datetime(2024, 1, day), sport="AFL") for day in range(1, 29)},
+    )
+    second = make_upload(db, "u2")
+    loaded = []
+
+    def record(row, _context):
+        loaded.append(row_key(row))
+
+    event.listen(BetMetric, "load", record)
+    try:
+        upsert_bets(db, second, {"b3": payload("10", "25", datetime(2024, 1, 3), sport="AFL")})
+    finally:
+        event.remove(BetMetric, "load", record)
+
+    assert loaded == [(DEFAULT_USER_ID, "AFL", "Single", None, None, "sport", date(2024, 1, 3))]
+    rows = db.execute(select(BetMetric).where(BetMetric.day == date(2024, 1, 3))).scalars().all()
+    assert [(row.bet_count, row.win_count, row.profit) for row in rows] == [(1, 1, Decimal("15"))]
+
+
+def test_profit_timeseries_rolls_up_weeks_and_months_within_range(db):
+    upload = make_upload(db, "u1")
+    upsert_bets(
+        db,
+        upload,
+        {
+            "b1": payload("10", "0", datetime(2024, 1, 29, 9), sport="AFL"),
+            "b2": payload("10", "25", datetime(2024, 1, 31, 9), sport="AFL"),
+            "b3": payload("5", "0", datetime(2024, 2, 2, 9), sport="AFL"),
+            "b4": payload("5", "0", datetime(2024, 3, 1, 9), sport="AFL"),
+        },
+    )
+
+    weekly = fetch_profit_timeseries(db, granularity="week", date_to=date(2024, 2, 29))
+    assert weekly == [{"date": "2024-01-29", "profit": 0.0, "cumulative": 0.0}]
+
+    monthly = fetch_profit_timeseries(db, granularity="month", date_from=date(2024, 1, 30))
+    assert monthly == [
+        {"date": "2024-01-01", "profit": 15.0, "cumulative": 15.0},
+        {"date": "2024-02-01", "profit": -5.0, "cumulative": 10.0},
+        {"date": "2024-03-01", "profit": -5.0, "cumulative": 5.0},
+    ]
+
+
+def test_settled_day_buckets_in_reporting_timezone():
+    assert settled_day(datetime(2024, 1, 1, 23, 30)) == date(2024, 1, 1)
+    assert settled_day(None, datetime(2024, 1, 1, 15, 0)) == date(2024, 1, 2)
+    assert settled_day(None) is None
+
+
+def test_breakdown_cube_matches_individual_breakdowns_in_one_query(db, query_counter):
+    upload = make_upload(db, "u1")
+    upsert_bets(
+        db,
+        upload,
+        {
+            "b1": payload("10", "30", datetime(2024, 1, 1), sport="AFL", bet_type="Single", market_type="Line"),
+            "b2": payload("10", "0", datetime(2024, 1, 1), sport="AFL", bet_type="Multi", market_type="Line"),
+            "b3": payload("5", "0", datetime(2024, 1, 2), sport="NRL", bet_type="Single", market_type="Total"),
+        },
+    )
+    query_counter.clear()
+
+    cube = breakdown_cube(db, ("sport", "market_type", "sport:bet_type"))
+
+    assert len(query_counter) == 1
+    for dimension in ("sport", "market_type"):
+        expected = [
+            (row.key, row.stake, row.profit, row.win_rate) for row in breakdown_by(db, dimension)
+        ]
+        assert [(row["key"], row["stake"], row["profit"], row["win_rate"]) for row in cube[dimension]] == expected
+    assert [(row["parent"], row["key"], row["profit"]) for row in cube["sport:bet_type"]] == [
+        ("AFL", "Single", 20.0),
+        ("NRL", "Single", -5.0),
+        ("AFL", "Multi", -10.0),
+    ]
@@ -0,0 +1,73 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.upload import Upload
+from app.models.user import User
+from app.services.ingestion_service import upsert_bets
+
+
+def seed(db, upload_id="u1", user_id="local", **bets):
+    if db.get(User, user_id) is None:
+        db.add(User(id=user_id))
+        db.flush()
+    upload = Upload(
+        id=upload_id,
+        original_filename="a.csv",
+        stored_path="a.csv",
+        created_at=datetime(2024, 2, 1),
+        user_id=user_id,
+    )
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            bet_id: {"last_transaction_id": bet_id, "stake": Decimal("10"), "payout": Decimal("0"), **columns}
+            for bet_id, columns in bets.items()
+        },
+    )
+
+
+def test_search_ranks_prefix_matches_and_totals_them(client, db):
+    seed(
+        db,
+        b1={"summary": "Flemington R7 Win Buckaroo", "runner_name": "Buckaroo", "track": "Flemington", "payout": Decimal("32.50")},
+        b2={"summary": "Flemington R3 Place Starlight", "runner_name": "Starlight", "track": "Flemington"},
+        b3={"summary": "Collingwood v Carlton Head to Head", "team": "Collingwood"},
+    )
+
+    found = client.get("/bets/search", params={"q": "bucka"}).json()
+    assert [bet["bet_id"] for bet in found["bets"]] == ["b1"]
+    assert found["summary"] == {
+        "bets": 1,
+        "key": "bucka",
+        "stake": 10.0,
+        "payout": 32.5,
+        "profit": 22.5,
+        "roi": 2.25,
+        "win_rate": 1.0,
+    }
+
+    flemington = client.get("/bets/search", params={"q": "flemington", "limit": 1}).json()
+    assert len(flemington["bets"]) == 1
+    assert flemington["summary"]["bets"] == 2
+    assert flemington["summary"]["profit"] == 12.5
+
+    both = client.get("/bets/search", params={"q": "Flemington R7"}).json()
+    assert [bet["bet_id"] for bet in both["bets"]] == ["b1"]
+
+    assert client.get("/bets/search", params={"q": "wanderers"}).json()["summary"]["bets"] == 0
+    assert client.get("/bets/search", params={"q": "!!"}).status_code == 400
+
+
+def test_search_follows_reuploads_and_users(client, db):
+    seed(db, b1={"summary": "Win Buckaroo", "runner_name": "Buckaroo"})
+    seed(db, upload_id="u2", b1={"summary": "Win Starlight", "runner_name": "Starlight"})
+    seed(db, upload_id="u3", user_id="alice", b1={"summary": "Win Buckaroo", "runner_name": "Buckaroo"})
+
+    assert client.get("/bets/search", params={"q": "buckaroo"}).json()["bets"] == []
+    assert [bet["bet_id"] for bet in client.get("/bets/search", params={"q": "starlight"}).json()["bets"]] == ["b1"]
+
+    alice = client.get("/bets/search", params={"q": "buckaroo"}, headers={"X-User-Id": "alice"}).json()
+    assert [bet["upload_id"] for bet in alice["bets"]] == ["u3"]
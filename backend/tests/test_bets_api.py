@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.upload import Upload
+from app.services.bet_export import EXPORT_COLUMNS
+from app.services.ingestion_service import upsert_bets
+
+
+def seed_bets(db, count=25):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv", created_at=datetime(2024, 2, 1))
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            f"b{index}": {
+                "last_transaction_id": str(index),
+                "sport": "AFL" if index % 2 else "NRL",
+                "stake": Decimal("10"),
+                "payout": Decimal("15.50"),
+                # Every fifth bet has no settlement time; others share timestamps in pairs.
+                "occurred_at": None if index % 5 == 0 else datetime(2024, 1, 1 + index // 2, 12),
+            }
+            for index in range(count)
+        },
+    )
+
+
+def test_bets_pages_by_keyset_without_gaps(client, db):
+    seed_bets(db)
+
+    seen, params = [], {"limit": 4}
+    while True:
+        page = client.get("/bets", params=params).json()
+        if not page:
+            break
+        seen.extend(bet["bet_id"] for bet in page)
+        last = page[-1]
+        params = {"limit": 4, "after_id": last["id"]}
+        if last["settled_at"] is not None:
+            params["after_settled_at"] = last["settled_at"]
+
+    assert sorted(seen) == sorted(f"b{index}" for index in range(25))
+    assert len(seen) == 25
+
+
+def test_bets_apply_breakdown_filters(client, db):
+    seed_bets(db, count=6)
+
+    bets = client.get("/bets", params={"sport": "afl"}).json()
+
+    # SQLite sorts unsettled bets first.
+    assert [bet["bet_id"] for bet in bets] == ["b5", "b1", "b3"]
+    assert bets[0]["settled_at"] is None
+    assert bets[1]["stake"] == 10.0
+    assert bets[1]["settled_at"] == "2024-01-01T12:00:00"
+    assert client.get("/bets", params={"after_settled_at": "2024-01-01T12:00:00"}).status_code == 400
+
+
+def test_export_streams_ndjson_and_csv(client, db):
+    seed_bets(db, count=7)
+
+    ndjson = client.get("/bets/export", params={"format": "ndjson"})
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [record["bet_id"] for record in records] == [bet["bet_id"] for bet in client.get("/bets").json()]
+
+    exported = client.get("/bets/export", params={"format": "csv", "sport": "nrl"})
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert exported.headers["content-disposition"] == 'attachment; filename="bets.csv"'
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert sorted(row["bet_id"] for row in rows) == ["b0", "b2", "b4", "b6"]
+    assert rows[-1]["payout"] == "15.50"
+
+    assert client.get("/bets/export", params={"format": "xml"}).status_code == 400
+
+
+def test_export_streams_parquet(client, db):
+    pq = pytest.importorskip("pyarrow.parquet")
+    seed_bets(db, count=7)
+
+    response = client.get("/bets/export", params={"format": "parquet"})
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 7
+    assert table.column("stake").to_pylist() == [Decimal("10.00")] * 7
+    assert table.schema.field("settled_day").type == "date32[day]"
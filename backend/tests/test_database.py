@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import configure_sqlite, sqlite_pragmas, writer_pool_options
+
+PERFORMANCE = sqlite_pragmas("performance", mmap_size=1024 * 1024, cache_size_kib=2048)
+
+
+def pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_profiles():
+    assert sqlite_pragmas("default") == {}
+    assert PERFORMANCE["journal_mode"] == "WAL"
+    assert PERFORMANCE["cache_size"] == -2048
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+
+
+def test_performance_profile_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    configure_sqlite(engine, PERFORMANCE)
+
+    with engine.connect() as connection:
+        assert pragma(connection, "journal_mode") == "wal"
+        assert pragma(connection, "synchronous") == 1
+        assert pragma(connection, "mmap_size") == 1024 * 1024
+        assert pragma(connection, "cache_size") == -2048
+        assert pragma(connection, "temp_store") == 2
+    engine.dispose()
+
+
+def test_readers_see_committed_data_while_writer_holds_transaction(tmp_path):
+    url = f"sqlite:///{tmp_path / 'wal.db'}"
+    writer = create_engine(url, pool_size=1, max_overflow=0)
+    reader = create_engine(url)
+    configure_sqlite(writer, PERFORMANCE)
+    configure_sqlite(reader, PERFORMANCE, read_only=True)
+
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE bets (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO bets VALUES (1)"))
+
+    with writer.begin() as connection:
+        connection.execute(text("INSERT INTO bets VALUES (2)"))
+        with reader.connect() as read:
+            assert read.execute(text("SELECT count(*) FROM bets")).scalar() == 1
+            with pytest.raises(OperationalError):
+                read.execute(text("INSERT INTO bets VALUES (3)"))
+
+    writer.dispose()
+    reader.dispose()
+
+
+def test_sqlite_writers_queue_for_the_single_connection(tmp_path):
+    url = f"sqlite:///{tmp_path / 'writer.db'}"
+    writer = create_engine(url, **writer_pool_options(url))
+    held = writer.connect()
+    acquired = threading.Event()
+
+    def second_writer():
+        with writer.connect():
+            acquired.set()
+
+    thread = threading.Thread(target=second_writer)
+    thread.start()
+    time.sleep(0.2)
+    assert not acquired.is_set()
+    held.close()
+    thread.join(timeout=5)
+
+    assert acquired.is_set()
+    assert writer_pool_options(url)["pool_timeout"] is None
+    writer.dispose()
+
+
+def test_async_engine_applies_pragmas(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    configure_sqlite(engine.sync_engine, PERFORMANCE, read_only=True)
+
+    async def read_pragmas():
+        async with engine.connect() as connection:
+            values = await connection.run_sync(lambda sync: (pragma(sync, "journal_mode"), pragma(sync, "query_only")))
+        await engine.dispose()
+        return values
+
+    assert asyncio.run(read_pragmas()) == ("wal", 1)
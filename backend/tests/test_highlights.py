@@ -0,0 +1,73 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.metrics import MetricSnapshot
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID
+from app.services.highlights import (
+    HIGHLIGHTS_SNAPSHOT,
+    compute_highlights,
+    get_highlights,
+    refresh_highlights,
+)
+from app.services.ingestion_service import upsert_bets
+
+# (stake, payout) per day: +10, +5, -10, -10, 0 (void), -10, +30
+RESULTS = [("10", "20"), ("5", "10"), ("10", "0"), ("10", "0"), ("0", "0"), ("10", "0"), ("10", "40")]
+
+
+def seed(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            f"b{index}": {
+                "last_transaction_id": str(index),
+                "stake": Decimal(stake),
+                "payout": Decimal(payout),
+                "occurred_at": datetime(2024, 1, 1 + index, 12),
+            }
+            for index, (stake, payout) in enumerate(RESULTS)
+        },
+    )
+
+
+def test_compute_highlights_tracks_top_bets_streaks_and_drawdown(db):
+    seed(db)
+
+    highlights = compute_highlights(db, top_k=2)
+
+    assert [bet["profit"] for bet in highlights["top_wins"]] == [30.0, 10.0]
+    assert [bet["profit"] for bet in highlights["top_losses"]] == [-10.0, -10.0]
+    assert highlights["longest_winning_streak"] == {
+        "length": 2,
+        "profit": 15.0,
+        "start": "2024-01-01",
+        "end": "2024-01-02",
+    }
+    assert highlights["longest_losing_streak"]["length"] == 3
+    assert highlights["longest_losing_streak"]["end"] == "2024-01-06"
+    assert highlights["max_drawdown"] == {
+        "amount": 30.0,
+        "peak": 15.0,
+        "trough": -15.0,
+        "start": "2024-01-02",
+        "end": "2024-01-06",
+    }
+
+
+def test_highlights_are_served_from_the_ingest_snapshot(db, query_counter):
+    seed(db)
+    refresh_highlights(db)
+    db.commit()
+    assert db.get(MetricSnapshot, (DEFAULT_USER_ID, HIGHLIGHTS_SNAPSHOT)) is not None
+
+    db.expunge_all()
+    query_counter.clear()
+    highlights = get_highlights(db, limit=1)
+
+    assert len(query_counter) == 1
+    assert [bet["profit"] for bet in highlights["top_wins"]] == [30.0]
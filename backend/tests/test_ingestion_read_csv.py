@@ -1,16 +1,30 @@
 from decimal import Decimal
 
-from app.services.ingestion_service import read_csv, summarize_cash_movements
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.bet import Bet
+from app.models.metrics import BetMetric
+from app.models.upload import Upload
+from app.services import ingestion_service
+from app.services.ingestion_service import (
+    process_upload,
+    read_csv,
+    summarize_cash_movements,
+)
+from app.services.metrics_cache import metrics_cache
+
+CSV_TEXT = (
+    '"Time (AEST)","Type","Summary","Transaction Id","Bet Id","Amount","Balance","Single","Multiple","Exotic","Pool"\n'
+    '"01/01/2024 12:00","Bet Stake","Flemington - R7 Lexus Melbourne Cup\n Win or Place\n2. Buckaroo @ 12.00 (Win)",1,10,-5,0.07,true,false,false,false\n'
+    '"02/01/2024 13:00","Win","Arsenal v Nottm Forest\n Win-Draw-Win\nArsenal @ 1.36 (Win)",2,11,1.36,5.07,true,false,false,false\n'
+)
 
 
 def test_read_csv_handles_multiline_summaries(tmp_path):
-    csv_text = (
-        '"Time (AEST)","Type","Summary","Transaction Id","Bet Id","Amount","Balance","Single","Multiple","Exotic","Pool"\n'
-        '"01/01/2024 12:00","Bet Stake","Flemington - R7 Lexus Melbourne Cup\n Win or Place\n2. Buckaroo @ 12.00 (Win)",1,10,-5,0.07,true,false,false,false\n'
-        '"02/01/2024 13:00","Win","Arsenal v Nottm Forest\n Win-Draw-Win\nArsenal @ 1.36 (Win)",2,11,1.36,5.07,true,false,false,false\n'
-    )
     csv_path = tmp_path / "transaction_history.csv"
-    csv_path.write_text(csv_text, encoding="utf-8")
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
 
     rows = read_csv(csv_path)
 
@@ -30,3 +44,32 @@ def test_summarize_cash_movements_handles_deposits_and_withdrawals():
 
     assert totals["deposit"] == Decimal("10")
     assert totals["withdrawal"] == Decimal("5.5")
+
+
+def test_failed_upload_rolls_back_every_write(tmp_path, engine, db, monkeypatch):
+    csv_path = tmp_path / "transaction_history.csv"
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
+    db.add(Upload(id="u1", original_filename="a.csv", stored_path=str(csv_path)))
+    db.commit()
+    monkeypatch.setattr(ingestion_service, "SessionLocal", sessionmaker(bind=engine, autoflush=False))
+
+    sync_transactions = ingestion_service.sync_transactions
+
+    def fail(*_args):
+        raise RuntimeError("ledger unavailable")
+
+    monkeypatch.setattr(ingestion_service, "sync_transactions", fail)
+    version = metrics_cache.version
+    with pytest.raises(RuntimeError):
+        process_upload("u1")
+
+    db.expire_all()
+    assert db.get(Upload, "u1").status == "failed"
+    assert db.execute(select(func.count()).select_from(Bet)).scalar_one() == 0
+    assert db.execute(select(func.count()).select_from(BetMetric)).scalar_one() == 0
+    assert metrics_cache.version == version
+
+    monkeypatch.setattr(ingestion_service, "sync_transactions", sync_transactions)
+    assert process_upload("u1").status == "processed"
+    assert db.execute(select(func.count()).select_from(Bet)).scalar_one() == 2
+    assert metrics_cache.version == version + 1
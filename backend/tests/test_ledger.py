@@ -0,0 +1,58 @@
+from datetime import date, datetime
+
+from app.models.upload import Upload
+from app.services.ingestion_service import ledger_entries
+from app.services.ledger import fetch_bankroll_series, sync_transactions
+from app.services.metrics_service import get_cashflow_totals
+
+
+def export_row(transaction_id, when, tx_type, amount, balance):
+    return {
+        "Time (AEST)": when,
+        "Type": tx_type,
+        "Transaction Id": transaction_id,
+        "Amount": amount,
+        "Balance": balance,
+    }
+
+
+ROWS = [
+    export_row("5", "03/01/2024 09:00", "Withdrawal", "-30", "15"),
+    export_row("4", "02/01/2024 18:00", "Win", "35", "45"),
+    export_row("3", "02/01/2024 18:00", "Bet Stake", "-10", "10"),
+    export_row("2", "01/01/2024 12:00", "Deposit", "10", "20"),
+    export_row("1", "01/01/2024 10:00", "Deposit", "10", "10"),
+]
+
+
+def add_upload(db, upload_id):
+    upload = Upload(id=upload_id, original_filename="a.csv", stored_path="a.csv", created_at=datetime(2024, 1, 4))
+    db.add(upload)
+    db.commit()
+    return upload
+
+
+def test_overlapping_uploads_are_deduplicated_by_transaction_id(db):
+    first = add_upload(db, "u1")
+    second = add_upload(db, "u2")
+
+    assert sync_transactions(db, first.id, ledger_entries(ROWS[2:], first)) == 3
+    assert sync_transactions(db, second.id, ledger_entries(ROWS, second)) == 2
+    db.commit()
+
+    assert get_cashflow_totals(db) == {"deposits": 20.0, "withdrawals": 30.0}
+
+
+def test_bankroll_series_uses_closing_balance_and_cumulative_net_cash(db):
+    upload = add_upload(db, "u1")
+    sync_transactions(db, upload.id, ledger_entries(ROWS, upload))
+    db.commit()
+
+    series = fetch_bankroll_series(db)
+
+    assert series == [
+        {"date": "2024-01-01", "balance": 20.0, "net_cash": 20.0, "cumulative_net_cash": 20.0},
+        {"date": "2024-01-02", "balance": 45.0, "net_cash": 0.0, "cumulative_net_cash": 20.0},
+        {"date": "2024-01-03", "balance": 15.0, "net_cash": -30.0, "cumulative_net_cash": -10.0},
+    ]
+    assert fetch_bankroll_series(db, date_from=date(2024, 1, 3))[0]["cumulative_net_cash"] == -10.0
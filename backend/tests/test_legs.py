@@ -0,0 +1,80 @@
+from sqlalchemy import select
+
+from app.models.leg import Leg
+from app.models.upload import Upload
+from app.services.ingestion_service import aggregate_bets, upsert_bets
+from app.services.legs import leg_breakdown, rebuild_legs
+
+MULTI = """2 Leg Multi
+Collingwood v Geelong
+ Head to Head
+Collingwood @ 1.80
+Flemington - R7 Lexus Melbourne Cup
+ Win or Place
+2. Buckaroo @ 12.00 (Win)"""
+
+SGM = """Brisbane Lions v Gold Coast SUNS
+ Same Game Multi
+ Head To Head - Brisbane Lions @ 1.50
+ Charlie Cameron - Anytime Goal Scorer @ 2.10"""
+
+
+def row(bet_id, tx_id, tx_type, amount, summary):
+    return {
+        "Time (AEST)": "01/01/2024 12:00",
+        "Type": tx_type,
+        "Summary": summary,
+        "Transaction Id": tx_id,
+        "Bet Id": bet_id,
+        "Amount": amount,
+    }
+
+
+def test_legs_are_parsed_once_and_stored_per_bet(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    aggregates = aggregate_bets(
+        [
+            row("1", "t1", "Bet Stake", "-10", MULTI),
+            row("2", "t2", "Bet Stake", "-5", SGM),
+            row("2", "t3", "Win", "20", SGM),
+        ]
+    )
+
+    upsert_bets(db, upload, aggregates)
+    upsert_bets(db, upload, aggregates)
+
+    legs = db.execute(
+        select(Leg.bet_id, Leg.leg_number, Leg.market_type, Leg.decimal_odds).order_by(Leg.bet_id, Leg.leg_number)
+    ).all()
+    assert [(number, market, float(odds)) for _, number, market, odds in legs] == [
+        (1, "Head to Head", 1.8),
+        (2, "Win or Place", 12.0),
+        (1, "Head To Head", 1.5),
+        (2, "Anytime Goal Scorer", 2.1),
+    ]
+
+    by_market = {item["key"]: item for item in leg_breakdown(db, "market_type")}
+    assert by_market["Head To Head"]["profit"] == 15.0
+    assert by_market["Win or Place"]["profit"] == -10.0
+    assert by_market["Win or Place"]["legs"] == 1
+
+
+def test_rebuild_legs_reparses_every_bet_in_chunks(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        aggregate_bets([row("1", "t1", "Bet Stake", "-10", MULTI), row("2", "t2", "Bet Stake", "-5", SGM)]),
+    )
+    stored_legs = select(Leg.bet_id, Leg.leg_number, Leg.market_type).order_by(Leg.bet_id, Leg.leg_number)
+    expected = db.execute(stored_legs).all()
+    db.add(Leg(bet_id=expected[0].bet_id, leg_number=9, market_type="Stale"))
+    db.commit()
+
+    rebuild_legs(db, chunk_size=1)
+
+    assert db.execute(stored_legs).all() == expected
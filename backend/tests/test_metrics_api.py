@@ -0,0 +1,318 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.upload import Upload
+from app.models.user import User
+from app.services.ingestion_service import upsert_bets
+from app.services.ledger import sync_transactions
+
+
+def seed_upload(db):
+    upload = Upload(
+        id="u1",
+        original_filename="a.csv",
+        stored_path="a.csv",
+        status="processed",
+        processed_at=datetime(2024, 1, 3),
+    )
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            f"b{index}": {
+                "last_transaction_id": str(index),
+                "sport": "AFL",
+                "market_type": f"Market {index}",
+                "stake": Decimal("10"),
+                "payout": Decimal("0"),
+                "occurred_at": datetime(2024, 1, 1 + index % 28),
+            }
+            for index in range(60)
+        },
+    )
+
+
+def test_metrics_endpoints_answer_conditional_requests_with_one_token_query(client, db, query_counter):
+    seed_upload(db)
+
+    first = client.get("/metrics/breakdown/market_type")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    query_counter.clear()
+    second = client.get("/metrics/breakdown/market_type", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert len(query_counter) == 1
+    assert "FROM uploads" in query_counter[0]
+
+
+def test_metrics_follow_uploads_processed_by_other_workers(client, db):
+    seed_upload(db)
+    first = client.get("/metrics/overview")
+
+    # Another worker's upload never bumps this process's cache version.
+    upload = Upload(
+        id="u2",
+        original_filename="b.csv",
+        stored_path="b.csv",
+        status="processed",
+        processed_at=datetime(2024, 1, 4),
+    )
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            "b100": {
+                "last_transaction_id": "100",
+                "sport": "AFL",
+                "stake": Decimal("10"),
+                "payout": Decimal("50"),
+                "occurred_at": datetime(2024, 1, 4),
+            }
+        },
+    )
+    second = client.get("/metrics/overview", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.content != first.content
+
+
+def test_metrics_etag_varies_by_params(client, db):
+    seed_upload(db)
+
+    racing = client.get("/metrics/timeseries", params={"category": "racing"})
+    sport = client.get("/metrics/timeseries", params={"category": "sport"})
+
+    assert racing.headers["etag"] != sport.headers["etag"]
+
+
+def test_large_metrics_payloads_are_gzipped(client, db):
+    seed_upload(db)
+
+    response = client.get("/metrics/breakdown/market_type", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 60
+
+
+def test_timeseries_accepts_granularity_and_range(client, db):
+    seed_upload(db)
+
+    monthly = client.get("/metrics/timeseries", params={"granularity": "month", "from": "2024-01-20"})
+    assert monthly.status_code == 200
+    assert monthly.json() == [{"date": "2024-01-01", "profit": -180.0, "cumulative": -180.0}]
+
+    assert client.get("/metrics/timeseries", params={"granularity": "hour"}).status_code == 400
+
+
+def test_timeseries_max_points_downsamples(client, db):
+    seed_upload(db)
+
+    full = client.get("/metrics/timeseries").json()
+    sampled = client.get("/metrics/timeseries", params={"max_points": 5}).json()
+
+    assert len(full) == 28
+    assert len(sampled) == 5
+    assert sampled[0] == full[0]
+    assert sampled[-1] == full[-1]
+
+
+def test_cube_returns_requested_groupings(client, db):
+    seed_upload(db)
+
+    response = client.get("/metrics/cube", params=[("dimensions", "sport"), ("dimensions", "sport:market_type")])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"sport", "sport:market_type"}
+    assert body["sport"][0]["key"] == "AFL"
+    assert len(body["sport:market_type"]) == 60
+    assert client.get("/metrics/cube", params={"dimensions": "sport:sport"}).status_code == 400
+
+
+def test_high_cardinality_breakdowns_are_bounded(client, db):
+    seed_upload(db)
+
+    response = client.get("/metrics/breakdown/market_type", params={"limit": 10})
+    rows = response.json()
+    assert len(rows) == 11
+    assert rows[-1]["key"] == "Other"
+    assert rows[-1]["groups"] == 50
+
+    assert client.get("/metrics/breakdown/runner_name").status_code == 200
+    assert client.get("/metrics/breakdown/team", params={"after_key": "x"}).status_code == 400
+
+
+def test_odds_bands_validate_edges(client, db):
+    seed_upload(db)
+
+    assert client.get("/metrics/odds-bands", params={"edges": [0.5]}).status_code == 400
+    response = client.get("/metrics/odds-bands", params={"edges": [2, 4]})
+    assert response.status_code == 200
+    assert [band["key"] for band in response.json()] == ["< 2.00", "2.00-4.00", "4.00+"]
+
+
+def test_bankroll_serves_downsampled_ledger_series(client, db):
+    seed_upload(db)
+    sync_transactions(
+        db,
+        "u1",
+        [
+            {
+                "transaction_id": str(day),
+                "type": "deposit" if day % 7 == 1 else "bet",
+                "amount": Decimal("50") if day % 7 == 1 else Decimal(-(day % 5)),
+                "balance": Decimal(1000 + day * (-1) ** day * 3),
+                "occurred_at": datetime(2024, 1, day, 12),
+                "day": date(2024, 1, day),
+            }
+            for day in range(1, 29)
+        ],
+    )
+    db.commit()
+
+    full = client.get("/metrics/bankroll").json()
+    sampled = client.get("/metrics/bankroll", params={"max_points": 5}).json()
+
+    assert len(full) == 28
+    assert len(sampled) == 5
+    assert sampled[0] == full[0]
+    assert sampled[-1] == full[-1]
+
+
+def test_metrics_are_scoped_to_the_requesting_user(client, db):
+    seed_upload(db)
+    db.add(User(id="alice"))
+    upload = Upload(id="u2", user_id="alice", original_filename="b.csv", stored_path="b.csv", status="processed")
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {"b1": {"last_transaction_id": "1", "sport": "NRL", "stake": Decimal("5"), "payout": Decimal("12")}},
+    )
+
+    local = client.get("/metrics/breakdown/sport")
+    alice = client.get("/metrics/breakdown/sport", headers={"X-User-Id": "alice"})
+
+    assert [(row["key"], row["profit"]) for row in local.json()] == [("AFL", -600.0)]
+    assert [(row["key"], row["profit"]) for row in alice.json()] == [("NRL", 7.0)]
+    assert local.headers["etag"] != alice.headers["etag"]
+    assert client.get("/metrics/overview", headers={"X-User-Id": "bob"}).json() == []
+    assert client.get("/metrics/overview", headers={"X-User-Id": "not a user"}).status_code == 422
+
+
+def test_dashboard_bundles_the_opening_sections(client, db, query_counter):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv", status="processed")
+    db.add(upload)
+    db.commit()
+    bets = {
+        "b1": ("AFL", None, "Single", "Line", "10", "25"),
+        "b2": ("AFL", None, "Multi", "Head to Head", "20", "0"),
+        "b3": ("NRL", None, "Single", "Line", "5", "9.50"),
+        "b4": (None, "Flemington", "Single", "Win", "4", "12"),
+        "b5": (None, "Randwick", "Quinella", "Win", "6", "0"),
+    }
+    upsert_bets(
+        db,
+        upload,
+        {
+            bet_id: {
+                "last_transaction_id": bet_id,
+                "sport": sport,
+                "track": track,
+                "bet_type": bet_type,
+                "market_type": market,
+                "stake": Decimal(stake),
+                "payout": Decimal(payout),
+                "occurred_at": datetime(2024, 1, 1 + index),
+            }
+            for index, (bet_id, (sport, track, bet_type, market, stake, payout)) in enumerate(bets.items())
+        },
+    )
+
+    query_counter.clear()
+    sport = client.get("/metrics/dashboard")
+    assert sport.headers["content-type"] == "application/json"
+    assert len(query_counter) <= 4
+    bundle = sport.json()
+
+    assert bundle["overview"] == client.get("/metrics/overview").json()
+    assert bundle["cashflow"] == client.get("/metrics/cashflow").json()
+    assert bundle["timeseries"] == client.get("/metrics/timeseries", params={"category": "sport"}).json()
+    assert bundle["selected_sport"] == "NRL"
+    assert bundle["breakdowns"]["sport"] == client.get(
+        "/metrics/breakdown/sport", params={"category": "sport"}
+    ).json()
+    for dimension in ("bet_type", "market_type"):
+        assert bundle["breakdowns"][dimension] == client.get(
+            f"/metrics/breakdown/{dimension}", params={"category": "sport", "sport": "NRL"}
+        ).json()
+
+    racing = client.get("/metrics/dashboard", params={"category": "racing"}).json()
+    assert racing["selected_sport"] is None
+    for dimension in ("track", "bet_type", "market_type"):
+        assert racing["breakdowns"][dimension] == client.get(
+            f"/metrics/breakdown/{dimension}", params={"category": "racing"}
+        ).json()
+
+    assert client.get("/metrics/dashboard", headers={"If-None-Match": sport.headers["etag"]}).status_code == 304
+    assert client.get("/metrics/dashboard", params={"category": "all"}).status_code == 400
+
+
+def test_metrics_bodies_are_encoded_once_per_data_version(client, db, query_counter, monkeypatch):
+    from app.services import metrics_cache
+
+    seed_upload(db)
+    first = client.get("/metrics/breakdown/market_type")
+    assert first.headers["content-type"] == "application/json"
+
+    def fail(_content):
+        raise AssertionError("cached bodies must not be re-encoded")
+
+    monkeypatch.setattr(metrics_cache, "dumps", fail)
+    query_counter.clear()
+    second = client.get("/metrics/breakdown/market_type")
+
+    assert second.content == first.content
+    assert len(query_counter) == 1
+
+
+def test_metrics_cache_misses_are_built_off_the_event_loop(client, db, monkeypatch):
+    import threading
+
+    from app.core import database
+    from app.services import metrics_cache
+
+    seed_upload(db)
+    threads = []
+    sessions = []
+    build = metrics_cache.PAYLOAD_BUILDERS["overview"]
+    open_session = database.ReadSessionLocal
+
+    def record(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return build(*args, **kwargs)
+
+    def counted_session():
+        sessions.append(threading.current_thread().name)
+        return open_session()
+
+    monkeypatch.setitem(metrics_cache.PAYLOAD_BUILDERS, "overview", record)
+    monkeypatch.setattr(database, "ReadSessionLocal", counted_session)
+    first = client.get("/metrics/overview")
+    assert first.status_code == 200
+    assert client.get("/metrics/overview").status_code == 200
+    assert client.get("/metrics/overview", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    assert len(threads) == 1
+    assert threads[0].startswith("AnyIO worker thread")
+    # Hits and 304s never open a read session or touch the threadpool.
+    assert sessions == threads
@@ -0,0 +1,65 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.upload import Upload
+from app.services.ingestion_service import upsert_bets
+from app.services.metrics_breakdown import ranked_breakdown
+
+
+def seed_teams(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    aggregates = {}
+    for index in range(7):
+        aggregates[f"b{index}"] = {
+            "last_transaction_id": str(index),
+            "sport": "AFL",
+            "team": f"Team {index}",
+            "stake": Decimal(10 + index),
+            "payout": Decimal(index * 5),
+            "occurred_at": datetime(2024, 1, 1),
+        }
+    aggregates["racing"] = {
+        "last_transaction_id": "r",
+        "sport": "Racing",
+        "track": "Flemington",
+        "stake": Decimal("2"),
+        "payout": Decimal("0"),
+        "occurred_at": datetime(2024, 1, 1),
+    }
+    upsert_bets(db, upload, aggregates)
+
+
+def test_ranked_breakdown_pages_by_keyset_with_other_rollup(db):
+    seed_teams(db)
+
+    first = ranked_breakdown(db, "team", category="sport", limit=3)
+    assert [row["key"] for row in first] == ["Team 6", "Team 5", "Team 4", "Other"]
+    assert first[-1]["groups"] == 4
+    assert first[-1]["stake"] == 10 + 11 + 12 + 13
+
+    last = first[-2]
+    second = ranked_breakdown(
+        db, "team", category="sport", limit=3, after_profit=last["profit"], after_key=last["key"]
+    )
+    assert [row["key"] for row in second] == ["Team 3", "Team 2", "Team 1", "Other"]
+    assert second[-1]["groups"] == 1
+
+
+def test_ranked_breakdown_applies_min_stake_and_unclassified_keys(db):
+    seed_teams(db)
+
+    rows = ranked_breakdown(db, "team", min_stake=14)
+    assert [row["key"] for row in rows] == ["Team 6", "Team 5", "Team 4"]
+
+    racing = ranked_breakdown(db, "team", category="racing")
+    assert [(row["key"], row["profit"]) for row in racing] == [("Unclassified", -2.0)]
+
+
+def test_ranked_breakdown_pages_summary_dimensions(db):
+    seed_teams(db)
+
+    rows = ranked_breakdown(db, "sport", limit=1)
+
+    assert [row["key"] for row in rows] == ["AFL", "Other"]
@@ -0,0 +1,42 @@
+from app.services.metrics_cache import MetricsCache, cache_key
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = MetricsCache(max_entries=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+
+    assert cache.get(("a",)) == 1
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == 3
+
+
+def test_bump_version_invalidates_entries():
+    cache = MetricsCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["payload"]
+
+    key = cache_key("breakdown", dimension="sport", category=None)
+    assert cache.get_or_compute(key, compute) == ["payload"]
+    assert cache.get_or_compute(key, compute) == ["payload"]
+    assert len(calls) == 1
+
+    cache.bump_version()
+    cache.get_or_compute(key, compute)
+    assert len(calls) == 2
+
+
+def test_results_computed_across_a_version_bump_are_not_stored():
+    cache = MetricsCache()
+
+    def compute():
+        cache.bump_version()
+        return ["stale"]
+
+    assert cache.get_or_compute(("overview",), compute) == ["stale"]
+    assert cache.get(("overview",)) is None
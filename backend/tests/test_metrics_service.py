@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from app.models.bet import Bet
+from app.models.upload import Upload
+from app.services.bet_metrics import rebuild_bet_metrics
+from app.services.metrics_service import get_overview_metrics
+
+
+def seed_bets(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv", status="processed")
+    db.add(upload)
+    db.add_all(
+        [
+            Bet(upload_id="u1", bet_id="1", last_transaction_id="1", sport="AFL", bet_type="Single",
+                stake=Decimal("10"), payout=Decimal("25")),
+            Bet(upload_id="u1", bet_id="2", last_transaction_id="2", sport="AFL", bet_type="Multi",
+                stake=Decimal("5"), payout=Decimal("0")),
+            Bet(upload_id="u1", bet_id="3", last_transaction_id="3", sport="NRL", bet_type="Single",
+                stake=Decimal("20"), payout=Decimal("0")),
+            Bet(upload_id="u1", bet_id="4", last_transaction_id="4", sport="NRL", bet_type="Manual Adjustment",
+                stake=Decimal("0"), payout=Decimal("3")),
+        ]
+    )
+    db.commit()
+    rebuild_bet_metrics(db)
+
+
+def test_overview_metrics_reduces_cards_from_grouped_scan(db):
+    seed_bets(db)
+
+    cards = {card["label"]: card for card in get_overview_metrics(db)}
+
+    assert cards["Total profit/loss"]["value"] == -7.0
+    assert cards["Win rate"]["value"] == 50.0
+    assert cards["Average stake"]["value"] == round(35 / 3, 2)
+    assert cards["Best sport"]["value"] == "AFL"
+    assert cards["Worst sport"]["value"] == "NRL"
+    assert cards["Singles P/L"]["value"] == -2.0
+    assert cards["Singles P/L"]["helper"] == "Win rate 66.7%"
+    assert cards["Multis P/L"]["value"] == -5.0
+
+
+def test_overview_metrics_uses_single_query(db, query_counter):
+    seed_bets(db)
+    query_counter.clear()
+
+    get_overview_metrics(db)
+
+    assert len(query_counter) == 1
+
+
+def test_overview_metrics_empty(db):
+    assert get_overview_metrics(db) == []
@@ -0,0 +1,231 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.cli import ALEMBIC_INI
+from app.core.database import Base
+from app.models.search import include_name
+
+# The schema ``Base.metadata.create_all`` built before the app had migrations.
+BASELINE_SCHEMA = (
+    (
+        "CREATE TABLE sports (id INTEGER NOT NULL, slug VARCHAR(64) NOT NULL, name VARCHAR(128) NOT NULL, "
+        "category VARCHAR(32) NOT NULL, is_user_defined BOOLEAN NOT NULL, PRIMARY KEY (id), UNIQUE (name))"
+    ),
+    "CREATE UNIQUE INDEX ix_sports_slug ON sports (slug)",
+    (
+        "CREATE TABLE uploads (id VARCHAR(36) NOT NULL, original_filename VARCHAR(512) NOT NULL, "
+        "stored_path VARCHAR(1024) NOT NULL, status VARCHAR(32) NOT NULL, row_count INTEGER, "
+        "deposit_total DECIMAL(12, 2), withdrawal_total DECIMAL(12, 2), created_at DATETIME NOT NULL, "
+        "processed_at DATETIME, PRIMARY KEY (id))"
+    ),
+    (
+        "CREATE TABLE bets (id INTEGER NOT NULL, upload_id VARCHAR(36) NOT NULL, "
+        "bet_id VARCHAR(128) NOT NULL, last_transaction_id VARCHAR(128) NOT NULL, sport VARCHAR(128), "
+        "competition VARCHAR(256), team VARCHAR(256), opponent VARCHAR(256), bet_type VARCHAR(64), "
+        "market_type VARCHAR(64), description TEXT, track VARCHAR(128), race VARCHAR(256), "
+        "runner_number VARCHAR(32), runner_name VARCHAR(256), odds VARCHAR(64), result VARCHAR(32), "
+        "stake DECIMAL(12, 2), payout DECIMAL(12, 2), settled_at DATETIME, PRIMARY KEY (id), "
+        "FOREIGN KEY(upload_id) REFERENCES uploads (id))"
+    ),
+    "CREATE INDEX ix_bets_upload_id ON bets (upload_id)",
+    "CREATE UNIQUE INDEX ix_bets_bet_id ON bets (bet_id)",
+    (
+        "CREATE TABLE sport_entities (id INTEGER NOT NULL, sport_id INTEGER NOT NULL, "
+        "name VARCHAR(256) NOT NULL, entity_type VARCHAR(32), is_user_defined BOOLEAN NOT NULL, "
+        "PRIMARY KEY (id), FOREIGN KEY(sport_id) REFERENCES sports (id) ON DELETE CASCADE, UNIQUE (name))"
+    ),
+    "CREATE INDEX ix_sport_entities_sport_id ON sport_entities (sport_id)",
+    (
+        "CREATE TABLE sport_aliases (id INTEGER NOT NULL, entity_id INTEGER NOT NULL, "
+        "alias VARCHAR(256) NOT NULL, normalized_alias VARCHAR(256) NOT NULL, PRIMARY KEY (id), "
+        "FOREIGN KEY(entity_id) REFERENCES sport_entities (id) ON DELETE CASCADE)"
+    ),
+    "CREATE INDEX ix_sport_aliases_normalized_alias ON sport_aliases (normalized_alias)",
+    "CREATE INDEX ix_sport_aliases_entity_id ON sport_aliases (entity_id)",
+)
+
+
+def upgrade(engine, revision):
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def test_migrations_match_model_metadata(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}", future=True)
+    upgrade(engine, "head")
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_name": include_name})
+        diff = compare_metadata(context, Base.metadata)
+
+    assert diff == []
+    engine.dispose()
+
+
+def test_numeric_odds_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}", future=True)
+    upgrade(engine, "0005")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO uploads (id, original_filename, stored_path, status, created_at) "
+                "VALUES ('u1', 'a', 'a', 'processed', '2024-01-01')"
+            )
+        )
+        for index, odds in enumerate(("2.50", "5/2", "SP", None), start=1):
+            connection.execute(
+                text("INSERT INTO bets (id, upload_id, bet_id, last_transaction_id, odds) VALUES (:id, 'u1', :id, :id, :odds)"),
+                {"id": index, "odds": odds},
+            )
+
+    upgrade(engine, "0006")
+
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT odds, decimal_odds, implied_probability FROM bets ORDER BY id")).all()
+    assert [(odds, float(price) if price else None) for odds, price, _ in rows] == [
+        ("2.50", 2.5),
+        ("5/2", 3.5),
+        ("SP", None),
+        (None, None),
+    ]
+    assert float(rows[0].implied_probability) == 0.4
+    engine.dispose()
+
+
+def test_database_created_before_migrations_upgrades_to_head(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}", future=True)
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text(
+                "INSERT INTO uploads (id, original_filename, stored_path, status, created_at) "
+                "VALUES ('u1', 'a', 'a', 'processed', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO bets (id, upload_id, bet_id, last_transaction_id, odds, stake, payout, settled_at) "
+                "VALUES (1, 'u1', 'b1', 't1', '2.50', 10, 25, '2024-01-02 10:00:00')"
+            )
+        )
+
+    upgrade(engine, "head")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one() == "0011"
+        bet = connection.execute(text("SELECT bet_id, user_id, decimal_odds FROM bets")).one()
+        context = MigrationContext.configure(connection, opts={"include_name": include_name})
+        diff = compare_metadata(context, Base.metadata)
+    assert (bet.bet_id, bet.user_id, float(bet.decimal_odds)) == ("b1", "local", 2.5)
+    assert diff == []
+    engine.dispose()
+
+
+def test_participants_backfill_resolves_aliases_within_the_bet_sport(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}", future=True)
+    upgrade(engine, "0003")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO sports (id, slug, name, category, is_user_defined) "
+                "VALUES (1, 'afl', 'AFL', 'sport', 0), (2, 'nrl', 'NRL', 'sport', 0)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO sport_entities (id, sport_id, name, is_user_defined) "
+                "VALUES (1, 1, 'Collingwood Magpies', 0), (2, 1, 'Geelong Cats', 0), (3, 2, 'Wests Tigers', 0)"
+            )
+        )
+        # "Cats" is shared across sports; "Pies" is ambiguous within AFL.
+        connection.execute(
+            text(
+                "INSERT INTO sport_aliases (entity_id, alias, normalized_alias) "
+                "VALUES (2, 'Cats', 'cats'), (3, 'Cats', 'cats'), (1, 'Pies', 'pies'), (2, 'Pies', 'pies')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO uploads (id, original_filename, stored_path, status, created_at) "
+                "VALUES ('u1', 'a', 'a', 'processed', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO bets (id, upload_id, bet_id, last_transaction_id, sport, team, opponent) VALUES "
+                "(1, 'u1', 'b1', 't1', 'AFL', 'Cats', 'Pies'), "
+                "(2, 'u1', 'b2', 't2', 'NRL', 'Cats', NULL), "
+                "(3, 'u1', 'b3', 't3', 'AFL', 'Collingwood Magpies', ' geelong cats ')"
+            )
+        )
+
+    upgrade(engine, "0004")
+
+    with engine.connect() as connection:
+        links = connection.execute(text("SELECT bet_id, entity_id, role FROM bet_participants")).all()
+    assert sorted(links) == [(1, 2, "team"), (2, 3, "team"), (3, 1, "team"), (3, 2, "opponent")]
+    engine.dispose()
+
+
+def test_search_index_is_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}", future=True)
+    upgrade(engine, "0009")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO uploads (id, original_filename, stored_path, status, created_at) "
+                "VALUES ('u1', 'a', 'a', 'processed', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO bets (id, upload_id, bet_id, last_transaction_id, description, track) VALUES "
+                "(1, 'u1', 'b1', 't1', 'Buckaroo to win', 'Flemington'), (2, 'u1', 'b2', 't2', 'Storm -4.5', NULL)"
+            )
+        )
+
+    upgrade(engine, "0010")
+
+    with engine.connect() as connection:
+        matches = connection.execute(text("SELECT rowid FROM bets_fts WHERE bets_fts MATCH '\"bucka\"*'")).scalars()
+        assert list(matches) == [1]
+    engine.dispose()
+
+
+def test_leg_odds_are_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}", future=True)
+    upgrade(engine, "0010")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO uploads (id, original_filename, stored_path, status, created_at) "
+                "VALUES ('u1', 'a', 'a', 'processed', '2024-01-01')"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO bets (id, upload_id, bet_id, last_transaction_id) VALUES (1, 'u1', 'b1', 't1')")
+        )
+        for number, odds in enumerate(("1.80", "5/2", "SP", None), start=1):
+            connection.execute(
+                text("INSERT INTO legs (bet_id, leg_number, odds) VALUES (1, :number, :odds)"),
+                {"number": number, "odds": odds},
+            )
+
+    upgrade(engine, "0011")
+
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT odds, decimal_odds FROM legs ORDER BY leg_number")).all()
+    assert [(odds, float(price) if price else None) for odds, price in rows] == [
+        ("1.80", 1.8),
+        ("5/2", 3.5),
+        ("SP", None),
+        (None, None),
+    ]
+    engine.dispose()
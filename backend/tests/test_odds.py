@@ -0,0 +1,71 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models.bet import Bet
+from app.models.upload import Upload
+from app.services.ingestion_service import upsert_bets
+from app.services.odds import (
+    decimal_odds,
+    implied_probability,
+    normalize_edges,
+    odds_bands,
+)
+
+
+@pytest.mark.parametrize(
+    ("odds", "expected"),
+    [("12.00", Decimal("12")), ("5/2", Decimal("3.5")), ("1/4", Decimal("1.25")), ("1.00", None), ("5/0", None), (None, None)],
+)
+def test_decimal_odds_handles_decimal_and_fractional_prices(odds, expected):
+    assert decimal_odds(odds) == expected
+
+
+def test_upsert_stores_numeric_odds(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    upsert_bets(db, upload, {"b1": {"last_transaction_id": "1", "odds": "3/1", "stake": Decimal("10")}})
+
+    bet = db.query(Bet).one()
+    assert bet.decimal_odds == Decimal("4")
+    assert bet.implied_probability == implied_probability(Decimal("4")) == Decimal("0.25")
+
+
+def test_odds_bands_bucket_bets_by_configured_edges(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    prices = {"b1": ("1.40", "14"), "b2": ("1.80", "0"), "b3": ("2.50", "25"), "b4": ("8.00", "0"), "b5": (None, "0")}
+    upsert_bets(
+        db,
+        upload,
+        {
+            bet_id: {
+                "last_transaction_id": bet_id,
+                "sport": "AFL",
+                "odds": odds,
+                "stake": Decimal("10"),
+                "payout": Decimal(payout),
+                "occurred_at": datetime(2024, 1, 1),
+            }
+            for bet_id, (odds, payout) in prices.items()
+        },
+    )
+
+    bands = odds_bands(db, edges=(2.0, 5.0))
+
+    assert [band["key"] for band in bands] == ["< 2.00", "2.00-5.00", "5.00+"]
+    assert [band["bets"] for band in bands] == [2, 1, 1]
+    assert bands[0]["profit"] == -6.0
+    assert bands[0]["win_rate"] == 0.5
+    assert bands[1]["roi"] == 1.5
+    assert bands[2]["implied_probability"] == 0.125
+    assert odds_bands(db, edges=(2.0, 5.0), category="racing")[0]["bets"] == 0
+
+
+def test_normalize_edges_rejects_invalid_edges():
+    assert normalize_edges([3.0, 2.0, 3.0]) == (2.0, 3.0)
+    with pytest.raises(ValueError):
+        normalize_edges([1.0, 2.0])
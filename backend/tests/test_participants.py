@@ -0,0 +1,95 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.participant import BetParticipant
+from app.models.reference import Sport, SportAlias, SportEntity
+from app.models.upload import Upload
+from app.services.ingestion_service import upsert_bets
+from app.services.participants import participant_breakdown
+
+
+def seed_reference(db):
+    afl = Sport(name="AFL", slug="afl", category="sport")
+    db.add(afl)
+    db.flush()
+    magpies = SportEntity(sport_id=afl.id, name="Collingwood Magpies", entity_type="team")
+    cats = SportEntity(sport_id=afl.id, name="Geelong Cats", entity_type="team")
+    db.add_all([magpies, cats])
+    db.flush()
+    db.add(SportAlias(entity_id=magpies.id, alias="Collingwood", normalized_alias="collingwood"))
+    db.add(Upload(id="u1", original_filename="a.csv", stored_path="a.csv"))
+    db.commit()
+    return magpies, cats
+
+
+def bet(team, opponent, stake, payout):
+    return {
+        "last_transaction_id": "t",
+        "sport": "AFL",
+        "team": team,
+        "opponent": opponent,
+        "stake": Decimal(stake),
+        "payout": Decimal(payout),
+        "occurred_at": datetime(2024, 1, 1),
+    }
+
+
+def test_upsert_bets_links_resolved_participants(db):
+    magpies, cats = seed_reference(db)
+    upload = db.get(Upload, "u1")
+
+    upsert_bets(
+        db,
+        upload,
+        {
+            "b1": bet("Collingwood Magpies", "Geelong Cats", "10", "25"),
+            "b2": bet("Geelong Cats", "Collingwood", "10", "0"),
+            "b3": bet("Unknown FC", None, "5", "0"),
+        },
+    )
+    upsert_bets(db, upload, {"b2": bet("Geelong Cats", None, "10", "0")})
+
+    links = db.execute(select(BetParticipant.entity_id, BetParticipant.role)).all()
+    assert sorted(links) == sorted([(magpies.id, "team"), (cats.id, "opponent"), (cats.id, "team")])
+
+    rows = {row["key"]: row for row in participant_breakdown(db)}
+    assert rows["Collingwood Magpies"]["profit"] == 15.0
+    assert rows["Geelong Cats"]["bets"] == 2
+    assert rows["Geelong Cats"]["profit"] == 5.0
+
+    assert [row["key"] for row in participant_breakdown(db, entity_id=cats.id)] == ["Geelong Cats"]
+    assert participant_breakdown(db, sport="nrl") == []
+
+
+def test_participants_resolve_aliases_within_the_bet_sport(db):
+    magpies, cats = seed_reference(db)
+    nrl = Sport(name="NRL", slug="nrl", category="sport")
+    db.add(nrl)
+    db.flush()
+    tigers = SportEntity(sport_id=nrl.id, name="Wests Tigers", entity_type="team")
+    db.add(tigers)
+    db.flush()
+    db.add_all(
+        [
+            # "Cats" is shared across sports; "Pies" is ambiguous within AFL.
+            SportAlias(entity_id=cats.id, alias="Cats", normalized_alias="cats"),
+            SportAlias(entity_id=tigers.id, alias="Cats", normalized_alias="cats"),
+            SportAlias(entity_id=magpies.id, alias="Pies", normalized_alias="pies"),
+            SportAlias(entity_id=cats.id, alias="Pies", normalized_alias="pies"),
+        ]
+    )
+    db.commit()
+
+    upsert_bets(
+        db,
+        db.get(Upload, "u1"),
+        {
+            "b1": bet("Cats", "Pies", "10", "0"),
+            "b2": {**bet("Cats", None, "10", "0"), "sport": "NRL"},
+        },
+    )
+
+    links = db.execute(select(BetParticipant.entity_id, BetParticipant.role)).all()
+    assert sorted(links) == sorted([(cats.id, "team"), (tigers.id, "team")])
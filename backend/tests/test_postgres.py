@@ -0,0 +1,203 @@
+"""Postgres-specific SQL.
+
+The compile tests always run. The integration tests need a disposable
+database, e.g. ``TEST_POSTGRES_URL=postgresql+psycopg://postgres@localhost/test``
+from a local container; every table is dropped and recreated.
+"""
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.core.database import Base, async_database_url, sync_database_url
+from app.models.bet import Bet
+from app.models.transaction import Transaction
+from app.models.upload import Upload
+from app.models.user import DEFAULT_USER_ID, User
+from app.services.aggregates import count_where, sum_where
+from app.services.bet_export import bets_page_select
+from app.services.bulk_load import merge_statement, staging_table
+from app.services.ingestion_service import upsert_bets
+from app.services.ledger import sync_transactions
+from app.services.metrics_breakdown import breakdown_cube
+from app.services.metrics_service import get_cashflow_totals
+from app.services.search import search_bets
+from app.services.simulation import load_bet_arrays, simulate_staking
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def compile_pg(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_postgres_urls_use_psycopg():
+    assert sync_database_url("postgresql://u:p@db/bets") == "postgresql+psycopg://u:p@db/bets"
+    assert async_database_url("postgresql://u:p@db/bets") == "postgresql+psycopg://u:p@db/bets"
+    assert sync_database_url("sqlite+aiosqlite:///./data/a.db") == "sqlite:///./data/a.db"
+
+
+def test_conditional_aggregates_use_filter_on_postgres():
+    stmt = select(count_where(Bet.payout > Bet.stake), sum_where(Bet.stake, Bet.track.isnot(None)))
+
+    sql = compile_pg(stmt)
+
+    assert "count(*) FILTER (WHERE bets.payout > bets.stake)" in sql
+    assert "sum(bets.stake) FILTER (WHERE bets.track IS NOT NULL)" in sql
+    assert "CASE" not in sql
+
+
+def test_staged_merge_statement():
+    columns = ["bet_id", "stake"]
+    staging = staging_table(Bet.__table__, columns)
+
+    assert compile_pg(CreateTable(staging)).strip().startswith("CREATE TEMPORARY TABLE staging_bets")
+    sql = compile_pg(merge_statement(Bet.__table__, staging, columns, ("bet_id",), ("stake",)))
+
+    assert "FROM staging_bets ORDER BY staging_bets.staged_position" in sql
+    assert "ON CONFLICT (bet_id) DO UPDATE SET stake = excluded.stake" in sql
+
+
+@pytest.fixture
+def pg_db():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(sync_database_url(POSTGRES_URL))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def seed(db, upload_id, bets, user_id=DEFAULT_USER_ID):
+    if db.get(User, user_id) is None:
+        db.add(User(id=user_id))
+        db.flush()
+    upload = Upload(
+        id=upload_id,
+        user_id=user_id,
+        original_filename="a.csv",
+        stored_path="a.csv",
+        created_at=datetime(2024, 2, 1),
+    )
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            bet_id: {
+                "last_transaction_id": bet_id,
+                "sport": sport,
+                "bet_type": "Single",
+                "market_type": market,
+                "team": "Collingwood",
+                "stake": Decimal(stake),
+                "payout": Decimal(payout),
+                "occurred_at": datetime(2024, 1, 5, 12),
+            }
+            for bet_id, (sport, market, stake, payout) in bets.items()
+        },
+    )
+    return upload
+
+
+def test_copy_merge_upserts_bets(pg_db):
+    seed(pg_db, "u1", {"b1": ("AFL", "Line", "10", "0"), "b2": ("NRL", "Head to Head", "5", "12")})
+    seed(pg_db, "u2", {"b1": ("AFL", "Line", "10", "19"), "b3": ("AFL", "Head to Head", "4", "0")})
+
+    bets = {bet.bet_id: bet for bet in pg_db.execute(select(Bet)).scalars()}
+    assert set(bets) == {"b1", "b2", "b3"}
+    assert bets["b1"].payout == Decimal("19.00")
+    assert bets["b1"].upload_id == "u2"
+    assert bets["b1"].settled_day == date(2024, 1, 5)
+
+    cube = breakdown_cube(pg_db, ("sport", "sport:market_type", "market_type"))
+    assert [(row["key"], row["profit"]) for row in cube["sport"]] == [("NRL", 7.0), ("AFL", 5.0)]
+    assert {(row["parent"], row["key"]) for row in cube["sport:market_type"]} == {
+        ("AFL", "Line"),
+        ("AFL", "Head to Head"),
+        ("NRL", "Head to Head"),
+    }
+    assert sum(row["stake"] for row in cube["market_type"]) == 19.0
+
+
+def test_copy_merge_keeps_users_apart(pg_db):
+    seed(pg_db, "u1", {"b1": ("AFL", "Line", "10", "0")})
+    seed(pg_db, "u2", {"b1": ("NRL", "Line", "5", "12")}, user_id="alice")
+
+    owners = dict(pg_db.execute(select(Bet.user_id, Bet.sport)).all())
+    assert owners == {DEFAULT_USER_ID: "AFL", "alice": "NRL"}
+    assert [row["key"] for row in breakdown_cube(pg_db, ("sport",), user_id="alice")["sport"]] == ["NRL"]
+
+
+def test_copy_merge_skips_known_transactions(pg_db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    pg_db.add(upload)
+    pg_db.commit()
+    entries = [
+        {
+            "transaction_id": f"t{day}",
+            "type": kind,
+            "amount": Decimal(amount),
+            "balance": None,
+            "occurred_at": datetime(2024, 1, day, 9),
+            "day": date(2024, 1, day),
+        }
+        for day, kind, amount in ((1, "deposit", "50"), (2, "withdrawal", "-20"))
+    ]
+
+    assert sync_transactions(pg_db, "u1", entries) == 2
+    assert sync_transactions(pg_db, "u1", entries) == 0
+    pg_db.commit()
+
+    ids = pg_db.execute(select(Transaction.transaction_id).order_by(Transaction.id)).scalars().all()
+    assert ids == ["t1", "t2"]
+    assert pg_db.execute(select(func.count()).select_from(Transaction)).scalar_one() == 2
+    assert get_cashflow_totals(pg_db) == {"deposits": 50.0, "withdrawals": 20.0}
+
+
+def test_bet_pages_put_unsettled_bets_last(pg_db):
+    upload = seed(pg_db, "u1", {f"b{index}": ("AFL", "Line", "10", "0") for index in range(5)})
+    unsettled = Bet(user_id=DEFAULT_USER_ID, upload_id=upload.id, bet_id="open", last_transaction_id="t")
+    pg_db.add(unsettled)
+    pg_db.commit()
+
+    seen, after = [], {}
+    while page := pg_db.execute(bets_page_select("postgresql", limit=2, **after)).all():
+        seen.extend(row.bet_id for row in page)
+        after = {"after_settled_at": page[-1].settled_at, "after_id": page[-1].id}
+
+    assert seen == ["b0", "b1", "b2", "b3", "b4", "open"]
+
+
+def test_search_matches_tsvector_prefixes(pg_db):
+    seed(pg_db, "u1", {"b1": ("AFL", "Line", "10", "0"), "b2": ("NRL", "Head to Head", "5", "12")})
+    seed(pg_db, "u2", {"b1": ("AFL", "Line", "10", "19")})
+    seed(pg_db, "u3", {"b1": ("AFL", "Line", "10", "0")}, user_id="alice")
+
+    found = search_bets(pg_db, "COLLING")
+    assert sorted(bet["bet_id"] for bet in found["bets"]) == ["b1", "b2"]
+    assert (found["summary"]["bets"], found["summary"]["payout"]) == (2, 31.0)
+    assert [bet["upload_id"] for bet in search_bets(pg_db, "collingwood", sport="afl")["bets"]] == ["u2"]
+    assert search_bets(pg_db, "carlton")["bets"] == []
+
+
+def test_simulation_loads_float_arrays(pg_db):
+    seed(pg_db, "u1", {"b1": ("AFL", "Line", "10", "0"), "b2": ("NRL", "Head to Head", "5", "12.5")})
+
+    _, stakes, payouts, odds = load_bet_arrays(pg_db)
+    assert (stakes.tolist(), payouts.tolist(), odds.tolist()) == ([10.0, 5.0], [0.0, 12.5], [0.0, 0.0])
+    result = simulate_staking(pg_db, sport="nrl", max_points=2)
+    assert result["summary"]["actual"]["profit"] == 7.5
+    assert result["curves"][0]["date"] == "2024-01-05"
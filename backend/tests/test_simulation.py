@@ -0,0 +1,74 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from app.models.upload import Upload
+from app.services import columnar
+from app.services.columnar import ColumnarStore, load_columnar_store
+from app.services.ingestion_service import upsert_bets
+from app.services.simulation import sample_indices, simulate_staking, strategy_curves
+
+
+def test_strategy_curves_replay_realised_returns():
+    stakes = np.array([10.0, 20.0, 5.0])
+    payouts = np.array([30.0, 0.0, 10.0])
+    odds = np.array([3.0, 2.0, 0.0])
+
+    curves = strategy_curves(stakes, payouts, odds, unit=10, bankroll=100, fraction=0.1)
+
+    assert curves["actual"][1].tolist() == [20.0, 0.0, 5.0]
+    assert curves["flat"][1].tolist() == [20.0, 10.0, 20.0]
+    assert curves["fixed_win"][0].tolist() == [5.0, 10.0, 10.0]
+    assert np.allclose(curves["percent_bankroll"][1], [20.0, 8.0, 18.8])
+    assert np.allclose(curves["percent_bankroll"][0], [10.0, 12.0, 10.8])
+
+
+def seed_bets(db):
+    upload = Upload(id="u1", original_filename="a.csv", stored_path="a.csv")
+    db.add(upload)
+    db.commit()
+    upsert_bets(
+        db,
+        upload,
+        {
+            f"b{index}": {
+                "last_transaction_id": str(index),
+                "sport": "AFL" if index % 2 else "NRL",
+                "odds": "2.00",
+                "stake": Decimal("10"),
+                "payout": Decimal("20") if index % 3 == 0 else Decimal("0"),
+                "occurred_at": datetime(2024, 1, 1 + index),
+            }
+            for index in range(20)
+        },
+    )
+
+
+def test_simulate_staking_filters_and_samples(db):
+    seed_bets(db)
+
+    result = simulate_staking(db, sport="afl", unit=1, max_points=4)
+
+    assert result["bets"] == 10
+    assert len(result["curves"]) == 4
+    assert result["curves"][-1]["bet"] == 10
+    assert result["summary"]["flat"]["profit"] == result["curves"][-1]["flat"]
+    assert simulate_staking(db, category="racing") == {"bets": 0, "summary": {}, "curves": []}
+    assert result["curves"][0]["date"] == "2024-01-02"
+
+
+def test_simulate_staking_reads_the_columnar_store(db, monkeypatch):
+    seed_bets(db)
+    expected = [simulate_staking(db, sport=sport, unit=1, max_points=4) for sport in (None, "AFL")]
+    store = ColumnarStore()
+    load_columnar_store(db, store)
+    monkeypatch.setattr(columnar, "columnar_store", store)
+
+    assert [simulate_staking(db, sport=sport, unit=1, max_points=4) for sport in (None, "AFL")] == expected
+    assert simulate_staking(db, category="racing") == {"bets": 0, "summary": {}, "curves": []}
+
+
+def test_sample_indices_keeps_first_and_last():
+    assert sample_indices(3, 10).tolist() == [0, 1, 2]
+    assert sample_indices(1000, 5).tolist() == [0, 250, 500, 749, 999]
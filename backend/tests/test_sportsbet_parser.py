@@ -1,4 +1,4 @@
-from app.services.parsers.sportsbet import parse_summary
+from app.services.parsers.sportsbet import parse_legs, parse_summary
 
 
 def test_parse_summary_extracts_racing_details():
@@ -47,3 +47,39 @@ def test_parse_summary_trims_racing_selection_numbers_from_market():
     parsed = parse_summary(summary)
 
     assert parsed.market_type == "Fixed Odds Boxed Trifecta"
+
+
+def test_parse_legs_splits_multi_events():
+    summary = """3 Leg Multi
+Collingwood v Geelong
+ Head to Head
+Collingwood @ 1.80
+Flemington - R7 Lexus Melbourne Cup
+ Win or Place
+2. Buckaroo @ 12.00 (Win)
+Miami Heat At New York Knicks
+ Jimmy Butler - Rebounds
+ Jimmy Butler Over (6.5) @ 1.74"""
+
+    legs = parse_legs(summary)
+
+    assert [(leg.sport, leg.market_type, leg.odds) for leg in legs] == [
+        ("AFL", "Head to Head", "1.80"),
+        ("Racing", "Win or Place", "12.00"),
+        ("Basketball", "Rebounds", "1.74"),
+    ]
+    assert legs[0].team == "Collingwood Magpies"
+
+
+def test_parse_legs_splits_same_game_multi_selections():
+    summary = """Brisbane Lions v Gold Coast SUNS
+ Same Game Multi
+ Head To Head - Brisbane Lions @ 1.50
+ Charlie Cameron - Anytime Goal Scorer @ 2.10"""
+
+    legs = parse_legs(summary)
+
+    assert [(leg.leg_number, leg.market_type, leg.team) for leg in legs] == [
+        (1, "Head To Head", "Brisbane Lions"),
+        (2, "Anytime Goal Scorer", None),
+    ]
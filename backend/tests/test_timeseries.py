@@ -0,0 +1,27 @@
+from app.services.timeseries import downsample_lttb
+
+
+def make_series(values):
+    return [{"date": str(index), "profit": 0.0, "cumulative": value} for index, value in enumerate(values)]
+
+
+def test_downsample_lttb_bounds_points_and_keeps_extremes():
+    values = [float(index % 50) for index in range(1000)]
+    values[437] = 400.0
+    values[812] = -300.0
+    series = make_series(values)
+
+    sampled = downsample_lttb(series, 40)
+
+    assert len(sampled) == 40
+    assert sampled[0] is series[0]
+    assert sampled[-1] is series[-1]
+    kept = {point["cumulative"] for point in sampled}
+    assert 400.0 in kept
+    assert -300.0 in kept
+
+
+def test_downsample_lttb_returns_short_series_unchanged():
+    series = make_series([1.0, 2.0, 3.0])
+
+    assert downsample_lttb(series, 10) is series
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from app.models.upload import Upload
+from app.models.user import User
+
+
+def test_get_upload_returns_status(client, db):
+    db.add(
+        Upload(
+            id="u1",
+            original_filename="a.csv",
+            stored_path="a.csv",
+            status="processed",
+            row_count=12,
+            processed_at=datetime(2024, 1, 3),
+        )
+    )
+    db.commit()
+
+    response = client.get("/uploads/u1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["upload_id"] == "u1"
+    assert body["status"] == "processed"
+    assert body["row_count"] == 12
+
+
+def test_get_upload_missing_is_404(client):
+    assert client.get("/uploads/missing").status_code == 404
+
+
+def test_list_uploads_newest_first(client, db):
+    for index in range(3):
+        db.add(
+            Upload(
+                id=f"u{index}",
+                original_filename=f"{index}.csv",
+                stored_path=f"{index}.csv",
+                created_at=datetime(2024, 1, 1 + index),
+            )
+        )
+    db.commit()
+
+    response = client.get("/uploads", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert [upload["upload_id"] for upload in response.json()] == ["u2", "u1"]
+
+
+def test_uploads_are_scoped_to_the_requesting_user(client, db):
+    db.add(User(id="alice"))
+    db.add(Upload(id="u1", original_filename="a.csv", stored_path="a.csv"))
+    db.add(Upload(id="u2", user_id="alice", original_filename="b.csv", stored_path="b.csv"))
+    db.commit()
+
+    assert [upload["upload_id"] for upload in client.get("/uploads").json()] == ["u1"]
+    assert [upload["upload_id"] for upload in client.get("/uploads", headers={"X-User-Id": "alice"}).json()] == ["u2"]
+    assert client.get("/uploads/u2").status_code == 404